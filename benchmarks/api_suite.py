@@ -0,0 +1,267 @@
+"""
+Набор замеров API на синтетических данных (benchmarks.dataset).
+Для каждого эндпоинта выводятся задержки p50/p95/p99, количество
+SQL-запросов на запрос и пик выделенной памяти. Результаты можно сохранить
+как эталон и сравнивать с ним последующие запуски: при ухудшении больше
+порога команда завершается с кодом 1.
+
+Запуск из корня репозитория в процессе, через тестовый клиент:
+    python -m benchmarks.api_suite --posts 1000000 --follows 100000 \\
+        --save baseline.json
+    python -m benchmarks.api_suite --posts 1000000 --follows 100000 \\
+        --compare baseline.json
+
+Нагрузка по HTTP на запущенный сервер с той же БД и SECRET_KEY (данные
+загружаются заранее командой load_data, см. benchmarks.dataset):
+    python -m benchmarks.api_suite --http http://127.0.0.1:8000 \\
+        --concurrency 20
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from benchmarks.base import benchmark_database, percentile, setup_django
+from benchmarks.dataset import Dataset, add_arguments
+
+ENDPOINTS = (
+    ("posts: list", "/api/v1/posts/?limit=20"),
+    ("posts: deep offset", "/api/v1/posts/?limit=20&offset={deep_offset}"),
+    ("posts: cursor", "/api/v1/posts/?pagination=cursor&limit=20"),
+    ("posts: detail", "/api/v1/posts/{post_id}/"),
+    ("posts: search", "/api/v1/posts/?search={word}&limit=20"),
+    ("comments: viral post", "/api/v1/posts/{viral_post_id}/comments/"),
+    ("groups: list", "/api/v1/groups/"),
+    ("follow: list", "/api/v1/follow/"),
+    ("feed", "/api/v1/feed/"),
+    ("users: followers", "/api/v1/users/{popular_author}/followers/"),
+    ("users: suggestions", "/api/v1/users/{active_user}/suggestions/"),
+)
+ALLOCATION_REPEAT = 10
+# Метрики, рост которых больше порога считается регрессией.
+THRESHOLD_METRICS = ("p95", "alloc_kib")
+
+
+def get_context():
+    """Значения для подстановки в пути эндпоинтов и токен пользователя."""
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from posts.models import Post, Profile
+
+    active = Profile.objects.select_related("user").order_by(
+        "-following_count", "user_id"
+    ).first()
+    popular = Profile.objects.select_related("user").order_by(
+        "-follower_count", "user_id"
+    ).first()
+    posts = Post.objects.order_by("id")
+    context = {
+        "deep_offset": posts.count() // 2,
+        "post_id": posts.values_list("id", flat=True)[posts.count() // 3],
+        "viral_post_id": Post.objects.order_by(
+            "-comment_count", "id"
+        ).values_list("id", flat=True).first(),
+        "word": "кофе",
+        "active_user": active.user.username,
+        "popular_author": popular.user.username,
+    }
+    token = str(RefreshToken.for_user(active.user).access_token)
+    return context, token
+
+
+def summarize(timings, queries=None, allocations=None):
+    return {
+        "p50": round(percentile(timings, 50), 3),
+        "p95": round(percentile(timings, 95), 3),
+        "p99": round(percentile(timings, 99), 3),
+        "queries": max(queries) if queries else None,
+        "alloc_kib": (
+            round(percentile(allocations, 50) / 1024, 1)
+            if allocations else None
+        ),
+    }
+
+
+def no_cache():
+    """
+    Отключает кэш ответов API, чтобы каждый запрос доходил до БД: ответы
+    с нулевым временем жизни не сохраняются, версии данных остаются.
+    """
+    from django.test.utils import override_settings
+
+    return override_settings(API_CACHE_TIMEOUT=0)
+
+
+def run_in_process(paths, token, repeat, cache=True):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def get(path):
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+
+    results = {}
+    with nullcontext() if cache else no_cache():
+        for name, path in paths:
+            get(path)
+            timings, queries = [], []
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    get(path)
+                    timings.append((time.perf_counter() - start) * 1000)
+                queries.append(len(captured))
+            allocations = []
+            tracemalloc.start()
+            for _ in range(ALLOCATION_REPEAT):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                get(path)
+                allocations.append(tracemalloc.get_traced_memory()[1] - before)
+            tracemalloc.stop()
+            results[name] = summarize(timings, queries, allocations)
+    return results
+
+
+def run_http(base_url, paths, token, repeat, concurrency):
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def get(path):
+        request = urllib.request.Request(base_url + path, headers=headers)
+        start = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        return (time.perf_counter() - start) * 1000
+
+    results = {}
+    with ThreadPoolExecutor(concurrency) as executor:
+        for name, path in paths:
+            get(path)
+            timings = list(executor.map(get, [path] * repeat))
+            results[name] = summarize(timings)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Список регрессий (эндпоинт, метрика, эталон, текущее значение)."""
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        for metric in THRESHOLD_METRICS:
+            if None in (result[metric], expected[metric]):
+                continue
+            if result[metric] > expected[metric] * (1 + threshold):
+                regressions.append(
+                    (name, metric, expected[metric], result[metric])
+                )
+        if None not in (result["queries"], expected["queries"]) and (
+            result["queries"] > expected["queries"]
+        ):
+            regressions.append(
+                (name, "queries", expected["queries"], result["queries"])
+            )
+    return regressions
+
+
+def print_results(results):
+    print(
+        f"{'endpoint':<24} {'p50':>9} {'p95':>9} {'p99':>9} "
+        f"{'queries':>8} {'alloc':>10}"
+    )
+    for name, result in results.items():
+        queries = result["queries"]
+        alloc = result["alloc_kib"]
+        print(
+            f"{name:<24} {result['p50']:7.2f}ms {result['p95']:7.2f}ms "
+            f"{result['p99']:7.2f}ms "
+            f"{'-' if queries is None else queries:>8} "
+            f"{'-' if alloc is None else f'{alloc:.1f}KiB':>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Отключить кэш ответов API.",
+    )
+    parser.add_argument(
+        "--only", action="append",
+        help="Замерять только эндпоинты, имя которых содержит строку.",
+    )
+    parser.add_argument("--http", help="Базовый URL запущенного сервера.")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--save", help="Сохранить результаты в JSON.")
+    parser.add_argument("--compare", help="Сравнить с сохранённым JSON.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="Допустимый рост p95 и памяти относительно эталона.",
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    endpoints = [
+        (name, path) for name, path in ENDPOINTS
+        if not args.only or any(part in name for part in args.only)
+    ]
+
+    if args.http:
+        context, token = get_context()
+        paths = [(name, path.format(**context)) for name, path in endpoints]
+        results = run_http(
+            args.http.rstrip("/"), paths, token, args.repeat,
+            args.concurrency,
+        )
+    else:
+        with benchmark_database():
+            start = time.perf_counter()
+            Dataset(args).load()
+            print(f"Данные загружены за {time.perf_counter() - start:.1f} с")
+            context, token = get_context()
+            paths = [
+                (name, path.format(**context)) for name, path in endpoints
+            ]
+            results = run_in_process(
+                paths, token, args.repeat, cache=not args.no_cache
+            )
+    print_results(results)
+
+    options = {
+        name: getattr(args, name)
+        for name in ("seed", "users", "groups", "posts", "comments",
+                     "follows", "skew", "no_cache", "http")
+    }
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(
+                {"options": options, "results": results}, file,
+                indent=2, ensure_ascii=False,
+            )
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline["options"] != options:
+            print("Параметры запуска отличаются от эталона.")
+        regressions = compare(
+            results, baseline["results"], args.threshold
+        )
+        for name, metric, expected, actual in regressions:
+            print(f"РЕГРЕССИЯ {name}: {metric} {expected} -> {actual}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
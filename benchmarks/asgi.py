@@ -0,0 +1,112 @@
+"""
+Нагрузочное сравнение чтения постов через WSGI и ASGI: синхронный
+вьюсет под WSGI-потоками, тот же вьюсет под ASGI и async-эндпоинт
+/api/v1/async/posts/. Для каждого режима выводятся пропускная
+способность, задержки и наибольшее количество потоков процесса.
+
+Запуск из корня репозитория:
+    python -m benchmarks.asgi --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.base import benchmark_database, report, setup_django
+
+SYNC_URL = "/api/v1/posts/?limit=20"
+ASYNC_URL = "/api/v1/async/posts/?limit=20"
+
+peak_threads = 0
+
+
+def track_threads():
+    global peak_threads
+    peak_threads = max(peak_threads, threading.active_count())
+
+
+def timed(func):
+    start = time.perf_counter()
+    response = func()
+    track_threads()
+    assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - start) * 1000
+
+
+def run_wsgi(url, requests, concurrency):
+    from django.test import Client
+
+    local = threading.local()
+
+    def get():
+        if not hasattr(local, "client"):
+            local.client = Client()
+        return local.client.get(url)
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        return list(executor.map(
+            lambda _: timed(get), range(requests)
+        ))
+
+
+def run_asgi(url, requests, concurrency):
+    from django.test import AsyncClient
+
+    async def worker(count, timings):
+        client = AsyncClient()
+        for _ in range(count):
+            start = time.perf_counter()
+            response = await client.get(url)
+            track_threads()
+            assert response.status_code == 200, response.status_code
+            timings.append((time.perf_counter() - start) * 1000)
+
+    async def main():
+        timings = []
+        await asyncio.gather(*(
+            worker(requests // concurrency, timings)
+            for _ in range(concurrency)
+        ))
+        return timings
+
+    return asyncio.run(main())
+
+
+def main():
+    global peak_threads
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+
+    from posts.models import Post
+
+    with benchmark_database():
+        author = get_user_model().objects.create(username="bench_author")
+        Post.objects.bulk_create(
+            Post(text=f"Пост {index}", author=author)
+            for index in range(args.posts)
+        )
+        for name, runner, url in (
+            ("WSGI, синхронный вьюсет", run_wsgi, SYNC_URL),
+            ("ASGI, синхронный вьюсет", run_asgi, SYNC_URL),
+            ("ASGI, async-эндпоинт", run_asgi, ASYNC_URL),
+        ):
+            peak_threads = threading.active_count()
+            start = time.perf_counter()
+            timings = runner(url, args.requests, args.concurrency)
+            elapsed = time.perf_counter() - start
+            report(name, timings)
+            print(
+                f"{'':<40} rps={len(timings) / elapsed:8.1f} "
+                f"threads={peak_threads}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Накладные расходы JWT-аутентификации на запрос: JWTAuthentication
+против StatelessJWTAuthentication.
+
+Запуск из корня репозитория:
+    python -m benchmarks.authentication --requests 5000
+"""
+import argparse
+
+from benchmarks.base import benchmark_database, measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+
+    from api.v1.authentication import StatelessJWTAuthentication
+    from api.v1.serializers import TokenObtainSerializer
+
+    with benchmark_database():
+        user = get_user_model().objects.create(username="bench_user")
+        token = TokenObtainSerializer.get_token(user).access_token
+        request = Request(APIRequestFactory().get(
+            "/api/v1/posts/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        ))
+        for authentication in (
+            JWTAuthentication(), StatelessJWTAuthentication()
+        ):
+            name = type(authentication).__name__
+            with CaptureQueriesContext(connection) as queries:
+                timings = measure(
+                    lambda: authentication.authenticate(request),
+                    args.requests,
+                )
+            report(name, timings)
+            print(f"{'':<40} queries/request="
+                  f"{len(queries) / args.requests:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Общие утилиты бенчмарков: окружение Django и замеры времени."""
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / "yatube_api"
+
+
+def setup_django(configure=None):
+    """configure(settings) может изменить настройки до django.setup()."""
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "yatube_api.settings")
+    import django
+    from django.conf import settings
+
+    if configure:
+        configure(settings)
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(test_name=None):
+    """
+    Создаёт временную тестовую БД с миграциями и удаляет её после замера.
+    test_name - файл БД вместо общей БД в памяти, которая блокирует таблицы
+    целиком при конкурентной записи.
+    """
+    from django.db import connection
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    if test_name:
+        connection.settings_dict["TEST"]["NAME"] = test_name
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, repeat=20):
+    """Возвращает список длительностей вызова func в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(timings, value):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, round(value / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def report(name, timings):
+    print(
+        f"{name:<40} median={statistics.median(timings):8.2f}ms "
+        f"p95={percentile(timings, 95):8.2f}ms"
+    )
@@ -0,0 +1,57 @@
+"""
+Импорт постов по одному через POST /api/v1/posts/ против
+POST /api/v1/posts/bulk/ пачками по API_BULK_MAX_ITEMS.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bulk_import --posts 10000
+"""
+import argparse
+import time
+
+from benchmarks.base import benchmark_database, setup_django
+
+URL = "/api/v1/posts/"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--single", type=int, default=500,
+                        help="Сколько постов создать по одному для оценки.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    with benchmark_database():
+        user = get_user_model().objects.create(username="bench_importer")
+        token = RefreshToken.for_user(user).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        start = time.perf_counter()
+        for index in range(args.single):
+            client.post(URL, {"text": f"Пост {index}"}, format="json")
+        single = (time.perf_counter() - start) / args.single
+        print(f"по одному:  {single * 1000:.2f}ms на пост, "
+              f"оценка для {args.posts}: {single * args.posts:.1f}s")
+
+        batch_size = settings.API_BULK_MAX_ITEMS
+        start = time.perf_counter()
+        for offset in range(0, args.posts, batch_size):
+            batch = [
+                {"text": f"Пост {index}"}
+                for index in range(offset, min(offset + batch_size,
+                                               args.posts))
+            ]
+            client.post(f"{URL}bulk/", batch, format="json")
+        elapsed = time.perf_counter() - start
+        print(f"bulk:       {elapsed * 1000 / args.posts:.2f}ms на пост, "
+              f"всего {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Синтетический набор данных с реалистичными перекосами: число постов
+авторов и подписчиков распределено по степенному закону, небольшая доля
+вирусных постов собирает большую часть комментариев. Генерация
+детерминирована: одинаковые параметры и --seed дают одинаковые данные.
+
+Файлы NDJSON для команды load_data:
+    python -m benchmarks.dataset --output data/ --posts 1000000
+    python yatube_api/manage.py load_data group data/groups.ndjson
+    python yatube_api/manage.py load_data post data/posts.ndjson \\
+        --create-users
+    python yatube_api/manage.py load_data comment data/comments.ndjson
+    python yatube_api/manage.py load_data follow data/follows.ndjson
+"""
+import argparse
+import datetime
+import io
+import json
+import random
+import tempfile
+from itertools import accumulate
+from pathlib import Path
+
+CHUNK_SIZE = 100_000
+START = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+PERIOD = datetime.timedelta(days=365)
+WORDS = (
+    "город море дорога книга музыка утро вечер друг кофе работа лето зима "
+    "поезд фото кино сад река горы код проект"
+).split()
+# Порядок загрузки: посты ссылаются на группы, комментарии на посты.
+MODELS = ("group", "post", "comment", "follow")
+
+
+def add_arguments(parser):
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--comments", type=int, default=500_000)
+    parser.add_argument("--follows", type=int, default=100_000)
+    parser.add_argument(
+        "--skew", type=float, default=1.1,
+        help="Показатель степенного распределения авторов и постов.",
+    )
+    parser.add_argument(
+        "--viral-share", type=float, default=0.01,
+        help="Доля вирусных постов.",
+    )
+    parser.add_argument(
+        "--viral-comments", type=float, default=0.5,
+        help="Доля комментариев, приходящихся на вирусные посты.",
+    )
+
+
+def username(index):
+    return f"bench_{index}"
+
+
+def power_law(count, skew):
+    """Накопленные веса рангов 1..count, пропорциональные 1 / rank**skew."""
+    return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def pub_date(post_id, posts):
+    """Дата поста: посты с большим id опубликованы позже."""
+    return START + PERIOD * (post_id / posts)
+
+
+def text(rng, words=12):
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def chunks(total):
+    for start in range(0, total, CHUNK_SIZE):
+        yield start, min(CHUNK_SIZE, total - start)
+
+
+class Dataset:
+    """
+    Генератор записей в формате load_data. Ранги авторов перемешаны, чтобы
+    популярность не совпадала с порядком id.
+    """
+
+    def __init__(self, options):
+        self.options = options
+        rng = random.Random(options.seed)
+        self.seed = options.seed
+        self.authors = rng.sample(range(options.users), options.users)
+        self.author_weights = power_law(options.users, options.skew)
+        viral = max(1, int(options.posts * options.viral_share))
+        self.viral_posts = rng.sample(range(1, options.posts + 1), viral)
+
+    def rng(self, name):
+        return random.Random(f"{self.seed}:{name}")
+
+    def groups(self):
+        for group_id in range(1, self.options.groups + 1):
+            yield {
+                "id": group_id,
+                "title": f"Группа {group_id}",
+                "slug": f"group-{group_id}",
+                "description": f"Описание группы {group_id}",
+            }
+
+    def posts(self):
+        rng = self.rng("posts")
+        options = self.options
+        for start, size in chunks(options.posts):
+            ranks = rng.choices(
+                range(options.users), cum_weights=self.author_weights, k=size
+            )
+            for post_id, rank in enumerate(ranks, start=start + 1):
+                group = rng.randint(0, options.groups)
+                yield {
+                    "id": post_id,
+                    "text": text(rng),
+                    "pub_date": pub_date(post_id, options.posts).isoformat(),
+                    "author": username(self.authors[rank]),
+                    "group": group or None,
+                }
+
+    def comments(self):
+        rng = self.rng("comments")
+        options = self.options
+        for start, size in chunks(options.comments):
+            for comment_id in range(start + 1, start + size + 1):
+                if rng.random() < options.viral_comments:
+                    post_id = rng.choice(self.viral_posts)
+                else:
+                    post_id = rng.randint(1, options.posts)
+                delay = datetime.timedelta(minutes=rng.expovariate(1 / 600))
+                created = pub_date(post_id, options.posts) + delay
+                yield {
+                    "id": comment_id,
+                    "post": post_id,
+                    "author": username(rng.randrange(options.users)),
+                    "text": text(rng, 6),
+                    "created": created.isoformat(),
+                }
+
+    def follows(self):
+        """Подписки на авторов с вероятностью, пропорциональной их весу."""
+        rng = self.rng("follows")
+        options = self.options
+        seen = set()
+        for start, size in chunks(options.follows):
+            ranks = rng.choices(
+                range(options.users), cum_weights=self.author_weights, k=size
+            )
+            for rank in ranks:
+                user = rng.randrange(options.users)
+                following = self.authors[rank]
+                if user == following or (user, following) in seen:
+                    continue
+                seen.add((user, following))
+                yield {
+                    "user": username(user),
+                    "following": username(following),
+                }
+
+    def rows(self, model):
+        return getattr(self, f"{model}s")()
+
+    def write(self, directory):
+        """Записывает NDJSON-файлы и возвращает пути в порядке загрузки."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for model in MODELS:
+            path = directory / f"{model}s.ndjson"
+            with open(path, "w", encoding="utf-8") as file:
+                for row in self.rows(model):
+                    file.write(json.dumps(row, ensure_ascii=False) + "\n")
+            paths.append((model, path))
+        return paths
+
+    def load(self):
+        """Загружает набор в текущую БД через load_data и заполняет ленты."""
+        from django.core.management import call_command
+
+        with tempfile.TemporaryDirectory() as directory:
+            for model, path in self.write(directory):
+                call_command(
+                    "load_data", model, str(path), create_users=True,
+                    no_reconcile=model != "follow", stdout=io.StringIO(),
+                )
+        materialize_feeds()
+
+
+def materialize_feeds():
+    """
+    load_data не заполняет ленты. Одним запросом добавляет в ленту каждого
+    подписчика последние FEED_BACKFILL_SIZE постов его авторов, кроме
+    популярных, чьи посты подмешиваются при чтении.
+    """
+    from django.conf import settings
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT OR IGNORE INTO posts_feeditem (user_id, post_id, pub_date)
+            SELECT follow.user_id, post.id, post.pub_date
+            FROM posts_follow AS follow
+            JOIN posts_profile AS profile
+                ON profile.user_id = follow.following_id
+                AND profile.follower_count <= %s
+            JOIN (
+                SELECT id, author_id, pub_date, ROW_NUMBER() OVER (
+                    PARTITION BY author_id ORDER BY pub_date DESC, id DESC
+                ) AS position
+                FROM posts_post
+            ) AS post
+                ON post.author_id = follow.following_id
+                AND post.position <= %s
+            """,
+            [settings.FEED_FANOUT_MAX_FOLLOWERS, settings.FEED_BACKFILL_SIZE],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+    for model, path in Dataset(args).write(args.output):
+        print(f"{model:<8} {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Запросы к графу подписок: FollowGraph в памяти против запросов к Follow.
+
+Запуск из корня репозитория:
+    python -m benchmarks.follow_graph --users 10000 --follows 50
+"""
+import argparse
+import random
+
+from benchmarks.base import benchmark_database, measure, report, setup_django
+
+BATCH_SIZE = 10_000
+
+
+def create_graph(users, follows):
+    from django.contrib.auth import get_user_model
+
+    from posts.models import Follow
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f"bench_{index}") for index in range(users)
+    )
+    user_ids = list(User.objects.values_list("id", flat=True))
+    rows = []
+    for user_id in user_ids:
+        for following_id in random.sample(user_ids, follows):
+            if following_id != user_id:
+                rows.append(Follow(user_id=user_id, following_id=following_id))
+    Follow.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return user_ids
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--follows", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from posts.graph import follow_graph
+    from posts.models import Follow
+
+    with benchmark_database():
+        user_ids = create_graph(args.users, args.follows)
+        a, b = random.sample(user_ids, 2)
+
+        report("load", measure(follow_graph.load, 1))
+        follow_graph.sync()
+        for name, func in (
+            ("orm: follows", lambda: Follow.objects.filter(
+                user_id=a, following_id=b
+            ).exists()),
+            ("graph: follows", lambda: follow_graph.follows(a, b)),
+            ("orm: followers", lambda: list(Follow.objects.filter(
+                following_id=a
+            ).values_list("user_id", flat=True))),
+            ("graph: followers", lambda: follow_graph.followers(a)),
+            ("orm: mutual", lambda: list(Follow.objects.filter(
+                user_id=a,
+                following_id__in=Follow.objects.filter(
+                    following_id=a
+                ).values("user_id"),
+            ).values_list("following_id", flat=True))),
+            ("graph: mutual", lambda: follow_graph.mutual(a)),
+            ("graph: suggestions", lambda: follow_graph.suggestions(a)),
+        ):
+            report(name, measure(func, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
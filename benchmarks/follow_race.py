@@ -0,0 +1,85 @@
+"""
+Нагрузочная проверка подписок: много потоков одновременно подписывают
+одних и тех же пользователей на одного автора (POST /api/v1/follow/) и
+на группу авторов (POST /api/v1/follow/many/). Выводит распределение
+статусов ответов: ошибок 500 быть не должно.
+
+Запуск из корня репозитория:
+    python -m benchmarks.follow_race --users 20 --threads 16 --repeat 5
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.base import benchmark_database, setup_django
+
+AUTHORS = 10
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+
+    from api.v1.serializers import TokenObtainSerializer
+    from posts.models import Follow
+
+    # Ожидаемые ответы 400 на дубликаты не засоряют вывод; 500 - да.
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+    User = get_user_model()
+    with tempfile.TemporaryDirectory() as directory, benchmark_database(
+        os.path.join(directory, "follow_race.sqlite3")
+    ):
+        authors = [
+            User.objects.create(username=f"bench_author_{index}")
+            for index in range(AUTHORS)
+        ]
+        tokens = [
+            str(TokenObtainSerializer.get_token(
+                User.objects.create(username=f"bench_user_{index}")
+            ).access_token)
+            for index in range(args.users)
+        ]
+        jobs = [
+            (token, "/api/v1/follow/", {"following": authors[0].username})
+            for token in tokens
+        ] + [
+            (
+                token,
+                "/api/v1/follow/many/",
+                {"following": [author.username for author in authors]},
+            )
+            for token in tokens
+        ]
+
+        def post(job):
+            token, url, data = job
+            client = APIClient(raise_request_exception=False)
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            return url, client.post(url, data, format="json").status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as executor:
+            statuses = Counter(
+                executor.map(post, jobs * args.repeat)
+            )
+        elapsed = time.perf_counter() - start
+        for (url, status), count in sorted(statuses.items()):
+            print(f"{url:<25} {status}: {count}")
+        print(f"requests={sum(statuses.values())} time={elapsed:.2f}s")
+        expected = args.users * AUTHORS
+        print(f"follows={Follow.objects.count()} expected={expected}")
+
+
+if __name__ == "__main__":
+    main()
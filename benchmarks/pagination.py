@@ -0,0 +1,78 @@
+"""
+Сравнение LimitOffsetPagination и keyset-пагинации для /api/v1/posts/.
+
+Запуск из корня репозитория:
+    python -m benchmarks.pagination --posts 1000100
+"""
+import argparse
+
+from benchmarks.base import (
+    benchmark_database,
+    measure,
+    report,
+    setup_django,
+)
+
+URL = "/api/v1/posts/"
+OFFSETS = (0, 10_000, 1_000_000)
+BATCH_SIZE = 10_000
+
+
+def create_posts(count):
+    from django.contrib.auth import get_user_model
+
+    from posts.models import Post
+
+    author = get_user_model().objects.create(username="bench_author")
+    for start in range(0, count, BATCH_SIZE):
+        Post.objects.bulk_create(
+            Post(text=f"Пост {index}", author=author)
+            for index in range(start, min(start + BATCH_SIZE, count))
+        )
+
+
+def keyset_cursor(offset, limit):
+    """Курсор, указывающий на ту же позицию, что и ?offset=offset."""
+    from api.v1.pagination import KeysetPagination
+    from posts.models import Post
+
+    if not offset:
+        return None
+    paginator = KeysetPagination()
+    previous = Post.objects.order_by(*paginator.ordering)[offset - 1]
+    return paginator.encode_cursor(paginator.get_position(previous))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=1_000_100)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+
+    with benchmark_database():
+        create_posts(args.posts)
+        client = Client()
+        for offset in OFFSETS:
+            if offset >= args.posts:
+                continue
+            url = f"{URL}?limit={args.limit}&offset={offset}"
+            report(
+                f"limit/offset offset={offset}",
+                measure(lambda: client.get(url), args.repeat),
+            )
+            cursor = keyset_cursor(offset, args.limit)
+            url = f"{URL}?pagination=cursor&limit={args.limit}"
+            if cursor:
+                url = f"{url}&cursor={cursor}"
+            report(
+                f"keyset      offset={offset}",
+                measure(lambda: client.get(url), args.repeat),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Конкурентная запись в SQLite: потоки одновременно создают посты и
+комментарии через API. Сравнивается стандартный бэкенд Django без
+постоянных соединений и профиль yatube_api.sqlite (WAL, BEGIN IMMEDIATE,
+очередь на запись). Для каждого варианта выводятся пропускная
+способность и распределение статусов ответов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.sqlite_writes --threads 16 --requests 2000
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.base import benchmark_database, percentile, setup_django
+
+VARIANTS = {
+    "django": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {},
+    },
+    "profile": {},
+}
+
+
+def run(variant, threads, requests):
+    def configure(settings):
+        settings.DATABASES["default"].update(VARIANTS[variant])
+        settings.POST_IMAGE_WORKERS = 0
+
+    setup_django(configure)
+    from django.contrib.auth import get_user_model
+    from django.db import close_old_connections, connections
+    from rest_framework.test import APIClient
+
+    from api.v1.serializers import TokenObtainSerializer
+    from posts.models import Comment, Post
+
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+    User = get_user_model()
+    with tempfile.TemporaryDirectory() as directory, benchmark_database(
+        os.path.join(directory, "writes.sqlite3")
+    ):
+        users = [
+            User.objects.create(username=f"bench_{index}")
+            for index in range(threads)
+        ]
+        tokens = [
+            str(TokenObtainSerializer.get_token(user).access_token)
+            for user in users
+        ]
+        post = Post.objects.create(text="Пост", author=users[0])
+        jobs = [
+            (
+                tokens[index % threads],
+                f"/api/v1/posts/{post.id}/comments/" if index % 2
+                else "/api/v1/posts/",
+            )
+            for index in range(requests)
+        ]
+
+        def write(job):
+            token, url = job
+            client = APIClient(raise_request_exception=False)
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            start = time.perf_counter()
+            status = client.post(url, {"text": "Текст"}).status_code
+            elapsed = (time.perf_counter() - start) * 1000
+            # Как после запроса в сервере: соединение закрывается или
+            # остаётся открытым согласно CONN_MAX_AGE.
+            close_old_connections()
+            return status, elapsed
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            results = list(executor.map(write, jobs))
+        elapsed = time.perf_counter() - start
+        statuses = Counter(status for status, _ in results)
+        timings = [timing for _, timing in results]
+        print(
+            f"{variant:<8} {type(connections['default']).__module__}\n"
+            f"  {requests / elapsed:8.1f} запросов/с, "
+            f"p50={percentile(timings, 50):.1f}ms "
+            f"p99={percentile(timings, 99):.1f}ms, "
+            f"статусы: {dict(sorted(statuses.items()))}\n"
+            f"  постов: {Post.objects.count() - 1}, "
+            f"комментариев: {Comment.objects.count()}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--variant", choices=list(VARIANTS))
+    args = parser.parse_args()
+    if args.variant:
+        run(args.variant, args.threads, args.requests)
+        return
+    # Каждый вариант - в отдельном процессе со своими соединениями.
+    for variant in VARIANTS:
+        subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.sqlite_writes",
+                "--variant", variant,
+                "--threads", str(args.threads),
+                "--requests", str(args.requests),
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
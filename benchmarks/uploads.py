@@ -0,0 +1,115 @@
+"""
+Пиковая память Python на разбор multipart-загрузки изображения и проверку
+поля image: стандартные обработчики Django с serializers.ImageField против
+StreamingImageUploadHandler со StagedImageField. Тело запроса читается
+из файла на диске, как из сокета.
+
+Запуск из корня репозитория:
+    python -m benchmarks.uploads --sizes 1 10 50 100
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+from io import BytesIO
+
+from benchmarks.base import setup_django
+
+BOUNDARY = "BenchmarkBoundary"
+CHUNK = 1024 * 1024
+
+
+def write_body(path, size):
+    """Тело запроса с JPEG размером size байт (картинка и хвост нулей)."""
+    from PIL import Image
+
+    image = BytesIO()
+    Image.new("RGB", (640, 480), "red").save(image, format="JPEG")
+    head = (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="image"; '
+        'filename="photo.jpg"\r\n'
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + image.getvalue()
+    tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+    with open(path, "wb") as body:
+        body.write(head)
+        padding = size - len(image.getvalue())
+        while padding > 0:
+            body.write(b"\0" * min(CHUNK, padding))
+            padding -= CHUNK
+        body.write(tail)
+    return os.path.getsize(path)
+
+
+def parse(path, handlers, field):
+    from django.http.multipartparser import MultiPartParser
+
+    meta = {
+        "CONTENT_TYPE": f"multipart/form-data; boundary={BOUNDARY}",
+        "CONTENT_LENGTH": str(os.path.getsize(path)),
+    }
+    with open(path, "rb") as body:
+        _, files = MultiPartParser(meta, body, handlers, "utf-8").parse()
+        upload = files["image"]
+        field.run_validation(upload)
+        upload.close()
+
+
+def measure_peak(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1, 10, 50, 100],
+        help="Размеры файлов в МБ.",
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.files.uploadhandler import (
+        MemoryFileUploadHandler,
+        TemporaryFileUploadHandler,
+    )
+    from django.test import override_settings
+    from rest_framework import serializers
+
+    from api.v1.fields import StagedImageField
+    from api.v1.uploads import StreamingImageUploadHandler
+
+    variants = (
+        (
+            "Django + ImageField",
+            lambda: [MemoryFileUploadHandler(), TemporaryFileUploadHandler()],
+            serializers.ImageField(),
+        ),
+        (
+            "StreamingImageUploadHandler",
+            lambda: [StreamingImageUploadHandler()],
+            StagedImageField(),
+        ),
+    )
+    with tempfile.TemporaryDirectory() as directory, override_settings(
+        MEDIA_ROOT=directory,
+        POST_IMAGE_MAX_SIZE=max(args.sizes) * 1024 * 1024 * 2,
+    ):
+        path = os.path.join(directory, "body")
+        for size in args.sizes:
+            write_body(path, size * 1024 * 1024)
+            for name, handlers, field in variants:
+                peak = measure_peak(lambda: parse(path, handlers(), field))
+                print(
+                    f"{name:<30} file={size:>4} MB "
+                    f"peak={peak / 1024 / 1024:8.2f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import sys
 import os
 
+import pytest
+
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
@@ -32,6 +34,21 @@ pytest_plugins = [
     'tests.fixtures.fixture_data',
 ]
 
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from django.core.cache import caches
+
+    from api.v1.authentication import user_cache
+    from api.v1.cache import group_posts_cache
+    from posts.graph import follow_graph
+
+    for cache in caches.all():
+        cache.clear()
+    user_cache.clear()
+    group_posts_cache.clear()
+    follow_graph.clear()
+
 # test .md
 default_md = '# api_final\napi final\n'
 filename = 'README.md'
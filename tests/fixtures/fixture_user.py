@@ -40,3 +40,16 @@ def user_client(token):
     client = APIClient()
     client.credentials(HTTP_AUTHORIZATION=f'Bearer {token["access"]}')
     return client
+
+
+@pytest.fixture
+def another_user_client(another_user):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = APIClient()
+    refresh = RefreshToken.for_user(another_user)
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}'
+    )
+    return client
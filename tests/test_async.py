@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncReadAPI:
+
+    urls = (
+        ('/api/v1/posts/', '/api/v1/async/posts/'),
+        ('/api/v1/posts/{post_id}/', '/api/v1/async/posts/{post_id}/'),
+        (
+            '/api/v1/posts/{post_id}/comments/',
+            '/api/v1/async/posts/{post_id}/comments/',
+        ),
+        ('/api/v1/groups/', '/api/v1/async/groups/'),
+    )
+
+    def async_get(self, url, **headers):
+        # AsyncClient в Django 3.2 передаёт extra как заголовки ASGI.
+        async def get():
+            return await AsyncClient().get(url, **headers)
+
+        return async_to_sync(get)()
+
+    def test_async_matches_sync(self, client, post, another_post,
+                                comment_1_post):
+        for sync_url, async_url in self.urls:
+            sync_url = sync_url.format(post_id=post.id)
+            async_url = async_url.format(post_id=post.id)
+            expected = client.get(sync_url).json()
+            response = self.async_get(async_url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{async_url}` возвращает '
+                'статус 200.'
+            )
+            assert response.json() == expected, (
+                f'Проверьте, что `{async_url}` возвращает те же данные, '
+                f'что и `{sync_url}`.'
+            )
+            assert response['ETag'] == client.get(sync_url)['ETag']
+
+    def test_async_not_modified(self, post):
+        url = '/api/v1/async/posts/'
+        etag = self.async_get(url)['ETag']
+        response = self.async_get(url, **{'if-none-match': etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что `{url}` отвечает 304 на совпадающий '
+            '`If-None-Match`.'
+        )
+
+    def test_async_errors(self, post):
+        response = self.async_get('/api/v1/async/posts/100500/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = self.async_get(
+            '/api/v1/async/posts/', authorization='Bearer invalid'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что async-эндпоинты отвечают 401 на неверный токен.'
+        )
+
+    def test_async_pagination(self, post, another_post):
+        response = self.async_get('/api/v1/async/posts/?limit=1')
+        data = response.json()
+        assert data['count'] == 2
+        assert len(data['results']) == 1
@@ -0,0 +1,79 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from posts.management.commands.audit_query_plans import explain, get_routes
+from posts.models import Follow, Post
+
+
+def plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return ' '.join(row[-1] for row in cursor.fetchall())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAuditQueryPlans:
+
+    def test_routes(self):
+        routes = get_routes()
+        for name in ('post-list', 'post-detail', 'post-comments',
+                     'group-list', 'follow-list', 'feed-list',
+                     'export-user-posts', 'user-followers'):
+            assert name in routes, (
+                f'Проверьте, что аудит проверяет маршрут `{name}`.'
+            )
+        assert 'follow-many' not in routes, (
+            'Проверьте, что аудит вызывает только GET-действия.'
+        )
+
+    def test_no_full_scans(self, follow_1, comment_1_post, another_post):
+        out = StringIO()
+        call_command('audit_query_plans', stdout=out, stderr=StringIO())
+        assert 'Полных просмотров таблиц нет' in out.getvalue()
+
+    def test_full_scan_fails(self, post):
+        err = StringIO()
+        with override_settings(QUERY_PLAN_ALLOWLIST={}):
+            with pytest.raises(CommandError):
+                call_command(
+                    'audit_query_plans', route=['group-list'],
+                    stdout=StringIO(), stderr=err,
+                )
+        assert 'group-list {}: SCAN posts_group' in err.getvalue(), (
+            'Проверьте, что полный просмотр таблицы не из списка '
+            'разрешённых выводится и завершает команду с ошибкой.'
+        )
+
+    def test_unknown_route(self):
+        with pytest.raises(CommandError):
+            call_command('audit_query_plans', route=['missing'])
+
+    def test_explain(self):
+        details = explain(
+            connection, 'SELECT id FROM posts_post WHERE author_id = 1'
+        )
+        assert details == [
+            'SEARCH posts_post USING COVERING INDEX '
+            'post_author_pub_date_idx (author_id=?)'
+        ]
+
+    def test_author_posts_use_index(self):
+        assert 'post_author_pub_date_idx' in plan(
+            Post.objects.filter(author_id=1).order_by('-pub_date', '-id')
+        ), 'Проверьте, что посты автора выбираются по индексу.'
+
+    def test_group_posts_use_index(self):
+        assert 'post_group_pub_date_idx' in plan(
+            Post.objects.filter(group_id=1).order_by('-pub_date', '-id')
+        ), 'Проверьте, что посты группы выбираются по индексу.'
+
+    def test_followers_use_index(self):
+        assert 'COVERING INDEX follow_following_user_idx' in plan(
+            Follow.objects.filter(following_id=1).values('user_id')
+        ), 'Проверьте, что подписчики автора выбираются по индексу.'
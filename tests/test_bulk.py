@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkAPI:
+
+    posts_bulk_url = '/api/v1/posts/bulk/'
+    comments_bulk_url = '/api/v1/posts/{post_id}/comments/bulk/'
+
+    def test_bulk_not_auth(self, client):
+        response = client.post(self.posts_bulk_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что POST-запрос неавторизованного пользователя к '
+            f'`{self.posts_bulk_url}` возвращает ответ со статусом 401.'
+        )
+
+    def test_bulk_create_posts(self, user_client, user, group_1,
+                               django_assert_max_num_queries):
+        data = [{'text': f'Пост {index}', 'group': group_1.id}
+                for index in range(100)]
+        data.insert(1, {'group': group_1.id})
+        with django_assert_max_num_queries(8):
+            response = user_client.post(
+                self.posts_bulk_url, data=data, format='json'
+            )
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        results = response.json()
+        assert [item['status'] for item in results[:3]] == [201, 400, 201], (
+            f'Проверьте, что `{self.posts_bulk_url}` возвращает статус для '
+            'каждого элемента запроса.'
+        )
+        assert Post.objects.filter(author=user).count() == 100
+        created = Post.objects.get(pk=results[0]['data']['id'])
+        assert created.text == data[0]['text'], (
+            f'Проверьте, что `{self.posts_bulk_url}` возвращает `id` '
+            'созданных постов.'
+        )
+
+    @override_settings(API_BULK_MAX_ITEMS=2)
+    def test_bulk_max_items(self, user_client):
+        response = user_client.post(
+            self.posts_bulk_url, data=[{'text': 'Пост'}] * 3, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{self.posts_bulk_url}` отклоняет запросы с '
+            'количеством объектов больше API_BULK_MAX_ITEMS.'
+        )
+        assert not Post.objects.exists()
+
+    def test_bulk_update_posts(self, user_client, post, post_2, another_post,
+                               django_assert_max_num_queries):
+        data = [
+            {'id': post.id, 'text': 'Новый текст'},
+            {'id': another_post.id, 'text': 'Чужой пост'},
+            {'id': 100500, 'text': 'Несуществующий пост'},
+            {'id': post_2.id, 'text': ''},
+        ]
+        with django_assert_max_num_queries(4):
+            response = user_client.patch(
+                self.posts_bulk_url, data=data, format='json'
+            )
+        statuses = [item['status'] for item in response.json()]
+        assert statuses == [200, 403, 404, 400]
+        post.refresh_from_db()
+        another_post.refresh_from_db()
+        assert post.text == 'Новый текст'
+        assert another_post.text == 'Тестовый пост 2'
+
+    def test_bulk_delete_posts(self, user_client, post, post_2,
+                               another_post):
+        response = user_client.delete(
+            self.posts_bulk_url,
+            data=[post.id, another_post.id, post_2.id],
+            format='json'
+        )
+        statuses = [item['status'] for item in response.json()]
+        assert statuses == [204, 403, 204]
+        assert list(Post.objects.values_list('id', flat=True)) == [
+            another_post.id
+        ]
+
+    def test_bulk_create_comments(self, user_client, post):
+        url = self.comments_bulk_url.format(post_id=post.id)
+        response = user_client.post(
+            url, data=[{'text': 'Коммент 1'}, {'text': 'Коммент 2'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        assert Comment.objects.filter(post=post).count() == 2
+        post.refresh_from_db()
+        assert post.comment_count == 2, (
+            f'Проверьте, что `{self.comments_bulk_url}` обновляет счётчик '
+            'комментариев поста.'
+        )
+
+        response = user_client.post(
+            self.comments_bulk_url.format(post_id=100500),
+            data=[{'text': 'Коммент'}], format='json'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -3,6 +3,7 @@ from http import HTTPStatus
 from django.db.utils import IntegrityError
 import pytest
 
+from api.v1.pagination import CommentPagination
 from posts.models import Comment
 
 
@@ -90,10 +91,12 @@ class TestCommentAPI:
             f'`{self.comments_url}` возвращается ответ со статусом 200.'
         )
         test_data = response.json()
-        assert isinstance(test_data, list), (
+        assert isinstance(test_data, dict) and 'results' in test_data, (
             'Проверьте, что при GET-запросе авторизованного пользователя к '
-            f'`{self.comments_url}` данные возвращаются в виде списка.'
+            f'`{self.comments_url}` данные возвращаются постранично в поле '
+            '`results`.'
         )
+        test_data = test_data['results']
         assert len(test_data) == Comment.objects.filter(post=post).count(), (
             'Проверьте, что при GET-запросе авторизованного пользователя к '
             f'`{self.comments_url}` возвращаются данные о комментариях '
@@ -108,6 +111,53 @@ class TestCommentAPI:
             db_comment=comment
         )
 
+    def test_comments_get_legacy_list(self, user_client, post,
+                                      comment_1_post, comment_2_post):
+        response = user_client.get(
+            self.comments_url.format(post_id=post.id) + '?legacy=1'
+        )
+        test_data = response.json()
+        assert isinstance(test_data, list), (
+            'Проверьте, что GET-запрос с параметром `legacy` к '
+            f'`{self.comments_url}` возвращает данные в виде списка.'
+        )
+        assert len(test_data) == Comment.objects.filter(post=post).count()
+
+    def test_comments_get_page_size_is_capped(self, user_client, post, user):
+        Comment.objects.bulk_create(
+            Comment(author=user, post=post, text=f'Коммент {index}')
+            for index in range(CommentPagination.max_page_size + 1)
+        )
+        url = self.comments_url.format(post_id=post.id)
+        for query in ('?limit=100000', '?legacy=1'):
+            response = user_client.get(url + query)
+            test_data = response.json()
+            if isinstance(test_data, dict):
+                assert test_data['next'] is not None
+                test_data = test_data['results']
+            assert len(test_data) == CommentPagination.max_page_size, (
+                f'Проверьте, что GET-запрос к `{self.comments_url}` не '
+                'возвращает больше комментариев, чем разрешено на странице.'
+            )
+
+    def test_comments_conditional_get(self, client, user_client, post,
+                                      comment_1_post):
+        url = self.comments_url.format(post_id=post.id)
+        etag = client.get(url)['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{self.comments_url}` с '
+            'актуальным `If-None-Match` возвращает ответ со статусом 304.'
+        )
+
+        user_client.post(url, data={'text': self.TEXT_FOR_COMMENT})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления комментария GET-запрос к '
+            f'`{self.comments_url}` со старым `If-None-Match` возвращает '
+            'обновлённые данные.'
+        )
+
     def test_comment_create_by_unauth(self, client, post, comment_1_post):
         comment_cnt = Comment.objects.count()
 
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db.models.signals import pre_save
+
+from posts.models import Comment, Post, Profile
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCounters:
+
+    post_detail_url = '/api/v1/posts/{post_id}/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    comment_detail_url = '/api/v1/posts/{post_id}/comments/{comment_id}/'
+    follow_url = '/api/v1/follow/'
+
+    def get_comment_count(self, client, post):
+        response = client.get(self.post_detail_url.format(post_id=post.id))
+        return response.json()['comment_count']
+
+    def test_comment_count(self, user_client, post):
+        assert self.get_comment_count(user_client, post) == 0
+        response = user_client.post(
+            self.comments_url.format(post_id=post.id),
+            data={'text': 'Новый комментарий'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.get_comment_count(user_client, post) == 1, (
+            'Проверьте, что создание комментария увеличивает поле '
+            '`comment_count` поста.'
+        )
+
+        user_client.delete(self.comment_detail_url.format(
+            post_id=post.id, comment_id=response.json()['id']
+        ))
+        assert self.get_comment_count(user_client, post) == 0, (
+            'Проверьте, что удаление комментария уменьшает поле '
+            '`comment_count` поста.'
+        )
+
+    def test_update_keeps_comment_count(self, user_client, user, post):
+        def comment_before_save(sender, instance, **kwargs):
+            pre_save.disconnect(comment_before_save, sender=Post)
+            Comment.objects.create(post=post, author=user, text='Текст')
+
+        # Комментарий создаётся между чтением поста и его сохранением.
+        pre_save.connect(comment_before_save, sender=Post)
+        try:
+            response = user_client.patch(
+                self.post_detail_url.format(post_id=post.id),
+                data={'text': 'Новый текст'}
+            )
+        finally:
+            pre_save.disconnect(comment_before_save, sender=Post)
+        assert response.status_code == HTTPStatus.OK
+        post.refresh_from_db()
+        assert post.text == 'Новый текст'
+        assert post.comment_count == 1, (
+            'Проверьте, что изменение поста не перезаписывает '
+            '`comment_count`, изменённый параллельно.'
+        )
+
+    def test_follow_counts(self, user_client, user, another_user, follow_4):
+        response = user_client.post(
+            self.follow_url, data={'following': another_user.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['followers_count'] == 1, (
+            f'Проверьте, что ответ `{self.follow_url}` содержит количество '
+            'подписчиков автора в поле `followers_count`.'
+        )
+        user.profile.refresh_from_db()
+        another_user.profile.refresh_from_db()
+        assert user.profile.following_count == 1
+        assert user.profile.follower_count == 1
+        assert another_user.profile.follower_count == 1
+        assert another_user.profile.following_count == 1
+
+    def test_reconcile_counters(self, post, comment_1_post, comment_2_post,
+                                follow_1, user, another_user):
+        Post.objects.update(comment_count=10)
+        Profile.objects.update(follower_count=5, following_count=5)
+        Profile.objects.filter(user=another_user).delete()
+
+        call_command('reconcile_counters', batch_size=1)
+
+        post.refresh_from_db()
+        assert post.comment_count == 2, (
+            'Проверьте, что команда `reconcile_counters` исправляет '
+            'счётчики комментариев.'
+        )
+        assert Profile.objects.get(user=user).following_count == 1
+        assert Profile.objects.get(user=user).follower_count == 0
+        assert Profile.objects.get(user=another_user).follower_count == 1
@@ -0,0 +1,114 @@
+import csv
+import datetime
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Comment, Post
+
+
+def read_ndjson(response):
+    content = b''.join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+def read_csv(response):
+    content = b''.join(response.streaming_content).decode()
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExport:
+
+    posts_url = '/api/v1/export/posts/'
+    comments_url = '/api/v1/export/comments/'
+    user_posts_url = '/api/v1/export/users/{username}/posts/'
+
+    def test_export_unauthorized(self, client, post):
+        for url in (self.posts_url, self.comments_url):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+                f'Проверьте, что `{url}` недоступен без токена.'
+            )
+
+    def test_export_posts_ndjson(self, user_client, post, post_2,
+                                 another_post):
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(self.posts_url)
+            rows = read_ndjson(response)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert [row['id'] for row in rows] == [
+            post.id, post_2.id, another_post.id
+        ], 'Проверьте, что посты выгружаются по возрастанию `pub_date`.'
+        assert rows[0] == {
+            'id': post.id,
+            'text': post.text,
+            'pub_date': post.pub_date.isoformat().replace('+00:00', 'Z'),
+            'author': post.author.username,
+            'image': '',
+            'group': post.group_id,
+            'comment_count': 0,
+        }
+        assert len(queries) == 1, (
+            'Проверьте, что выгрузка читает посты одним запросом без '
+            'дополнительных запросов на каждую строку.'
+        )
+
+    def test_export_comments_csv(self, user_client, comment_1_post,
+                                 comment_2_post):
+        response = user_client.get(self.comments_url, {'output': 'csv'})
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/csv')
+        rows = read_csv(response)
+        assert [row['id'] for row in rows] == [
+            str(comment_1_post.id), str(comment_2_post.id)
+        ]
+        assert rows[1]['author'] == comment_2_post.author.username
+        assert rows[1]['created'] == comment_2_post.created.isoformat().replace(
+            '+00:00', 'Z'
+        )
+
+    def test_export_since(self, user_client, user, post, post_2,
+                          another_post):
+        old = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        Post.objects.filter(pk=post.pk).update(pub_date=old)
+        response = user_client.get(self.posts_url, {'since': '2021-01-01'})
+        assert [row['id'] for row in read_ndjson(response)] == [
+            post_2.id, another_post.id
+        ], 'Проверьте, что `since` отбрасывает более старые записи.'
+
+        response = user_client.get(
+            self.user_posts_url.format(username=user.username),
+            {'since': '2021-01-01T00:00:00+00:00'},
+        )
+        assert [row['id'] for row in read_ndjson(response)] == [post_2.id], (
+            'Проверьте, что выгрузка постов пользователя содержит только '
+            'его посты.'
+        )
+
+        response = user_client.get(self.posts_url, {'since': 'вчера'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = user_client.get(self.posts_url, {'output': 'xml'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_export_user_posts_not_found(self, user_client):
+        response = user_client.get(
+            self.user_posts_url.format(username='nobody')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_export_comments_since(self, user_client, comment_1_post,
+                                   comment_2_post):
+        Comment.objects.filter(pk=comment_1_post.pk).update(
+            created=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+        response = user_client.get(
+            self.comments_url, {'since': '2021-01-01T00:00:00'}
+        )
+        assert [row['id'] for row in read_ndjson(response)] == [
+            comment_2_post.id
+        ]
@@ -0,0 +1,148 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+from posts.feed import before_position, fan_out_posts, get_feed_post_ids
+from posts.models import FeedItem, Follow, Post, Profile
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFeedAPI:
+
+    url = '/api/v1/feed/'
+    post_list_url = '/api/v1/posts/'
+
+    def get_feed_ids(self, client):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос авторизованного пользователя к '
+            f'`{self.url}` возвращает ответ со статусом 200.'
+        )
+        return [item['id'] for item in response.json()['results']]
+
+    def test_feed_not_auth(self, client):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.url}` возвращает ответ со статусом 401.'
+        )
+
+    def test_feed_contains_followed_posts(self, user_client,
+                                          another_user_client, user,
+                                          follow_1, post):
+        response = another_user_client.post(
+            self.post_list_url, data={'text': 'Новый пост'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        new_post_id = response.json()['id']
+
+        assert FeedItem.objects.filter(
+            user=user, post_id=new_post_id
+        ).exists(), (
+            'Проверьте, что новый пост добавляется в ленты подписчиков '
+            'автора.'
+        )
+        assert self.get_feed_ids(user_client) == [new_post_id], (
+            f'Проверьте, что `{self.url}` содержит только посты авторов, '
+            'на которых подписан пользователь.'
+        )
+
+    def test_feed_follow_and_unfollow(self, user_client, user,
+                                      another_user, another_post):
+        follow = Follow.objects.create(user=user, following=another_user)
+        assert self.get_feed_ids(user_client) == [another_post.id], (
+            'Проверьте, что после подписки в ленту попадают уже '
+            'опубликованные посты автора.'
+        )
+
+        follow.delete()
+        assert self.get_feed_ids(user_client) == [], (
+            'Проверьте, что после отписки посты автора удаляются из ленты.'
+        )
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=0)
+    def test_feed_merges_popular_authors(self, user_client,
+                                         another_user_client, user,
+                                         follow_1):
+        response = another_user_client.post(
+            self.post_list_url, data={'text': 'Пост популярного автора'}
+        )
+        new_post_id = response.json()['id']
+
+        assert not FeedItem.objects.filter(user=user).exists(), (
+            'Проверьте, что посты популярных авторов не рассылаются по '
+            'лентам при публикации.'
+        )
+        assert self.get_feed_ids(user_client) == [new_post_id], (
+            'Проверьте, что посты популярных авторов подмешиваются в ленту '
+            'при чтении.'
+        )
+
+    def test_feed_pages(self, user_client, user, another_user, user_2,
+                        follow_1):
+        Follow.objects.create(user=user, following=user_2)
+        Profile.objects.filter(user=user_2).update(follower_count=100)
+        posts = [
+            Post.objects.create(text=f'Пост {index}', author=author)
+            for index in range(3)
+            for author in (another_user, user_2)
+        ]
+        expected = [post.id for post in reversed(posts)]
+        ids = []
+        url = self.url
+        with override_settings(FEED_FANOUT_MAX_FOLLOWERS=10):
+            fan_out_posts(posts)
+            assert FeedItem.objects.filter(user=user).count() == 3
+            while url:
+                response = user_client.get(url, {'limit': 4})
+                assert response.status_code == HTTPStatus.OK
+                data = response.json()
+                ids.extend(item['id'] for item in data['results'])
+                url = data['next']
+        assert ids == expected, (
+            'Проверьте, что курсор ленты проходит посты из ленты и посты '
+            'популярных авторов от новых к старым без пропусков и повторов.'
+        )
+
+    def test_fan_out_uses_follower_count(self, user, another_user, user_2,
+                                         follow_1):
+        Follow.objects.create(user=user_2, following=another_user)
+        Profile.objects.filter(user=another_user).update(follower_count=5)
+        with override_settings(FEED_FANOUT_MAX_FOLLOWERS=3):
+            post = Post.objects.create(text='Пост', author=another_user)
+            fan_out_posts([post])
+            assert not FeedItem.objects.filter(post=post).exists(), (
+                'Проверьте, что популярность автора при рассылке '
+                'определяется по Profile.follower_count, как и при чтении.'
+            )
+            assert get_feed_post_ids(user.id, 10) == [post.id]
+            Profile.objects.filter(user=another_user).update(
+                follower_count=0
+            )
+            post = Post.objects.create(text='Пост', author=another_user)
+            fan_out_posts([post])
+            assert set(FeedItem.objects.filter(post=post).values_list(
+                'user_id', flat=True
+            )) == {user.id, user_2.id}, (
+                'Проверьте, что посты непопулярного автора рассылаются '
+                'всем подписчикам.'
+            )
+
+    def test_feed_page_uses_index(self, user, follow_1, another_post):
+        items = FeedItem.objects.filter(user_id=user.id).filter(
+            before_position((another_post.pub_date, another_post.id),
+                            'pub_date', 'post_id')
+        ).order_by('-pub_date', '-post_id').values_list('pub_date', 'post_id')
+        sql, params = items[:10].query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        assert 'feeditem_user_pub_date_idx' in plan, (
+            'Проверьте, что страница ленты выбирается по индексу '
+            '(user, pub_date, post).'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            'Проверьте, что страница ленты не сортирует все посты ленты.'
+        )
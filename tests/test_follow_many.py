@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.follows import follow_users
+from posts.graph import follow_graph
+from posts.models import Follow
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFollowUpsert:
+
+    url = '/api/v1/follow/'
+    many_url = '/api/v1/follow/many/'
+
+    def test_duplicate_follow(self, user_client, user, another_user):
+        data = {'following': another_user.username}
+        assert user_client.post(self.url, data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+        response = user_client.post(self.url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Вы уже подписаны на этого пользователя.']
+        }, (
+            'Проверьте, что повторная подписка возвращает прежнюю ошибку '
+            'в `non_field_errors`.'
+        )
+        assert Follow.objects.filter(user=user).count() == 1
+
+    def test_follow_users_single_insert(self, user, another_user, user_2):
+        with CaptureQueriesContext(connection) as queries:
+            created = follow_users(
+                user.id, [another_user.id, user_2.id, another_user.id]
+            )
+        inserts = [
+            query for query in queries
+            if query['sql'].startswith('INSERT INTO "posts_follow"')
+        ]
+        assert len(inserts) == 1, (
+            'Проверьте, что подписки создаются одним INSERT.'
+        )
+        assert {follow.following_id for follow in created} == {
+            another_user.id, user_2.id
+        }
+        assert follow_users(user.id, [another_user.id]) == []
+
+        user.profile.refresh_from_db()
+        another_user.profile.refresh_from_db()
+        assert user.profile.following_count == 2
+        assert another_user.profile.follower_count == 1
+        assert follow_graph.follows(user.id, user_2.id)
+
+    def test_follow_many(self, user_client, user, another_user, user_2,
+                         follow_1):
+        response = user_client.post(
+            self.many_url,
+            data={'following': [another_user.username, user_2.username]},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{self.many_url}` возвращает '
+            'статус 201, если созданы новые подписки.'
+        )
+        assert response.json() == {
+            'created': [user_2.username],
+            'existing': [another_user.username],
+        }
+        assert Follow.objects.filter(user=user).count() == 2
+
+        response = user_client.post(
+            self.many_url, data={'following': [user_2.username]},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_follow_many_invalid(self, user_client, user, another_user):
+        for following in ([], ['nobody'], [user.username]):
+            response = user_client.post(
+                self.many_url, data={'following': following}, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.many_url}` возвращает 400 для '
+                f'{following}.'
+            )
+        assert not Follow.objects.exists()
@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.graph import VERSION_KEY, follow_graph
+from posts.models import Follow
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFollowGraph:
+
+    url = '/api/v1/users/{username}/{query}/'
+
+    def get(self, client, username, query):
+        response = client.get(
+            self.url.format(username=username, query=query)
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` для `{query}` '
+            'возвращает статус 200.'
+        )
+        return response.json()
+
+    def test_followers_following_mutual(self, user_client, user, user_2,
+                                        another_user, follow_1, follow_2,
+                                        follow_4):
+        followers = self.get(user_client, user.username, 'followers')
+        assert followers['count'] == 2
+        assert followers['results'] == [user_2.username,
+                                        another_user.username], (
+            'Проверьте, что `followers` возвращает username подписчиков.'
+        )
+        following = self.get(user_client, user.username, 'following')
+        assert following['results'] == [another_user.username]
+        mutual = self.get(user_client, user.username, 'mutual')
+        assert mutual['results'] == [another_user.username], (
+            'Проверьте, что `mutual` возвращает взаимные подписки.'
+        )
+
+        response = user_client.get(
+            self.url.format(username=user.username, query='followers'),
+            {'limit': 1, 'offset': 1},
+        )
+        assert response.json()['results'] == [another_user.username]
+
+    def test_follows(self, user_client, user, another_user, follow_1):
+        assert self.get(
+            user_client, user.username, f'follows/{another_user.username}'
+        ) == {'follows': True}
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(
+                user_client, another_user.username,
+                f'follows/{user.username}'
+            )
+        assert data == {'follows': False}
+        assert len(queries) == 2, (
+            'Проверьте, что проверка подписки выполняется по графу в памяти '
+            'без запросов к таблице подписок.'
+        )
+        response = user_client.get(
+            self.url.format(username='nobody', query='followers')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_suggestions(self, user_client, django_user_model, user, user_2,
+                         another_user, follow_1, follow_3):
+        third = django_user_model.objects.create_user(username='Third')
+        fourth = django_user_model.objects.create_user(username='Fourth')
+        Follow.objects.create(user=user, following=fourth)
+        Follow.objects.create(user=fourth, following=third)
+        Follow.objects.create(user=another_user, following=third)
+        Follow.objects.create(user=another_user, following=user_2)
+
+        assert self.get(user_client, user.username, 'suggestions') == [
+            third.username, user_2.username
+        ], (
+            'Проверьте, что рекомендации - друзья друзей, отсортированные по '
+            'числу общих подписок, без уже существующих подписок.'
+        )
+
+    def test_graph_follows_changes(self, user_client, user, another_user,
+                                   user_2):
+        assert not follow_graph.follows(user.id, another_user.id)
+        response = user_client.post(
+            '/api/v1/follow/', data={'following': another_user.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert follow_graph.follows(user.id, another_user.id), (
+            'Проверьте, что граф обновляется при создании подписки.'
+        )
+        Follow.objects.filter(user=user).delete()
+        assert not follow_graph.follows(user.id, another_user.id), (
+            'Проверьте, что граф обновляется при удалении подписки.'
+        )
+
+        # Подписка, созданная другим процессом.
+        Follow.objects.bulk_create([Follow(user=user, following=user_2)])
+        cache.incr(VERSION_KEY)
+        assert follow_graph.follows(user.id, user_2.id), (
+            'Проверьте, что граф перезагружается при смене версии в кэше.'
+        )
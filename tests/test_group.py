@@ -113,3 +113,40 @@ class TestGroupAPI:
             'виде словаря.'
         )
         self.check_group_info(test_data, '/api/v1/groups/{group_id}/')
+
+    def test_group_list_etag(self, client, group_1, group_2,
+                             django_assert_num_queries):
+        response = client.get(self.group_url)
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{self.group_url}` '
+            'содержит заголовок `ETag`.'
+        )
+
+        with django_assert_num_queries(0):
+            response = client.get(self.group_url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{self.group_url}` с '
+                'актуальным `If-None-Match` возвращает ответ со статусом 304.'
+            )
+            response = client.get(self.group_url)
+        assert len(response.json()) == Group.objects.count(), (
+            f'Проверьте, что закэшированный ответ `{self.group_url}` '
+            'содержит все группы.'
+        )
+
+    def test_group_cache_invalidation(self, client, group_1):
+        response = client.get(self.group_url)
+        etag = response['ETag']
+
+        group_1.title = 'Новое название'
+        group_1.save()
+        response = client.get(self.group_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения группы GET-запрос к '
+            f'`{self.group_url}` со старым `If-None-Match` возвращает '
+            'обновлённые данные.'
+        )
+        assert response.json()[0]['title'] == group_1.title
+        assert response['ETag'] != etag
+
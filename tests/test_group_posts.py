@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from api.v1.cache import group_posts_cache
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGroupPosts:
+
+    url = '/api/v1/groups/{slug}/posts/'
+
+    def get_ids(self, client, group, **params):
+        response = client.get(self.url.format(slug=group.slug), params)
+        assert response.status_code == HTTPStatus.OK
+        return [item['id'] for item in response.json()['results']]
+
+    def test_list(self, client, post, post_2, another_post, group_1):
+        response = client.get(self.url.format(slug=group_1.slug))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос к `/api/v1/groups/<slug>/posts/` '
+            'возвращает статус 200.'
+        )
+        data = response.json()
+        assert data['count'] == 2
+        assert [item['id'] for item in data['results']] == [
+            post_2.id, post.id
+        ], 'Проверьте, что отдаются посты группы от новых к старым.'
+        assert data['results'][0]['text'] == post_2.text
+
+    def test_not_found(self, client, post):
+        response = client.get(self.url.format(slug='missing'))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_pages(self, client, user, group_1):
+        posts = [
+            Post.objects.create(text=f'Пост {index}', author=user,
+                                group=group_1)
+            for index in range(5)
+        ]
+        expected = [post.id for post in reversed(posts)]
+        with override_settings(API_GROUP_POSTS_CACHE_DEPTH=3):
+            assert self.get_ids(client, group_1, limit=2) == expected[:2]
+            assert self.get_ids(
+                client, group_1, limit=2, offset=2
+            ) == expected[2:4], (
+                'Проверьте, что страница за пределами кэша выбирается из БД.'
+            )
+            response = client.get(
+                self.url.format(slug=group_1.slug), {'limit': 2, 'offset': 4}
+            )
+        data = response.json()
+        assert [item['id'] for item in data['results']] == expected[4:]
+        assert data['count'] == 5
+        assert data['next'] is None
+
+    def test_cached(self, client, post, post_2, group_1):
+        self.get_ids(client, group_1)
+        assert len(group_posts_cache) == 1
+        with CaptureQueriesContext(connection) as queries:
+            self.get_ids(client, group_1)
+        assert len(queries) == 1, (
+            'Проверьте, что первые страницы постов группы отдаются из кэша '
+            'с единственным запросом группы по slug.'
+        )
+
+    def test_invalidated_on_create(self, client, post, user, group_1):
+        assert self.get_ids(client, group_1) == [post.id]
+        new_post = Post.objects.create(text='Новый', author=user,
+                                       group=group_1)
+        assert self.get_ids(client, group_1) == [new_post.id, post.id], (
+            'Проверьте, что сохранение поста сбрасывает кэш его группы.'
+        )
+
+    def test_invalidated_on_delete(self, client, post, post_2, group_1):
+        self.get_ids(client, group_1)
+        post_2.delete()
+        assert self.get_ids(client, group_1) == [post.id], (
+            'Проверьте, что удаление поста сбрасывает кэш его группы.'
+        )
+
+    def test_invalidated_on_group_change(self, user_client, post, post_2,
+                                         group_1, group_2):
+        self.get_ids(user_client, group_1)
+        self.get_ids(user_client, group_2)
+        response = user_client.patch(
+            f'/api/v1/posts/{post.id}/', {'group': group_2.id}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_ids(user_client, group_1) == [post_2.id], (
+            'Проверьте, что перенос поста в другую группу сбрасывает кэш '
+            'прежней группы.'
+        )
+        assert self.get_ids(user_client, group_2) == [post.id]
+
+    def test_uses_index(self, client, post, group_1):
+        with CaptureQueriesContext(connection) as queries:
+            self.get_ids(client, group_1)
+        sql = queries.captured_queries[-1]['sql']
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        assert 'USING INDEX post_group_pub_date_idx' in plan, (
+            'Проверьте, что посты группы выбираются по индексу.'
+        )
+        assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,232 @@
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.db.models.signals import pre_save
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from PIL import Image
+
+from posts import images
+from posts.models import Post
+
+
+def make_image(size=(1200, 800), image_format='JPEG'):
+    image = Image.new('RGB', size, 'red')
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera'
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, exif=exif)
+    buffer.name = f'photo.{image_format.lower()}'
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostImages:
+
+    post_list_url = '/api/v1/posts/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+
+    def create_post(self, client, image):
+        response = client.post(
+            self.post_list_url, data={'text': 'Пост с фото', 'image': image}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос с изображением к '
+            f'`{self.post_list_url}` возвращает статус 201.'
+        )
+        return response.json()
+
+    def test_renditions_created(self, user_client, media_root, settings):
+        settings.POST_IMAGE_WORKERS = 0
+        data = self.create_post(user_client, make_image())
+        assert data['image_renditions'] == {}
+
+        response = user_client.get(
+            self.post_detail_url.format(post_id=data['id'])
+        )
+        renditions = response.json()['image_renditions']
+        assert set(renditions) == set(settings.POST_IMAGE_RENDITIONS), (
+            'Проверьте, что ответ содержит поле `image_renditions` с URL '
+            'уменьшенных копий изображения для каждого размера.'
+        )
+        assert set(renditions['small']) == {'webp', 'jpeg'}
+
+        paths = Post.objects.get(id=data['id']).image_renditions
+        for size_name, size in settings.POST_IMAGE_RENDITIONS.items():
+            for path in paths[size_name].values():
+                with default_storage.open(path) as file, \
+                        Image.open(file) as image:
+                    assert max(image.size) == size
+                    assert not image.getexif(), (
+                        'Проверьте, что из уменьшенных копий удалены '
+                        'метаданные EXIF.'
+                    )
+
+    def test_renditions_in_background(self, user_client, media_root,
+                                      settings):
+        settings.POST_IMAGE_WORKERS = 2
+        data = self.create_post(user_client, make_image())
+        images.shutdown_workers()
+        post = Post.objects.get(id=data['id'])
+        assert set(post.image_renditions) == set(
+            settings.POST_IMAGE_RENDITIONS
+        ), 'Проверьте, что копии изображения создаются фоновым воркером.'
+
+    def test_image_update_resets_renditions(self, user_client, post,
+                                            media_root, settings):
+        settings.POST_IMAGE_WORKERS = 0
+        url = self.post_detail_url.format(post_id=post.id)
+        response = user_client.patch(
+            url, data={'text': 'Без изображения'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        post.refresh_from_db()
+        assert post.image_renditions == {}
+
+        response = user_client.patch(
+            url,
+            data=encode_multipart(
+                BOUNDARY, {'image': make_image(image_format='PNG')}
+            ),
+            content_type=MULTIPART_CONTENT,
+        )
+        assert response.status_code == HTTPStatus.OK
+        post.refresh_from_db()
+        assert set(post.image_renditions['medium']) == {'webp', 'jpeg'}
+
+    def test_original_without_metadata(self, user_client, media_root,
+                                       settings):
+        settings.POST_IMAGE_WORKERS = 0
+        data = self.create_post(user_client, make_image())
+        post = Post.objects.get(id=data['id'])
+        with default_storage.open(post.image.name) as file, \
+                Image.open(file) as image:
+            assert not image.getexif(), (
+                'Проверьте, что из исходного изображения удаляются '
+                'метаданные EXIF.'
+            )
+            assert image.size == (1200, 800)
+
+    def test_text_update_keeps_renditions(self, user_client, post,
+                                          media_root):
+        renditions = {'small': {'webp': 'posts/renditions/1/small.webp'}}
+
+        def renditions_ready(sender, instance, **kwargs):
+            # Воркер записывает копии между чтением поста и сохранением.
+            Post.objects.filter(pk=instance.pk).update(
+                image_renditions=renditions
+            )
+
+        pre_save.connect(renditions_ready, sender=Post)
+        try:
+            response = user_client.patch(
+                self.post_detail_url.format(post_id=post.id),
+                data={'text': 'Новый текст'}, format='json',
+            )
+        finally:
+            pre_save.disconnect(renditions_ready, sender=Post)
+        assert response.status_code == HTTPStatus.OK
+        post.refresh_from_db()
+        assert post.image_renditions == renditions, (
+            'Проверьте, что изменение текста поста не перезаписывает '
+            '`image_renditions`, записанные воркером.'
+        )
+
+    def test_renditions_deleted(self, user_client, media_root, settings):
+        settings.POST_IMAGE_WORKERS = 0
+        data = self.create_post(user_client, make_image())
+        url = self.post_detail_url.format(post_id=data['id'])
+        directory = media_root / images.RENDITIONS_DIR / str(data['id'])
+        old_files = set(directory.iterdir())
+        assert old_files
+        response = user_client.patch(
+            url,
+            data=encode_multipart(
+                BOUNDARY, {'image': make_image(size=(600, 400))}
+            ),
+            content_type=MULTIPART_CONTENT,
+        )
+        assert response.status_code == HTTPStatus.OK
+        new_paths = [
+            path
+            for paths in Post.objects.get(id=data['id'])
+            .image_renditions.values()
+            for path in paths.values()
+        ]
+        assert {
+            media_root / path for path in new_paths
+        } == set(directory.iterdir()), (
+            'Проверьте, что при замене изображения удаляются файлы '
+            'прежних копий.'
+        )
+        with Image.open(media_root / new_paths[-1]) as image:
+            assert max(image.size) <= 600
+
+        user_client.delete(url)
+        assert not any(default_storage.exists(path) for path in new_paths), (
+            'Проверьте, что при удалении поста удаляются файлы его копий.'
+        )
+
+    def test_invalid_image(self, user_client, media_root):
+        broken = BytesIO(b'not an image')
+        broken.name = 'photo.jpg'
+        response = user_client.post(
+            self.post_list_url, data={'text': 'Пост', 'image': broken}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что загрузка повреждённого изображения возвращает '
+            'статус 400.'
+        )
+
+    def test_upload_limits(self, user_client, media_root, settings):
+        settings.POST_IMAGE_MAX_DIMENSION = 1000
+        response = user_client.post(
+            self.post_list_url,
+            data={'text': 'Пост', 'image': make_image(size=(1001, 10))},
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что изображение больше POST_IMAGE_MAX_DIMENSION '
+            'отклоняется со статусом 400.'
+        )
+        assert 'image' in response.json()
+
+        response = user_client.post(
+            self.post_list_url,
+            data={'text': 'Пост', 'image': make_image(image_format='BMP')},
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что изображения недопустимых форматов отклоняются.'
+        )
+
+        settings.POST_IMAGE_MAX_SIZE = 1024
+        image = make_image(size=(100, 100))
+        image.seek(0, 2)
+        image.write(b'\0' * 2048)
+        image.seek(0)
+        response = user_client.post(
+            self.post_list_url, data={'text': 'Пост', 'image': image}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что файл больше POST_IMAGE_MAX_SIZE отклоняется '
+            'со статусом 400.'
+        )
+        assert not Post.objects.exists()
+        assert not list((media_root / 'tmp').iterdir()), (
+            'Проверьте, что временные файлы отклонённых загрузок удаляются.'
+        )
+
+    def test_upload_moved_to_storage(self, user_client, media_root,
+                                     settings):
+        settings.POST_IMAGE_WORKERS = 0
+        data = self.create_post(user_client, make_image())
+        post = Post.objects.get(id=data['id'])
+        assert (media_root / post.image.name).exists()
+        assert not list((media_root / 'tmp').iterdir())
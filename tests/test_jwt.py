@@ -142,3 +142,26 @@ class TestJWT:
                 f'отправленный к `{url}`, возвращает ответ со статусом 200. '
                 'Корректными данными считаются `refresh`- и `access`-токены.'
             )
+
+    def test_jwt_stateless_authentication(self, client, user,
+                                          django_assert_num_queries):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        response = client.post(
+            self.url_create,
+            data={'username': user.username, 'password': '1234567'}
+        )
+        access = response.json()['access']
+        assert AccessToken(access)['username'] == user.username, (
+            f'Убедитесь, что токен, выданный `{self.url_create}`, содержит '
+            'claim `username`.'
+        )
+
+        with django_assert_num_queries(1):
+            response = client.get(
+                '/api/v1/follow/', HTTP_AUTHORIZATION=f'Bearer {access}'
+            )
+        assert response.status_code == HTTPStatus.OK, (
+            'Убедитесь, что запрос с access-токеном не загружает '
+            'пользователя из базы данных.'
+        )
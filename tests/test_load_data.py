@@ -0,0 +1,116 @@
+import datetime
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from posts.graph import follow_graph
+from posts.management.commands.load_data import Command
+from posts.models import Comment, Follow, Group, Post
+
+
+def write_ndjson(path, rows):
+    path.write_text(
+        ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows),
+        encoding='utf-8',
+    )
+    return str(path)
+
+
+def load(*args, **options):
+    out, err = StringIO(), StringIO()
+    call_command('load_data', *args, stdout=out, stderr=err, **options)
+    return out.getvalue(), err.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadData:
+
+    def test_load_all_models(self, tmp_path, user, another_user):
+        groups = tmp_path / 'groups.csv'
+        groups.write_text(
+            'id,title,slug,description\n7,Группа,group,Описание\n',
+            encoding='utf-8',
+        )
+        load('group', str(groups))
+        assert Group.objects.get(pk=7).slug == 'group'
+
+        posts = write_ndjson(tmp_path / 'posts.ndjson', [
+            {'id': 10, 'text': 'Первый', 'author': user.username,
+             'pub_date': '2020-01-01T10:00:00Z', 'group': 'group'},
+            {'id': 11, 'text': 'Второй', 'author': 'NewAuthor',
+             'group': 7},
+            {'id': 12, 'text': 'Без автора', 'author': 'nobody'},
+        ])
+        out, err = load('post', posts)
+        assert 'Запись 3 пропущена' in err, (
+            'Проверьте, что записи с неизвестным автором пропускаются.'
+        )
+        assert set(Post.objects.values_list('id', flat=True)) == {10}
+        assert Post.objects.get(pk=10).pub_date == datetime.datetime(
+            2020, 1, 1, 10, tzinfo=datetime.timezone.utc
+        ), 'Проверьте, что дата публикации берётся из файла.'
+
+        load('post', posts, create_users=True)
+        assert set(Post.objects.values_list('id', flat=True)) == {
+            10, 11, 12
+        }, (
+            'Проверьте, что повторная загрузка не создаёт дубликаты, а '
+            '`--create-users` создаёт отсутствующих авторов.'
+        )
+        assert Post.objects.get(pk=11).author.profile.follower_count == 0
+
+        comments = write_ndjson(tmp_path / 'comments.ndjson', [
+            {'id': 1, 'post': 10, 'author': another_user.username,
+             'text': 'Комментарий'},
+            {'id': 2, 'post': 10, 'author': user.username, 'text': 'Ещё'},
+            {'id': 3, 'post': 999, 'author': user.username, 'text': 'Нет'},
+        ])
+        load('comment', comments)
+        assert Comment.objects.count() == 2
+        assert Post.objects.get(pk=10).comment_count == 2, (
+            'Проверьте, что после загрузки пересчитываются счётчики.'
+        )
+
+        follows = write_ndjson(tmp_path / 'follows.ndjson', [
+            {'user': user.username, 'following': another_user.username},
+            {'user': user.username, 'following': user.username},
+        ])
+        assert not follow_graph.follows(user.id, another_user.id)
+        load('follow', follows)
+        assert Follow.objects.count() == 1
+        assert follow_graph.follows(user.id, another_user.id), (
+            'Проверьте, что граф подписок перезагружается после загрузки.'
+        )
+        user.profile.refresh_from_db()
+        assert user.profile.following_count == 1
+
+    def test_resume(self, tmp_path, monkeypatch, user):
+        path = write_ndjson(tmp_path / 'posts.ndjson', [
+            {'id': index, 'text': f'Пост {index}', 'author': user.username}
+            for index in range(1, 6)
+        ])
+        report_progress = Command.report_progress
+
+        def fail_after_first_chunk(self, number, started):
+            report_progress(self, number, started)
+            raise RuntimeError('Сбой')
+
+        monkeypatch.setattr(
+            Command, 'report_progress', fail_after_first_chunk
+        )
+        with pytest.raises(RuntimeError):
+            load('post', path, transaction_size=2)
+        assert Post.objects.count() == 2
+        with open(f'{path}.checkpoint') as file:
+            assert file.read() == '2'
+
+        monkeypatch.setattr(Command, 'report_progress', report_progress)
+        out, _ = load('post', path, transaction_size=2, resume=True)
+        assert 'Загружено записей: 3' in out, (
+            'Проверьте, что `--resume` продолжает загрузку с контрольной '
+            'точки.'
+        )
+        assert Post.objects.count() == 5
+        assert not (tmp_path / 'posts.ndjson.checkpoint').exists()
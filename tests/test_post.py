@@ -1,3 +1,5 @@
+import json
+from base64 import b64encode
 from http import HTTPStatus
 
 from django.db.utils import IntegrityError
@@ -127,6 +129,94 @@ class TestPostAPI:
             db_post=db_post
         )
 
+    @pytest.mark.usefixtures('post', 'post_2', 'another_post')
+    def test_posts_get_keyset_paginated(self, user_client):
+        url = f'{self.post_list_url}?pagination=cursor&limit=2'
+        received_ids = []
+        while url:
+            response = user_client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                'Убедитесь, что GET-запрос с параметром `pagination=cursor` '
+                f'к `{self.post_list_url}` возвращает ответ со статусом 200.'
+            )
+            test_data = response.json()
+            assert 'results' in test_data and 'next' in test_data, (
+                'Убедитесь, что ответ на GET-запрос с параметром '
+                f'`pagination=cursor` к `{self.post_list_url}` содержит поля '
+                '`results` и `next`.'
+            )
+            received_ids.extend(item['id'] for item in test_data['results'])
+            url = test_data['next']
+
+        expected_ids = list(
+            Post.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+        assert received_ids == expected_ids, (
+            'Убедитесь, что при keyset-пагинации страницы '
+            f'`{self.post_list_url}` возвращают все посты по одному разу в '
+            'порядке убывания даты публикации.'
+        )
+
+    def test_posts_get_invalid_cursor(self, user_client, post):
+        response = user_client.get(f'{self.post_list_url}?cursor=invalid')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Убедитесь, что GET-запрос с некорректным курсором к '
+            f'`{self.post_list_url}` возвращает ответ со статусом 404.'
+        )
+
+    def test_malformed_cursor_values(self, user_client, post):
+        cursors = (
+            ['garbage', 1],
+            ['2020-01-01T00:00:00+00:00', 'abc'],
+            [None, None],
+            [['2020-01-01'], {'id': 1}],
+            ['2020-01-01T00:00:00+00:00', 10 ** 30],
+        )
+        for url in (
+            self.post_list_url,
+            f'{self.post_list_url}{post.id}/comments/',
+            '/api/v1/feed/',
+        ):
+            for position in cursors:
+                cursor = b64encode(json.dumps(position).encode()).decode()
+                response = user_client.get(url, {'cursor': cursor})
+                assert response.status_code == HTTPStatus.NOT_FOUND, (
+                    f'Убедитесь, что GET-запрос к `{url}` с курсором '
+                    f'{position} возвращает ответ со статусом 404.'
+                )
+        cursor = b64encode(
+            json.dumps(['2020-01-01T00:00:00', post.id]).encode()
+        ).decode()
+        response = user_client.get(self.post_list_url, {'cursor': cursor})
+        assert response.status_code == HTTPStatus.OK
+
+    def test_post_detail_conditional_get(self, client, user_client, post,
+                                         django_assert_num_queries):
+        url = self.post_detail_url.format(post_id=post.id)
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{self.post_detail_url}` '
+            'содержит заголовки `ETag` и `Last-Modified`.'
+        )
+
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{self.post_detail_url}` с '
+            'актуальным `If-None-Match` возвращает ответ со статусом 304.'
+        )
+
+        user_client.patch(url, data=self.VALID_DATA)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения поста GET-запрос к '
+            f'`{self.post_detail_url}` со старым `If-None-Match` возвращает '
+            'обновлённые данные.'
+        )
+        assert response.json()['text'] == self.VALID_DATA['text']
+
     def test_post_create_auth_with_invalid_data(self, user_client):
         posts_count = Post.objects.count()
         response = user_client.post(self.post_list_url, data={})
@@ -0,0 +1,116 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Post
+
+
+def set_pub_date(post, *args):
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=datetime.datetime(*args, tzinfo=datetime.timezone.utc)
+    )
+
+
+def result_ids(response):
+    data = response.json()
+    if isinstance(data, dict):
+        data = data['results']
+    return [item['id'] for item in data]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostFilters:
+
+    url = '/api/v1/posts/'
+
+    @pytest.fixture
+    def dated_posts(self, post, post_2, another_post):
+        set_pub_date(post, 2024, 1, 10)
+        set_pub_date(post_2, 2024, 2, 10)
+        set_pub_date(another_post, 2024, 2, 10)
+        return post, post_2, another_post
+
+    def test_ordering(self, client, dated_posts):
+        post, post_2, another_post = dated_posts
+        expected = [another_post.id, post_2.id, post.id]
+        for params in ({}, {'limit': 10}, {'pagination': 'cursor'}):
+            response = client.get(self.url, params)
+            assert response.status_code == HTTPStatus.OK
+            assert result_ids(response) == expected, (
+                'Проверьте, что посты отсортированы по убыванию даты '
+                'публикации, а при равных датах - по убыванию id.'
+            )
+
+    def test_group_filter(self, client, dated_posts, group_1, group_2):
+        post, post_2, another_post = dated_posts
+        response = client.get(self.url, {'group': group_1.slug})
+        assert result_ids(response) == [post_2.id, post.id], (
+            'Проверьте, что `?group=<slug>` оставляет посты группы.'
+        )
+        response = client.get(self.url, {'group': 'missing'})
+        assert response.status_code == HTTPStatus.OK
+        assert result_ids(response) == []
+
+    def test_author_filter(self, client, dated_posts, another_user):
+        post, post_2, another_post = dated_posts
+        response = client.get(
+            self.url, {'author': another_user.username, 'limit': 10}
+        )
+        assert result_ids(response) == [another_post.id], (
+            'Проверьте, что `?author=<username>` оставляет посты автора.'
+        )
+        assert response.json()['count'] == 1
+
+    def test_date_filters(self, client, dated_posts):
+        post, post_2, another_post = dated_posts
+        response = client.get(self.url, {'since': '2024-02-01'})
+        assert result_ids(response) == [another_post.id, post_2.id], (
+            'Проверьте, что `?since=` оставляет посты не раньше даты.'
+        )
+        response = client.get(
+            self.url, {'since': '2024-01-01', 'until': '2024-02-10T00:00'}
+        )
+        assert result_ids(response) == [post.id], (
+            'Проверьте, что `?until=` оставляет посты строго раньше даты.'
+        )
+
+    def test_combined_filters(self, client, dated_posts, user, group_1):
+        post, post_2, another_post = dated_posts
+        response = client.get(self.url, {
+            'author': user.username,
+            'group': group_1.slug,
+            'since': '2024-02-01',
+        })
+        assert result_ids(response) == [post_2.id]
+
+    def test_invalid_date(self, client, post):
+        response = client.get(self.url, {'until': 'вчера'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неверная дата в `?until=` возвращает 400.'
+        )
+        assert 'until' in response.json()
+
+    @pytest.mark.parametrize('params, index', [
+        ({'group': 'slug'}, 'post_group_pub_date_idx'),
+        ({'author': 'name', 'since': '2024-01-01'},
+         'post_author_pub_date_idx'),
+        ({'since': '2024-01-01', 'until': '2024-02-01'},
+         'post_pub_date_id_idx'),
+    ])
+    def test_filters_use_index(self, client, post, params, index):
+        with CaptureQueriesContext(connection) as queries:
+            client.get(self.url, {**params, 'pagination': 'cursor'})
+        sql = queries.captured_queries[-1]['sql']
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        assert f'SEARCH posts_post USING INDEX {index}' in plan, (
+            'Проверьте, что фильтр выбирает посты по индексу.'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            'Проверьте, что порядок постов берётся из индекса без '
+            'сортировки.'
+        )
@@ -0,0 +1,113 @@
+import pytest
+
+from posts.models import Comment, Follow, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueryCount:
+
+    post_list_url = '/api/v1/posts/'
+    comments_url = '/api/v1/posts/{post_id}/comments/'
+    follow_url = '/api/v1/follow/'
+    objects_count = 100
+
+    @pytest.fixture
+    def authors(self, django_user_model):
+        return [
+            django_user_model.objects.create(username=f'author_{index}')
+            for index in range(self.objects_count)
+        ]
+
+    @pytest.fixture
+    def many_posts(self, authors, group_1):
+        return Post.objects.bulk_create(
+            Post(text=f'Пост {index}', author=author, group=group_1)
+            for index, author in enumerate(authors)
+        )
+
+    def test_post_list_queries(self, client, many_posts,
+                               django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = client.get(self.post_list_url)
+        assert len(response.json()) == self.objects_count, (
+            f'Проверьте, что GET-запрос к `{self.post_list_url}` возвращает '
+            'все посты.'
+        )
+
+    def test_post_list_paginated_queries(self, client, many_posts,
+                                         django_assert_num_queries):
+        with django_assert_num_queries(2):
+            client.get(f'{self.post_list_url}?limit=50&offset=10')
+
+    def test_comment_list_queries(self, client, post, authors,
+                                  django_assert_num_queries):
+        Comment.objects.bulk_create(
+            Comment(text=f'Коммент {index}', author=author, post=post)
+            for index, author in enumerate(authors)
+        )
+        url = self.comments_url.format(post_id=post.id)
+        with django_assert_num_queries(1):
+            response = client.get(f'{url}?limit={self.objects_count}')
+        assert len(response.json()['results']) == self.objects_count, (
+            f'Проверьте, что GET-запрос к `{self.comments_url}` возвращает '
+            'все комментарии поста.'
+        )
+
+    def test_follow_list_queries(self, user_client, user, authors,
+                                 django_assert_num_queries):
+        Follow.objects.bulk_create(
+            Follow(user=user, following=author) for author in authors
+        )
+        # Пользователь берётся из токена без запроса к БД.
+        with django_assert_num_queries(1):
+            response = user_client.get(self.follow_url)
+        assert len(response.json()) == self.objects_count, (
+            f'Проверьте, что GET-запрос к `{self.follow_url}` возвращает '
+            'все подписки пользователя.'
+        )
+
+    @pytest.mark.parametrize('method', ('put', 'patch'))
+    def test_post_update_queries(self, user_client, post, method,
+                                 django_assert_max_num_queries):
+        url = f'{self.post_list_url}{post.id}/'
+        with django_assert_max_num_queries(2):
+            response = getattr(user_client, method)(
+                url, data={'text': 'Новый текст'}
+            )
+        assert response.status_code == 200
+
+    def test_post_delete_queries(self, user_client, post, authors,
+                                 django_assert_max_num_queries):
+        Comment.objects.bulk_create(
+            Comment(text=f'Коммент {index}', author=author, post=post)
+            for index, author in enumerate(authors)
+        )
+        with django_assert_max_num_queries(6):
+            response = user_client.delete(f'{self.post_list_url}{post.id}/')
+        assert response.status_code == 204
+
+    def test_post_update_not_author_queries(self, user_client, another_post,
+                                            django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = user_client.patch(
+                f'{self.post_list_url}{another_post.id}/',
+                data={'text': 'Новый текст'}
+            )
+        assert response.status_code == 403
+
+    @pytest.mark.parametrize('method', ('put', 'patch'))
+    def test_comment_update_queries(self, user_client, post, comment_1_post,
+                                    method, django_assert_max_num_queries):
+        url = self.comments_url.format(post_id=post.id)
+        with django_assert_max_num_queries(2):
+            response = getattr(user_client, method)(
+                f'{url}{comment_1_post.id}/', data={'text': 'Новый текст'}
+            )
+        assert response.status_code == 200
+
+    def test_comment_delete_queries(self, user_client, post, comment_1_post,
+                                    django_assert_max_num_queries):
+        url = self.comments_url.format(post_id=post.id)
+        with django_assert_max_num_queries(4):
+            response = user_client.delete(f'{url}{comment_1_post.id}/')
+        assert response.status_code == 204
@@ -0,0 +1,146 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.core.management import call_command
+from django.db import connections
+
+from api.v1 import replicas
+from api.v1.cache import get_cache
+from posts.models import Post
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """
+    Вторая БД SQLite в файле, доступная только для чтения. Данные в неё
+    копирует команда sync_replica вместо настоящей репликации.
+    """
+    path = tmp_path / 'replica.sqlite3'
+    connections.settings['replica'] = {
+        **connections['default'].settings_dict,
+        'NAME': f'file:{path}?mode=ro',
+        'OPTIONS': {'pragmas': {'journal_mode': None}},
+    }
+    settings.DATABASE_REPLICAS = ['replica']
+    settings.REPLICA_CHECK_SECONDS = 0
+    replicas.reset_health()
+    yield path
+    connections['replica'].close()
+    del connections['replica']
+    del connections.settings['replica']
+    replicas.reset_health()
+
+
+def sync_replica():
+    call_command('sync_replica', stdout=None)
+
+
+def age_version(namespace):
+    """Делает последнее изменение пространства имён давним."""
+    get_cache().set(f'version:{namespace}', time.time_ns() - 60 * 10 ** 9)
+
+
+def titles(response):
+    assert response.status_code == HTTPStatus.OK
+    return [post['text'] for post in response.json()]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicas:
+
+    url = '/api/v1/posts/'
+
+    def test_reads_from_replica(self, user_client, replica, user, post):
+        sync_replica()
+        Post.objects.create(text='Не реплицирован', author=user)
+        age_version('posts')
+        assert titles(user_client.get(self.url)) == [post.text], (
+            'Проверьте, что GET-запросы к API читают с реплики.'
+        )
+        sync_replica()
+        assert len(titles(user_client.get(self.url))) == 2
+
+    def test_read_your_writes(self, user_client, another_user_client,
+                              replica, user, post):
+        sync_replica()
+        response = user_client.post(self.url, data={'text': 'Новый'})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запись идёт в основную БД.'
+        )
+        age_version('posts')
+        assert 'Новый' in titles(user_client.get(self.url)), (
+            'Проверьте, что после записи пользователь читает с основной БД.'
+        )
+        assert 'Новый' not in titles(another_user_client.get(self.url)), (
+            'Проверьте, что другие пользователи читают с реплики.'
+        )
+        get_cache().delete(replicas.last_write_key(user.id))
+        assert 'Новый' not in titles(user_client.get(self.url))
+
+    def test_recent_change_reads_primary(self, user_client, replica, user,
+                                         post):
+        sync_replica()
+        new_post = Post.objects.create(text='Новый', author=user)
+        response = user_client.get(f'{self.url}{new_post.id}/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ответ с ETag после недавнего изменения данных '
+            'строится по основной БД.'
+        )
+        age_version(f'post:{new_post.id}')
+        response = user_client.get(f'{self.url}{new_post.id}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_failover(self, user_client, replica, user, post):
+        sync_replica()
+        assert replicas.choose_replica() == 'replica'
+        connections['replica'].close()
+        replica.unlink()
+        Post.objects.create(text='Новый', author=user)
+        age_version('posts')
+        assert len(titles(user_client.get(self.url))) == 2, (
+            'Проверьте, что при недоступной реплике чтение идёт с основной '
+            'БД.'
+        )
+        assert replicas.choose_replica() is None, (
+            'Проверьте, что недоступная реплика временно исключается.'
+        )
+
+    def test_no_replicas(self, user_client, post):
+        assert replicas.choose_replica() is None
+        assert titles(user_client.get(self.url)) == [post.text]
+
+    def test_replicas_not_migrated(self, replica):
+        router = replicas.ReplicaRouter()
+        assert not router.allow_migrate('replica', 'posts')
+        assert router.allow_migrate('default', 'posts')
+
+    def test_async_without_thread_handoff(self, monkeypatch, replica, user,
+                                          post):
+        sync_replica()
+        Post.objects.create(text='Не реплицирован', author=user)
+        age_version('posts')
+        threads = []
+        is_replica_path = replicas.is_replica_path
+
+        def record_thread(path):
+            threads.append(threading.get_ident())
+            return is_replica_path(path)
+
+        monkeypatch.setattr(replicas, 'is_replica_path', record_thread)
+
+        async def get():
+            threads.append(threading.get_ident())
+            return await AsyncClient().get('/api/v1/async/posts/')
+
+        response = async_to_sync(get)()
+        assert titles(response) == [post.text], (
+            'Проверьте, что async-эндпоинты читают с реплики.'
+        )
+        assert len(threads) == 2 and threads[0] == threads[1], (
+            'Проверьте, что под ASGI ReplicaMiddleware выполняется в event '
+            'loop, без перехода в поток.'
+        )
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from posts.models import Post
+from posts.search import get_search_backend
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostSearch:
+
+    post_list_url = '/api/v1/posts/'
+
+    def search(self, client, query):
+        response = client.get(self.post_list_url, {'search': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.post_list_url}?search=` '
+            'возвращает статус 200.'
+        )
+        return [post['id'] for post in response.json()]
+
+    def test_search_ranked(self, user_client, user):
+        rare = Post.objects.create(text='Котики и собаки', author=user)
+        often = Post.objects.create(
+            text='Котики, котики и ещё раз котики', author=user
+        )
+        Post.objects.create(text='Про погоду', author=user)
+
+        assert self.search(user_client, 'котики') == [often.id, rare.id], (
+            'Проверьте, что поиск возвращает только подходящие посты, '
+            'отсортированные по релевантности.'
+        )
+        assert self.search(user_client, 'КОТ собак') == [rare.id], (
+            'Проверьте, что поиск ищет все слова запроса по префиксу '
+            'без учёта регистра.'
+        )
+        assert self.search(user_client, '"*(') == []
+
+    def test_search_index_follows_changes(self, user_client, user):
+        post = Post.objects.create(text='Старый текст', author=user)
+        Post.objects.bulk_create([Post(text='Пакетный текст', author=user)])
+        assert len(self.search(user_client, 'текст')) == 2
+
+        post.text = 'Новое содержание'
+        post.save()
+        assert self.search(user_client, 'старый') == []
+        assert self.search(user_client, 'новое') == [post.id]
+
+        Post.objects.filter(id=post.id).update(text='Обновлено запросом')
+        assert self.search(user_client, 'запросом') == [post.id]
+
+        post.delete()
+        assert self.search(user_client, 'запросом') == []
+
+    def test_rebuild_search_index(self, user_client, user):
+        post = Post.objects.create(text='Перестройка индекса', author=user)
+        get_search_backend().uninstall(connection)
+        call_command('rebuild_search_index')
+        assert self.search(user_client, 'индекса') == [post.id], (
+            'Проверьте, что команда `rebuild_search_index` создаёт и '
+            'заполняет поисковый индекс.'
+        )
+
+    def test_search_paginated(self, user_client, user):
+        for number in range(3):
+            Post.objects.create(text=f'Поиск {number}', author=user)
+        response = user_client.get(
+            self.post_list_url, {'search': 'поиск', 'limit': 2}
+        )
+        data = response.json()
+        assert data['count'] == 3
+        assert len(data['results']) == 2
+
+    def test_admin_search(self, admin_client, user):
+        post = Post.objects.create(text='Поиск в админке', author=user)
+        Post.objects.create(text='Другой пост', author=user)
+        response = admin_client.get(
+            '/admin/posts/post/', {'q': 'админке'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert list(response.context['cl'].result_list) == [post]
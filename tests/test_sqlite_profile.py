@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+from django.db import OperationalError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from posts.models import Group
+from yatube_api.sqlite import base
+
+
+class FakeCursor:
+
+    def __init__(self, errors):
+        self.errors = errors
+        self.executed = []
+
+    def execute(self, sql):
+        self.executed.append(sql)
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSQLiteProfile:
+
+    def test_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 1, (
+                'Проверьте, что при подключении включается '
+                '`synchronous=NORMAL`.'
+            )
+            cursor.execute('PRAGMA cache_size')
+            assert cursor.fetchone()[0] == base.PRAGMAS['cache_size']
+            cursor.execute('PRAGMA temp_store')
+            assert cursor.fetchone()[0] == 2
+
+    def test_atomic_begins_immediate(self):
+        lock = base.get_write_lock(connection.settings_dict['NAME'])
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                Group.objects.create(title='Группа', slug='group')
+                assert lock.locked(), (
+                    'Проверьте, что пишущая транзакция занимает очередь '
+                    'на запись.'
+                )
+        assert queries[0]['sql'] == 'BEGIN IMMEDIATE', (
+            'Проверьте, что транзакции начинаются с `BEGIN IMMEDIATE`.'
+        )
+        assert not lock.locked()
+
+        with pytest.raises(ValueError):
+            with transaction.atomic():
+                Group.objects.create(title='Вторая', slug='second')
+                raise ValueError
+        assert not lock.locked(), (
+            'Проверьте, что откат транзакции освобождает очередь на запись.'
+        )
+        assert not Group.objects.filter(slug='second').exists()
+
+    def test_writers_wait_in_queue(self):
+        events = []
+        started = threading.Event()
+
+        def write():
+            started.set()
+            with transaction.atomic():
+                events.append('second')
+
+        with transaction.atomic():
+            thread = threading.Thread(target=write)
+            thread.start()
+            started.wait()
+            thread.join(0.2)
+            assert thread.is_alive(), (
+                'Проверьте, что вторая пишущая транзакция ждёт первую.'
+            )
+            events.append('first')
+        thread.join()
+        assert events == ['first', 'second']
+
+    def test_begin_retries_with_backoff(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(base.time, 'sleep', sleeps.append)
+        cursor = FakeCursor([OperationalError('database is locked')] * 2)
+        monkeypatch.setattr(connection, 'cursor', lambda: cursor)
+        connection.begin_immediate()
+        assert cursor.executed == ['BEGIN IMMEDIATE'] * 3
+        assert len(sleeps) == 2 and sleeps[0] < sleeps[1], (
+            'Проверьте, что BEGIN IMMEDIATE повторяется с растущей паузой.'
+        )
+
+        retries = connection.profile['write_retries']
+        cursor = FakeCursor(
+            [OperationalError('database is locked')] * (retries + 1)
+        )
+        monkeypatch.setattr(connection, 'cursor', lambda: cursor)
+        with pytest.raises(OperationalError):
+            connection.begin_immediate()
+        assert len(cursor.executed) == retries + 1
+
+        cursor = FakeCursor([OperationalError('disk I/O error')])
+        monkeypatch.setattr(connection, 'cursor', lambda: cursor)
+        with pytest.raises(OperationalError):
+            connection.begin_immediate()
+        assert len(cursor.executed) == 1, (
+            'Проверьте, что повторяются только ошибки блокировки.'
+        )
@@ -0,0 +1,110 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from posts.graph import follow_graph
+from posts.models import FeedItem, Follow
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUnfollow:
+
+    url = '/api/v1/follow/'
+    detail_url = '/api/v1/follow/{username}/'
+    export_url = '/api/v1/follow/export/'
+
+    def test_unfollow(self, user_client, user, another_user, another_post,
+                      follow_1):
+        assert FeedItem.objects.filter(user=user).exists()
+        assert follow_graph.follows(user.id, another_user.id)
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.delete(
+                self.detail_url.format(username=another_user.username)
+            )
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            f'Проверьте, что DELETE-запрос к `{self.detail_url}` '
+            'возвращает статус 204.'
+        )
+        deletes = [
+            query for query in queries
+            if query['sql'].startswith('DELETE FROM "posts_follow"')
+        ]
+        assert len(deletes) == 1, (
+            'Проверьте, что подписка удаляется одним запросом DELETE.'
+        )
+        assert not Follow.objects.filter(user=user).exists()
+        assert not FeedItem.objects.filter(user=user).exists(), (
+            'Проверьте, что посты автора убираются из ленты после отписки.'
+        )
+        user.profile.refresh_from_db()
+        another_user.profile.refresh_from_db()
+        assert user.profile.following_count == 0
+        assert another_user.profile.follower_count == 0
+        assert not follow_graph.follows(user.id, another_user.id)
+
+        response = user_client.delete(
+            self.detail_url.format(username=another_user.username)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отписка от автора, на которого пользователь '
+            'не подписан, возвращает статус 404.'
+        )
+
+    def test_unfollow_unauthorized(self, client, follow_1, another_user):
+        response = client.delete(
+            self.detail_url.format(username=another_user.username)
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert Follow.objects.exists()
+
+    def test_export(self, user_client, user, user_2, another_user, follow_1,
+                    follow_2, follow_4, settings):
+        Follow.objects.create(user=user, following=user_2)
+        response = user_client.get(self.export_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert [row['following'] for row in rows] == [
+            another_user.username, user_2.username
+        ], (
+            'Проверьте, что экспорт возвращает все подписки пользователя '
+            'по возрастанию id.'
+        )
+        response = user_client.get(
+            self.export_url, {'after': rows[0]['id']}
+        )
+        lines = b''.join(response.streaming_content).splitlines()
+        assert [json.loads(line) for line in lines] == rows[1:], (
+            'Проверьте, что параметр `after` продолжает экспорт.'
+        )
+
+    def test_prefix_search(self, user_client, user, user_2, another_user):
+        Follow.objects.create(user=user, following=user_2)
+        Follow.objects.create(user=user, following=another_user)
+        response = user_client.get(self.url, {'search': 'TestUser2'})
+        assert [row['following'] for row in response.json()] == [
+            user_2.username
+        ], 'Проверьте, что поиск подписок работает по началу username.'
+        response = user_client.get(
+            self.url, {'search': user_2.username[1:]}
+        )
+        assert response.json() == [], (
+            'Проверьте, что поиск подписок не ищет подстроку в середине '
+            'username.'
+        )
+
+    def test_prefix_lookup_uses_index(self, user):
+        queryset = Follow.objects.filter(following__username__prefix='abc')
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'username>? AND username<?' in plan, (
+            'Проверьте, что поиск по префиксу использует индекс username.'
+        )
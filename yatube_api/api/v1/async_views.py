@@ -0,0 +1,60 @@
+from asgiref.sync import sync_to_async
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .cache import get_version
+from .mixins import ConditionalGetMixin
+from .replicas import primary_if_changed_since
+from .views import CommentViewSet, GroupViewSet, PostViewSet
+
+
+def as_async_view(viewset_class, action):
+    """
+    async-версия list/retrieve вьюсета с ConditionalGetMixin для ASGI.
+    В Django 3.2 нет асинхронного ORM, поэтому аутентификация JWT,
+    проверка прав, ответы 304 и из кэша и рендеринг JSON выполняются
+    в event loop, а запросы к БД и сериализация - за один переход
+    sync_to_async. Поток занят только на время работы с БД, а не на всё
+    время обслуживания медленного клиента.
+    """
+
+    async def view(request, *args, **kwargs):
+        self = viewset_class(
+            action_map={"get": action, "head": action},
+            renderer_classes=[JSONRenderer],
+            format_kwarg=None,
+        )
+        self.setup(request, *args, **kwargs)
+        self.headers = self.default_response_headers
+        request = self.request = self.initialize_request(
+            request, *args, **kwargs
+        )
+        try:
+            self.initial(request, *args, **kwargs)
+            namespace = self.get_version_namespace()
+            version = get_version(namespace)
+            response = self.get_cached_response(request, namespace, version)
+            if response is None:
+                handler = getattr(super(ConditionalGetMixin, self), action)
+                with primary_if_changed_since(version):
+                    response = await sync_to_async(self.get_fresh_response)(
+                        namespace, version, handler, request, *args,
+                        **kwargs
+                    )
+            response = self.set_validators(response, namespace, version)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        response = self.finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response):
+            response.render()
+        return response
+
+    view.viewset_class = viewset_class
+    view.action = action
+    return view
+
+
+post_list = as_async_view(PostViewSet, "list")
+post_detail = as_async_view(PostViewSet, "retrieve")
+comment_list = as_async_view(CommentViewSet, "list")
+group_list = as_async_view(GroupViewSet, "list")
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import LRUCache
+
+User = get_user_model()
+
+user_cache = LRUCache(
+    settings.API_USER_CACHE_SIZE, settings.API_USER_CACHE_TTL
+)
+
+
+def load_user(user_id):
+    """Возвращает активного пользователя из кэша процесса или из БД."""
+    user = user_cache.get(user_id)
+    if user is None:
+        try:
+            user = User.objects.get(pk=user_id, is_active=True)
+        except User.DoesNotExist:
+            raise AuthenticationFailed(
+                "Пользователь не найден.", code="user_not_found"
+            )
+        user_cache.set(user_id, user)
+    return user
+
+
+class TokenUser:
+    """
+    Пользователь, восстановленный из подписанных claims JWT.
+    id и username берутся из токена; остальные атрибуты при первом обращении
+    подгружаются из модели User через load_user().
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        self.token = token
+        self.id = self.pk = token[api_settings.USER_ID_CLAIM]
+
+    @cached_property
+    def username(self):
+        return self.token.get("username") or self.instance.username
+
+    @cached_property
+    def instance(self):
+        return load_user(self.id)
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name in ("token", "instance"):
+            raise AttributeError(name)
+        return getattr(self.instance, name)
+
+    def __eq__(self, other):
+        return self.pk == getattr(other, "pk", None)
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return f"TokenUser {self.pk}"
+
+
+def get_user_instance(user):
+    """Модель пользователя для записи в ForeignKey."""
+    if isinstance(user, TokenUser):
+        return user.instance
+    return user
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса к таблице пользователей.
+    Блокировка или удаление пользователя вступают в силу по истечении
+    access-токена или при первом обращении к модели через TokenUser.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(
+                "Токен не содержит идентификатор пользователя."
+            )
+        return TokenUser(validated_token)
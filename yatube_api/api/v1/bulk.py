@@ -0,0 +1,212 @@
+from django.conf import settings
+from django.db import transaction
+from rest_framework import relations, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+def bulk_create_with_pks(model, objs, batch_size=None):
+    """
+    bulk_create, после которого у объектов заполнены первичные ключи.
+    SQLite в Django 3.2 не возвращает ключи из bulk_create, но внутри
+    одной транзакции записи получают подряд идущие rowid, поэтому ключи
+    восстанавливаются по последнему вставленному.
+    """
+    with transaction.atomic():
+        created = model.objects.bulk_create(objs, batch_size=batch_size)
+        if created and created[0].pk is None:
+            last_pk = model.objects.order_by("-pk").values_list(
+                "pk", flat=True
+            ).first()
+            first_pk = last_pk - len(created) + 1
+            for pk, obj in enumerate(created, start=first_pk):
+                obj.pk = pk
+    return created
+
+
+def to_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class InBulkLookup:
+    """
+    Замена queryset для PrimaryKeyRelatedField: связанные объекты всех
+    элементов загружаются заранее одним запросом.
+    """
+
+    def __init__(self, queryset, pks):
+        self.model = queryset.model
+        self.objects = queryset.in_bulk(pks)
+
+    def get(self, pk):
+        try:
+            return self.objects[to_pk(pk)]
+        except KeyError:
+            raise self.model.DoesNotExist
+
+
+class BulkModelMixin:
+    """
+    Примесь для вьюсетов: массовые создание (POST), частичное изменение
+    (PATCH) и удаление (DELETE) до API_BULK_MAX_ITEMS объектов за запрос.
+    Ответ содержит статус для каждого элемента в порядке запроса.
+    """
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError("Ожидается список объектов.")
+        if len(items) > settings.API_BULK_MAX_ITEMS:
+            raise ValidationError(
+                "За один запрос можно обработать не больше "
+                f"{settings.API_BULK_MAX_ITEMS} объектов."
+            )
+        return items
+
+    def get_bulk_child(self, items, **kwargs):
+        """Сериализатор элемента с заранее загруженными связями."""
+        child = self.get_serializer(many=True, **kwargs).child
+        for name, field in child.fields.items():
+            if (
+                field.read_only
+                or not isinstance(field, relations.PrimaryKeyRelatedField)
+            ):
+                continue
+            pks = {
+                to_pk(item.get(field.source))
+                for item in items if isinstance(item, dict)
+            }
+            field.queryset = InBulkLookup(field.get_queryset(), pks)
+        return child
+
+    def get_bulk_objects(self, ids):
+        """Загружает объекты и проверяет права на них одним запросом."""
+        objects = self.get_queryset().filter(pk__in=ids).in_bulk()
+        permissions = self.get_permissions()
+        permitted = {
+            pk for pk, obj in objects.items()
+            if all(
+                permission.has_object_permission(self.request, self, obj)
+                for permission in permissions
+            )
+        }
+        return objects, permitted
+
+    @action(detail=False, methods=["post", "patch", "delete"],
+            url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        items = self.get_bulk_items(request)
+        handler = {
+            "POST": self.bulk_create,
+            "PATCH": self.bulk_update,
+            "DELETE": self.bulk_destroy,
+        }[request.method]
+        return Response(handler(items), status=status.HTTP_207_MULTI_STATUS)
+
+    def bulk_create(self, items):
+        child = self.get_bulk_child(items)
+        results, valid = [], []
+        for item in items:
+            try:
+                valid.append(child.run_validation(item))
+                results.append(None)
+            except ValidationError as error:
+                results.append({
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": error.detail,
+                })
+        objs = [
+            child.Meta.model(**attrs, **self.get_save_kwargs())
+            for attrs in valid
+        ]
+        with transaction.atomic():
+            created = bulk_create_with_pks(child.Meta.model, objs)
+            self.perform_bulk_create(created)
+        data = iter(self.get_serializer(created, many=True).data)
+        return [
+            result or {"status": status.HTTP_201_CREATED, "data": next(data)}
+            for result in results
+        ]
+
+    def get_bulk_status(self, pk, objects, permitted):
+        if pk not in objects:
+            return status.HTTP_404_NOT_FOUND
+        if pk not in permitted:
+            return status.HTTP_403_FORBIDDEN
+        return None
+
+    def bulk_update(self, items):
+        ids = [
+            to_pk(item.get("id")) if isinstance(item, dict) else None
+            for item in items
+        ]
+        objects, permitted = self.get_bulk_objects(ids)
+        child = self.get_bulk_child(items, partial=True)
+        results, changed, fields = [], [], set()
+        for pk, item in zip(ids, items):
+            code = self.get_bulk_status(pk, objects, permitted)
+            if code is not None:
+                results.append({"id": pk, "status": code})
+                continue
+            child.instance = objects[pk]
+            try:
+                attrs = child.run_validation(item)
+            except ValidationError as error:
+                results.append({
+                    "id": pk,
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": error.detail,
+                })
+                continue
+            for attr, value in attrs.items():
+                setattr(objects[pk], attr, value)
+                fields.add(attr)
+            changed.append(objects[pk])
+            results.append({"id": pk, "status": status.HTTP_200_OK})
+        if changed and fields:
+            with transaction.atomic():
+                self.get_queryset().model.objects.bulk_update(
+                    changed, list(fields)
+                )
+                self.perform_bulk_update(changed)
+        data = iter(self.get_serializer(changed, many=True).data)
+        for result in results:
+            if result["status"] == status.HTTP_200_OK:
+                result["data"] = next(data)
+        return results
+
+    def bulk_destroy(self, items):
+        ids = [to_pk(item) for item in items]
+        objects, permitted = self.get_bulk_objects(ids)
+        queryset = self.get_queryset().filter(pk__in=permitted)
+        for permission in self.get_permissions():
+            if hasattr(permission, "filter_permitted"):
+                queryset = permission.filter_permitted(
+                    self.request, self, queryset
+                )
+        with transaction.atomic():
+            queryset.delete()
+        return [
+            {
+                "id": pk,
+                "status": (
+                    self.get_bulk_status(pk, objects, permitted)
+                    or status.HTTP_204_NO_CONTENT
+                ),
+            }
+            for pk in ids
+        ]
+
+    def get_save_kwargs(self):
+        """Поля, которые выставляет сервер при создании объекта."""
+        return {}
+
+    def perform_bulk_create(self, objs):
+        pass
+
+    def perform_bulk_update(self, objs):
+        pass
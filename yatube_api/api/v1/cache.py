@@ -0,0 +1,115 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import quote_etag
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_version(namespace):
+    """
+    Текущая версия данных пространства имён.
+    Версия - время последнего изменения в наносекундах, поэтому после
+    вытеснения из кэша новая версия не совпадёт ни с одной из прежних.
+    """
+    cache = get_cache()
+    key = f"version:{namespace}"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_validators(namespace, version):
+    """ETag и Last-Modified (в секундах) для версии пространства имён."""
+    return quote_etag(f"{namespace}-{version}"), version // 10 ** 9
+
+
+def bump_version(namespace):
+    """Инвалидирует все закэшированные ответы пространства имён."""
+    get_cache().set(f"version:{namespace}", time.time_ns(), None)
+
+
+def invalidate_post(post_id):
+    bump_version("posts")
+    bump_version(f"post:{post_id}")
+
+
+def invalidate_comment(comment_id, post_id):
+    # Вместе с комментариями меняется comment_count поста.
+    bump_version(f"comment:{comment_id}")
+    bump_version(f"comments:{post_id}")
+    invalidate_post(post_id)
+
+
+class LRUCache:
+    """
+    Потокобезопасный кэш процесса ограниченного размера с вытеснением
+    давно не использованных записей и необязательным временем жизни.
+    """
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                return default
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Начало списка постов группы в памяти процесса:
+# {group_id: {"count": ..., "results": [...]}}.
+group_posts_cache = LRUCache(
+    settings.API_GROUP_POSTS_CACHE_SIZE, settings.API_GROUP_POSTS_CACHE_TTL
+)
+
+
+def invalidate_group_posts(*group_ids):
+    """
+    Удаляет закэшированные посты групп, без group_ids - всех групп.
+    Удаление выполняется после фиксации транзакции, чтобы параллельный
+    запрос не успел сохранить в кэш прежние данные.
+    """
+    def delete():
+        if not group_ids:
+            group_posts_cache.clear()
+        for group_id in group_ids:
+            group_posts_cache.delete(group_id)
+
+    transaction.on_commit(delete)
@@ -0,0 +1,152 @@
+import csv
+import datetime
+import json
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+# Не `format`: этот параметр DRF использует для выбора рендерера.
+OUTPUT_PARAM = "output"
+SINCE_PARAM = "since"
+
+POST_COLUMNS = {
+    "id": "id",
+    "text": "text",
+    "pub_date": "pub_date",
+    "author": "author__username",
+    "image": "image",
+    "group": "group_id",
+    "comment_count": "comment_count",
+}
+COMMENT_COLUMNS = {
+    "id": "id",
+    "author": "author__username",
+    "post": "post_id",
+    "text": "text",
+    "created": "created",
+}
+
+
+def iterate_in_batches(queryset, batch_size=EXPORT_BATCH_SIZE, after=None):
+    """
+    Строки queryset.values(...) пачками по возрастанию id: каждая пачка -
+    отдельный короткий запрос `id > последний id LIMIT batch_size`,
+    поэтому медленный клиент не держит открытым курсор к базе.
+    """
+    queryset = queryset.order_by("id")
+    while True:
+        batch = queryset if after is None else queryset.filter(id__gt=after)
+        rows = list(batch[:batch_size])
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        after = rows[-1]["id"]
+
+
+def iterate_columns(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Строки queryset словарями {столбец выгрузки: значение}. Читает
+    курсором по chunk_size строк, не создавая модели и сериализаторы.
+    """
+    names = list(columns)
+    values = queryset.values_list(*columns.values())
+    for row in values.iterator(chunk_size=chunk_size):
+        yield dict(zip(names, row))
+
+
+def format_datetime(value):
+    """Дата и время в том же виде, что и в ответах DRF."""
+    if not isinstance(value, datetime.datetime):
+        raise TypeError(f"{type(value).__name__} не сериализуется в JSON")
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def ndjson_lines(rows, fieldnames):
+    for row in rows:
+        yield json.dumps(row, default=format_datetime, ensure_ascii=False) + (
+            "\n"
+        )
+
+
+class Echo:
+    """Псевдофайл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def csv_value(value):
+    if isinstance(value, datetime.datetime):
+        return format_datetime(value)
+    return value
+
+
+def csv_lines(rows, fieldnames):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fieldnames)
+    for row in rows:
+        yield writer.writerow([csv_value(row[name]) for name in fieldnames])
+
+
+EXPORT_FORMATS = {
+    "ndjson": (ndjson_lines, NDJSON_CONTENT_TYPE),
+    "csv": (csv_lines, "text/csv; charset=utf-8"),
+}
+
+
+def get_output(request):
+    output = request.query_params.get(OUTPUT_PARAM, "ndjson")
+    if output not in EXPORT_FORMATS:
+        raise ValidationError({OUTPUT_PARAM: [
+            "Допустимые значения: " + ", ".join(EXPORT_FORMATS) + "."
+        ]})
+    return output
+
+
+def get_since(request):
+    """Момент времени из `?since=`: дата или дата и время ISO 8601."""
+    return get_datetime_param(request, SINCE_PARAM)
+
+
+def get_datetime_param(request, name):
+    """
+    Момент времени из query-параметра name: дата или дата и время
+    ISO 8601, без часового пояса - UTC. None, если параметра нет.
+    """
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            date = parse_date(value)
+            if date is not None:
+                moment = datetime.datetime.combine(date, datetime.time())
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValidationError({name: [
+            "Ожидается дата или дата и время в формате ISO 8601."
+        ]})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, datetime.timezone.utc)
+    return moment
+
+
+def export_response(rows, fieldnames, output, name):
+    render, content_type = EXPORT_FORMATS[output]
+    response = StreamingHttpResponse(
+        render(rows, fieldnames), content_type=content_type
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{name}.{output}"'
+    )
+    return response
@@ -0,0 +1,64 @@
+from django.core.files.storage import default_storage
+from PIL import Image
+from rest_framework import serializers
+
+from .uploads import (
+    RejectedUpload,
+    get_dimension_error,
+    get_header_error,
+    get_size_error,
+)
+
+
+class StagedImageField(serializers.ImageField):
+    """
+    Изображение, которое проверяется только по заголовку: Image.open()
+    читает первые байты файла и не декодирует пиксели. Файлы, принятые
+    StreamingImageUploadHandler, уже проверены при загрузке. Полное
+    декодирование выполняется фоновым воркером при создании копий.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, RejectedUpload):
+            if data.error is None:
+                self.fail("invalid_image")
+            raise serializers.ValidationError(data.error)
+        file_object = serializers.FileField.to_internal_value(self, data)
+        if getattr(file_object, "image_format", None):
+            return file_object
+        error = get_size_error(file_object.size)
+        if error is None:
+            error = self.check_header(file_object)
+        if error:
+            raise serializers.ValidationError(error)
+        return file_object
+
+    def check_header(self, file_object):
+        try:
+            with Image.open(file_object) as image:
+                return get_header_error(image)
+        except Image.DecompressionBombError:
+            return get_dimension_error()
+        except OSError:
+            self.fail("invalid_image")
+        finally:
+            file_object.seek(0)
+
+
+class RenditionsField(serializers.ReadOnlyField):
+    """
+    URL уменьшенных копий изображения: {размер: {формат: url}}.
+    Пока копии не готовы, возвращается пустой словарь.
+    """
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        representation = {}
+        for size_name, paths in (value or {}).items():
+            representation[size_name] = {}
+            for image_format, path in paths.items():
+                url = default_storage.url(path)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                representation[size_name][image_format] = url
+        return representation
@@ -0,0 +1,92 @@
+from django.db.models import Subquery
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+
+from posts.models import Group, User
+from posts.search import get_search_backend
+from .exports import get_datetime_param
+
+
+class PostSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск по тексту постов через `?search=`.
+    Результаты отсортированы по релевантности.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return get_search_backend().search(queryset, query)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            "name": self.search_param,
+            "required": False,
+            "in": "query",
+            "description": "Поисковый запрос по тексту поста.",
+            "schema": {"type": "string"},
+        }]
+
+
+class PrefixSearchFilter(SearchFilter):
+    """
+    SearchFilter, в котором поля с префиксом `^` ищутся по началу строки
+    диапазоном по индексу (lookup `prefix`), а не через LIKE.
+    """
+
+    lookup_prefixes = {**SearchFilter.lookup_prefixes, "^": "prefix"}
+
+
+class PostFilter(BaseFilterBackend):
+    """
+    Фильтры списка постов: `?group=<slug>`, `?author=<username>` и
+    интервал дат публикации `?since=` (включительно) - `?until=`
+    (не включительно). id группы и автора находятся скалярным подзапросом
+    по уникальному полю, поэтому посты выбираются по индексам
+    (group, pub_date, id) и (author, pub_date, id) без соединения таблиц.
+    """
+
+    group_param = "group"
+    author_param = "author"
+    since_param = "since"
+    until_param = "until"
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        if params.get(self.group_param):
+            queryset = queryset.filter(group_id=Subquery(
+                Group.objects.filter(slug=params[self.group_param])
+                .values("id")[:1]
+            ))
+        if params.get(self.author_param):
+            queryset = queryset.filter(author_id=Subquery(
+                User.objects.filter(username=params[self.author_param])
+                .values("id")[:1]
+            ))
+        since = get_datetime_param(request, self.since_param)
+        if since is not None:
+            queryset = queryset.filter(pub_date__gte=since)
+        until = get_datetime_param(request, self.until_param)
+        if until is not None:
+            queryset = queryset.filter(pub_date__lt=until)
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        descriptions = {
+            self.group_param: "slug группы.",
+            self.author_param: "username автора.",
+            self.since_param: "Посты, опубликованные не раньше (ISO 8601).",
+            self.until_param: "Посты, опубликованные раньше (ISO 8601).",
+        }
+        return [
+            {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": description,
+                "schema": {"type": "string"},
+            }
+            for name, description in descriptions.items()
+        ]
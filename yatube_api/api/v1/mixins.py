@@ -0,0 +1,186 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import relations, status
+from rest_framework.response import Response
+
+from .cache import get_cache, get_validators, get_version
+from .replicas import primary_if_changed_since
+
+
+def add_relation_to_plan(field, lookup, select_related, only):
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        only.add(lookup)
+        return True
+    select_related.add(lookup)
+    if isinstance(field, relations.SlugRelatedField):
+        only.add(f"{lookup}__{field.slug_field}")
+        return True
+    return False
+
+
+def add_field_to_plan(field, model, select_related, prefetch_related, only):
+    """
+    Добавляет в план связи и поля модели, которые читает поле сериализатора.
+    Возвращает False, если набор загружаемых полей определить нельзя.
+    """
+    if field.source == "*":
+        return False
+    path = []
+    for attr in field.source_attrs:
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return False
+        path.append(attr)
+        lookup = "__".join(path)
+        if not model_field.is_relation:
+            only.add(lookup)
+            continue
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch_related.add(lookup)
+            return False
+        if attr != field.source_attrs[-1]:
+            select_related.add(lookup)
+            model = model_field.related_model
+            continue
+        return add_relation_to_plan(field, lookup, select_related, only)
+    return True
+
+
+@lru_cache(maxsize=None)
+def get_queryset_plan(serializer_class, model):
+    """
+    Собирает по объявленным полям сериализатора аргументы для
+    select_related(), prefetch_related() и only().
+    Если набор загружаемых полей определить нельзя, only() не применяется.
+    """
+    select_related, prefetch_related, only = set(), set(), set()
+    restrict_fields = True
+    for field in serializer_class().fields.values():
+        restrict_fields &= add_field_to_plan(
+            field, model, select_related, prefetch_related, only
+        )
+
+    return (
+        tuple(sorted(select_related)),
+        tuple(sorted(prefetch_related)),
+        tuple(sorted(only)) if restrict_fields else (),
+    )
+
+
+def optimize_queryset(queryset, serializer_class):
+    """Добавляет к queryset загрузку связей, объявленных в сериализаторе."""
+    select_related, prefetch_related, only = get_queryset_plan(
+        serializer_class, queryset.model
+    )
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    if only:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+class OptimizedQuerysetMixin:
+    """
+    Примесь для вьюсетов: исключает N+1 запросы к связанным моделям
+    при сериализации списков.
+    """
+
+    def filter_queryset(self, queryset):
+        return optimize_queryset(
+            super().filter_queryset(queryset), self.get_serializer_class()
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Примесь для вьюсетов: выставляет ETag и Last-Modified для list/retrieve
+    по версии данных из кэша и отвечает 304 на If-None-Match и
+    If-Modified-Since без запросов к базе данных и без сериализации.
+    """
+
+    def get_version_namespace(self):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        namespace = self.get_version_namespace()
+        version = get_version(namespace)
+        response = self.get_cached_response(request, namespace, version)
+        if response is None:
+            with primary_if_changed_since(version):
+                response = self.get_fresh_response(
+                    namespace, version, handler, request, *args, **kwargs
+                )
+        return self.set_validators(response, namespace, version)
+
+    def get_cached_response(self, request, namespace, version):
+        """
+        Ответ, который можно отдать без обращения к базе данных,
+        или None. Здесь - 304 по If-None-Match и If-Modified-Since.
+        """
+        etag, last_modified = get_validators(namespace, version)
+        return get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+
+    def get_fresh_response(self, namespace, version, handler, request,
+                           *args, **kwargs):
+        return handler(request, *args, **kwargs)
+
+    def set_validators(self, response, namespace, version):
+        if response.status_code == status.HTTP_200_OK:
+            etag, last_modified = get_validators(namespace, version)
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class CachedReadMixin(ConditionalGetMixin):
+    """
+    Дополнительно к ConditionalGetMixin кэширует данные ответов list/retrieve
+    с ключом по версии пространства имён `cache_namespace`.
+    """
+
+    cache_namespace = None
+
+    def get_version_namespace(self):
+        return self.cache_namespace
+
+    def get_cache_key(self, request, namespace, version):
+        return f"response:{namespace}:{version}:{request.get_full_path()}"
+
+    def get_cached_response(self, request, namespace, version):
+        response = super().get_cached_response(request, namespace, version)
+        if response is not None:
+            return response
+        data = get_cache().get(self.get_cache_key(request, namespace, version))
+        if data is not None:
+            return Response(data)
+        return None
+
+    def get_fresh_response(self, namespace, version, handler, request,
+                           *args, **kwargs):
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            get_cache().set(
+                self.get_cache_key(request, namespace, version),
+                response.data,
+                settings.API_CACHE_TIMEOUT,
+            )
+        return response
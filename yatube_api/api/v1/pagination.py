@@ -0,0 +1,261 @@
+import datetime
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    LimitOffsetPagination,
+    _positive_int,
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from posts.feed import get_feed_post_ids
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу сортировки (keyset).
+    Курсор хранит значения полей `ordering` последнего объекта страницы,
+    поэтому следующая страница выбирается по индексу без OFFSET и COUNT.
+    """
+
+    ordering = ("-pub_date", "-id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    page_size = 10
+    max_page_size = 100
+    invalid_cursor_message = "Неверный курсор."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position))
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_keyset_filter(self, position):
+        """
+        Строит условие «строго после позиции» для составного ключа:
+        a <= x AND ((a < x) OR (a = x AND b < y) OR ...).
+        Ограничение на первое поле позволяет СУБД начать поиск по индексу.
+        """
+        keyset_filter = Q()
+        equal = Q()
+        for order, value in zip(self.ordering, position):
+            field = order.lstrip("-")
+            lookup = "lt" if order.startswith("-") else "gt"
+            keyset_filter |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        first = self.ordering[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": position[0]}) & (
+            keyset_filter
+        )
+
+    def get_position(self, instance):
+        position = []
+        for order in self.ordering:
+            value = getattr(instance, order.lstrip("-"))
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        cursor = self.encode_cursor(self.get_position(self.page[-1]))
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, position):
+        return b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, request, model):
+        """
+        Позиция из курсора; значения приводятся к типам полей `ordering`
+        модели, чтобы подделанный курсор давал 404, а не ошибку запроса.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(b64decode(encoded.encode()))
+        except (BinasciiError, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(position, list)
+            or len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return [
+            self.parse_position_value(model, order.lstrip("-"), value)
+            for order, value in zip(self.ordering, position)
+        ]
+
+    def parse_position_value(self, model, name, value):
+        if not isinstance(value, (str, int)) or isinstance(value, bool):
+            raise NotFound(self.invalid_cursor_message)
+        field = model._meta.get_field(name)
+        try:
+            value = field.to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        # Целые числа - в пределах 64-битных целых БД.
+        if value is None or (
+            isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        if hasattr(value, "tzinfo") and timezone.is_naive(value):
+            value = timezone.make_aware(value, datetime.timezone.utc)
+        return value
+
+
+class CommentPagination(KeysetPagination):
+    """
+    Keyset-пагинация комментариев с жёстким ограничением размера страницы.
+    Параметр `?legacy=1` возвращает первую страницу простым списком
+    для старых клиентов.
+    """
+
+    ordering = ("-created", "-id")
+    page_size = 20
+    max_page_size = 100
+    legacy_query_param = "legacy"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.legacy = self.legacy_query_param in request.query_params
+        if self.legacy:
+            return list(
+                queryset.order_by(*self.ordering)[:self.max_page_size]
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.legacy:
+            return Response(data)
+        return super().get_paginated_response(data)
+
+
+class FeedPagination(KeysetPagination):
+    """
+    Keyset-пагинация ленты. id постов страницы выбираются по
+    FeedItem (user, pub_date, post) и постам популярных авторов
+    (см. posts.feed.get_feed_post_ids), затем посты загружаются по id.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request, queryset.model)
+        post_ids = get_feed_post_ids(
+            request.user.id, self.page_size + 1, position
+        )
+        self.has_next = len(post_ids) > self.page_size
+        posts = queryset.in_bulk(post_ids[:self.page_size])
+        self.page = [
+            posts[post_id] for post_id in post_ids[:self.page_size]
+            if post_id in posts
+        ]
+        return self.page
+
+
+class PostPagination(LimitOffsetPagination):
+    """
+    По умолчанию работает как LimitOffsetPagination.
+    Keyset-режим включается параметром `?pagination=cursor`, наличием
+    `?cursor=` или настройкой API_POSTS_PAGINATION = "cursor".
+    """
+
+    keyset_class = KeysetPagination
+    mode_query_param = "pagination"
+    keyset_mode = "cursor"
+
+    def use_keyset(self, request):
+        if self.keyset_class.cursor_query_param in request.query_params:
+            return True
+        mode = request.query_params.get(
+            self.mode_query_param, settings.API_POSTS_PAGINATION
+        )
+        return mode == self.keyset_mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class GraphPagination(LimitOffsetPagination):
+    """Страницы списков пользователей из графа подписок."""
+
+    default_limit = 100
+    max_limit = 1000
+
+
+class GroupPostsPagination(LimitOffsetPagination):
+    """
+    Страницы постов группы. Страницы из начала списка отдаются из кэша
+    в памяти процесса (см. GroupViewSet.posts).
+    """
+
+    default_limit = 10
+    max_limit = 100
+
+    def paginate_head(self, head, request):
+        """
+        Страница из начала списка head = {"count": ..., "results": [...]}
+        или None, если она выходит за пределы head.
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        self.count = head["count"]
+        results = head["results"]
+        end = self.offset + self.limit
+        if end > len(results) and len(results) < self.count:
+            return None
+        return results[self.offset:end]
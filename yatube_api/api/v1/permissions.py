@@ -16,5 +16,14 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method in permissions.SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.id
         )
+
+    def filter_permitted(self, request, view, queryset):
+        """
+        Проверка прав для набора объектов одним запросом: возвращает
+        часть queryset, которую пользователь может изменять.
+        """
+        if request.method in permissions.SAFE_METHODS:
+            return queryset
+        return queryset.filter(author_id=request.user.id)
@@ -0,0 +1,204 @@
+"""
+Чтение с реплик: GET и HEAD к эндпоинтам постов, комментариев, групп и
+подписок читают с одной из DATABASE_REPLICAS, все остальные запросы - с
+основной БД. Реплики могут отставать не больше чем на REPLICA_LAG_SECONDS:
+столько пользователь после своей записи читает с основной БД, чтобы
+видеть свои изменения. Недоступная реплика пропускается
+REPLICA_RETRY_SECONDS, а если недоступны все - чтение идёт с основной БД.
+"""
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework.exceptions import APIException
+
+from .authentication import StatelessJWTAuthentication
+from .cache import get_cache
+
+SAFE_METHODS = ("GET", "HEAD")
+
+# Алиас реплики для текущего запроса или None - основная БД.
+read_alias = ContextVar("read_alias", default=None)
+
+# Время, до которого реплика считается недоступной, и время последней
+# успешной проверки.
+down_until = {}
+checked_at = {}
+health_lock = Lock()
+
+
+def last_write_key(user_id):
+    return f"replicas:last_write:{user_id}"
+
+
+def mark_write(user_id):
+    """Направляет чтение пользователя на основную БД после записи."""
+    get_cache().set(
+        last_write_key(user_id), True,
+        settings.REPLICA_LAG_SECONDS,
+    )
+
+
+def wrote_recently(user_id):
+    return get_cache().get(last_write_key(user_id)) is not None
+
+
+@contextmanager
+def primary_if_changed_since(version):
+    """
+    Читает с основной БД, если данные пространства имён менялись позже,
+    чем REPLICA_LAG_SECONDS назад (версия - время изменения в нс): иначе
+    ответ с реплики получил бы ETag новой версии со старыми данными.
+    """
+    lag = settings.REPLICA_LAG_SECONDS * 10 ** 9
+    if read_alias.get() is None or time.time_ns() - version >= lag:
+        yield
+        return
+    token = read_alias.set(None)
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+def check_replica(alias):
+    """
+    Проверяет реплику не чаще раза в REPLICA_CHECK_SECONDS: соединение и
+    запрос к таблице миграций, которой нет в пустом файле SQLite.
+    """
+    now = time.monotonic()
+    with health_lock:
+        if down_until.get(alias, 0) > now:
+            return False
+        if now - checked_at.get(alias, float("-inf")) < (
+            settings.REPLICA_CHECK_SECONDS
+        ):
+            return True
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1 FROM django_migrations LIMIT 1")
+    except DatabaseError:
+        connections[alias].close()
+        with health_lock:
+            down_until[alias] = now + settings.REPLICA_RETRY_SECONDS
+            checked_at.pop(alias, None)
+        return False
+    with health_lock:
+        checked_at[alias] = now
+    return True
+
+
+def choose_replica():
+    """Случайная доступная реплика или None."""
+    replicas = list(settings.DATABASE_REPLICAS)
+    random.shuffle(replicas)
+    for alias in replicas:
+        if check_replica(alias):
+            return alias
+    return None
+
+
+def reset_health():
+    with health_lock:
+        down_until.clear()
+        checked_at.clear()
+
+
+def get_user_id(request):
+    """id пользователя из JWT без запроса к БД или None."""
+    try:
+        result = StatelessJWTAuthentication().authenticate(request)
+    except (APIException, TokenError):
+        return None
+    return result[0].id if result else None
+
+
+def is_replica_path(path):
+    return path.startswith(tuple(settings.REPLICA_READ_PATHS))
+
+
+class ReplicaMiddleware:
+    """
+    Выбирает БД для чтения на время запроса. Поддерживает и WSGI, и ASGI:
+    под ASGI цепочка middleware остаётся асинхронной, и async-вьюхи не
+    занимают поток на всё время запроса.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Так Django распознаёт middleware как асинхронное.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def uses_replicas(self, request):
+        return bool(settings.DATABASE_REPLICAS) and is_replica_path(
+            request.path_info
+        )
+
+    def get_read_alias(self, request, user_id):
+        if request.method in SAFE_METHODS and not (
+            user_id is not None and wrote_recently(user_id)
+        ):
+            return choose_replica()
+        return None
+
+    def is_write(self, request, user_id):
+        return request.method not in SAFE_METHODS and user_id is not None
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.uses_replicas(request):
+            return self.get_response(request)
+        user_id = get_user_id(request)
+        token = read_alias.set(self.get_read_alias(request, user_id))
+        try:
+            response = self.get_response(request)
+        finally:
+            read_alias.reset(token)
+        if self.is_write(request, user_id):
+            mark_write(user_id)
+        return response
+
+    async def __acall__(self, request):
+        if not self.uses_replicas(request):
+            return await self.get_response(request)
+        # Проверка JWT не обращается к БД; выбор реплики и кэш записей -
+        # обращаются и выполняются в потоке.
+        user_id = get_user_id(request)
+        alias = await sync_to_async(self.get_read_alias)(request, user_id)
+        token = read_alias.set(alias)
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_alias.reset(token)
+        if self.is_write(request, user_id):
+            await sync_to_async(mark_write)(user_id)
+        return response
+
+
+class ReplicaRouter:
+    """Чтение с реплики, выбранной ReplicaMiddleware; запись - в default."""
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема попадает на реплики вместе с данными.
+        return db not in settings.DATABASE_REPLICAS
@@ -1,6 +1,15 @@
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from posts.follows import follow_users
 from posts.models import Comment, Follow, Group, Post, User
+from .authentication import get_user_instance
+from .fields import RenditionsField, StagedImageField
+
+SELF_FOLLOW = "Вы не можете подписаться на самого себя."
+ALREADY_FOLLOWING = "Вы уже подписаны на этого пользователя."
 
 
 class PostSerializer(serializers.ModelSerializer):
@@ -8,11 +17,18 @@ class PostSerializer(serializers.ModelSerializer):
         slug_field="username",
         read_only=True
     )
+    image = StagedImageField(
+        required=False, allow_null=True, max_length=100
+    )
+    image_renditions = RenditionsField()
 
     class Meta:
         model = Post
-        fields = ["id", "text", "pub_date", "author", "image", "group"]
-        read_only_fields = ["pub_date", "author"]
+        fields = [
+            "id", "text", "pub_date", "author", "image", "image_renditions",
+            "group", "comment_count",
+        ]
+        read_only_fields = ["pub_date", "author", "comment_count"]
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -36,35 +52,88 @@ class FollowSerializer(serializers.ModelSerializer):
         read_only=True,
         default=serializers.CurrentUserDefault()
     )
+    followers_count = serializers.IntegerField(
+        source="following.profile.follower_count",
+        read_only=True
+    )
 
     class Meta:
         model = Follow
-        fields = ["user", "following"]
+        fields = ["user", "following", "followers_count"]
         read_only_fields = ["user"]
 
     def validate_following(self, value):
         if self.context["request"].user == value:
-            raise serializers.ValidationError(
-                "Вы не можете подписаться на самого себя."
-            )
+            raise serializers.ValidationError(SELF_FOLLOW)
         return value
 
-    def validate(self, attrs):
-        user = self.context["request"].user
-        following_user = attrs.get("following")
+    def create(self, validated_data):
+        request = self.context["request"]
+        following = validated_data["following"]
+        created = follow_users(request.user.id, [following.id])
+        if not created:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [ALREADY_FOLLOWING],
+            })
+        follow = created[0]
+        follow.user = get_user_instance(request.user)
+        follow.following = following
+        return follow
+
+
+class FollowManySerializer(serializers.Serializer):
+    """Подписка на несколько авторов одним запросом."""
+
+    following = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.API_BULK_MAX_ITEMS,
+    )
 
-        if Follow.objects.filter(user=user, following=following_user).exists():
+    def validate_following(self, value):
+        usernames = list(dict.fromkeys(value))
+        users = dict(
+            User.objects.filter(username__in=usernames)
+            .values_list("username", "id")
+        )
+        missing = [username for username in usernames if username not in users]
+        if missing:
             raise serializers.ValidationError(
-                "Вы уже подписаны на этого пользователя."
+                "Пользователи не найдены: " + ", ".join(missing)
             )
-        return super().validate(attrs)
+        if self.context["request"].user.id in users.values():
+            raise serializers.ValidationError(SELF_FOLLOW)
+        return users
 
     def create(self, validated_data):
-        validated_data["user"] = self.context["request"].user
-        return super().create(validated_data)
+        users = validated_data["following"]
+        created = follow_users(
+            self.context["request"].user.id, users.values()
+        )
+        created_ids = {follow.following_id for follow in created}
+        return {
+            "created": [
+                username for username, user_id in users.items()
+                if user_id in created_ids
+            ],
+            "existing": [
+                username for username, user_id in users.items()
+                if user_id not in created_ids
+            ],
+        }
 
 
 class GroupSerializer(serializers.ModelSerializer):
     class Meta:
         model = Group
         fields = ["id", "title", "slug", "description"]
+
+
+class TokenObtainSerializer(TokenObtainPairSerializer):
+    """Добавляет username в payload токена для StatelessJWTAuthentication."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        return token
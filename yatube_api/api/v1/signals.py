@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.models import Comment, Group, Post
+from posts.signals import data_loaded
+from .cache import (
+    bump_version,
+    get_cache,
+    group_posts_cache,
+    invalidate_comment,
+    invalidate_group_posts,
+    invalidate_post,
+)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, **kwargs):
+    bump_version("groups")
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    invalidate_post(instance.pk)
+    if instance.group_id is not None:
+        invalidate_group_posts(instance.group_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    invalidate_comment(instance.pk, instance.post_id)
+
+
+@receiver(data_loaded)
+def data_changed(sender, **kwargs):
+    # Загрузка могла затронуть любые посты и комментарии.
+    get_cache().clear()
+    group_posts_cache.clear()
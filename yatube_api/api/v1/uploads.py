@@ -0,0 +1,143 @@
+import os
+import tempfile
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import (
+    TemporaryUploadedFile,
+    UploadedFile,
+)
+from django.core.files.uploadhandler import FileUploadHandler
+from PIL import Image
+
+# Каталог в MEDIA_ROOT для принимаемых файлов: при сохранении в хранилище
+# файл переносится переименованием, без копирования.
+UPLOAD_TEMP_DIR = "tmp"
+
+
+def get_size_error(size):
+    if size > settings.POST_IMAGE_MAX_SIZE:
+        limit = settings.POST_IMAGE_MAX_SIZE // (1024 * 1024)
+        return f"Размер файла не должен превышать {limit} МБ."
+    return None
+
+
+def get_dimension_error():
+    limit = settings.POST_IMAGE_MAX_DIMENSION
+    return f"Размеры изображения не должны превышать {limit}×{limit}."
+
+
+def get_header_error(image):
+    """
+    Проверяет формат и размеры изображения, открытого Image.open().
+    Пиксели при этом не декодируются: всё нужное есть в заголовке.
+    """
+    if image.format not in settings.POST_IMAGE_ALLOWED_FORMATS:
+        allowed = ", ".join(settings.POST_IMAGE_ALLOWED_FORMATS)
+        return f"Недопустимый формат изображения. Допустимые: {allowed}."
+    if max(image.size) > settings.POST_IMAGE_MAX_DIMENSION:
+        return get_dimension_error()
+    return None
+
+
+class StagedImageFile(TemporaryUploadedFile):
+    """Временный файл загрузки в MEDIA_ROOT с данными из заголовка."""
+
+    def __init__(self, name, content_type, charset, content_type_extra=None):
+        directory = os.path.join(settings.MEDIA_ROOT, UPLOAD_TEMP_DIR)
+        os.makedirs(directory, exist_ok=True)
+        _, ext = os.path.splitext(name)
+        file = tempfile.NamedTemporaryFile(
+            suffix=".upload" + ext, dir=directory
+        )
+        UploadedFile.__init__(
+            self, file, name, content_type, 0, charset, content_type_extra
+        )
+        self.image_format = None
+        self.image_size = None
+
+
+class RejectedUpload(UploadedFile):
+    """
+    Пустой файл на месте отклонённой загрузки. error - текст ошибки
+    или None, если файл не является изображением.
+    """
+
+    def __init__(self, name, error):
+        super().__init__(BytesIO(), name, size=0)
+        self.error = error
+
+
+class StreamingImageUploadHandler(FileUploadHandler):
+    """
+    Принимает изображения с постоянным расходом памяти: части файла сразу
+    пишутся во временный файл в MEDIA_ROOT, в памяти держится только
+    заголовок до его разбора. Формат и размеры проверяются по заголовку,
+    размер файла - по мере чтения. После нарушения ограничений остаток
+    файла не сохраняется, а вместо него возвращается RejectedUpload.
+    """
+
+    # Сколько первых байтов файла можно прочитать в поисках заголовка.
+    max_header_size = 256 * 1024
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = StagedImageFile(
+            self.file_name, self.content_type, self.charset,
+            self.content_type_extra,
+        )
+        self.header = bytearray()
+        self.size = 0
+        self.rejected = False
+        self.error = None
+
+    def reject(self, error=None):
+        self.rejected = True
+        self.error = error
+        self.header = None
+        self.file.close()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.rejected:
+            return None
+        self.size += len(raw_data)
+        error = get_size_error(self.size)
+        if error:
+            self.reject(error)
+            return None
+        self.file.write(raw_data)
+        if self.header is not None:
+            self.header += raw_data[:self.max_header_size - len(self.header)]
+            self.inspect_header()
+        return None
+
+    def inspect_header(self, final=False):
+        try:
+            with Image.open(BytesIO(self.header)) as image:
+                error = get_header_error(image)
+                self.file.image_format = image.format
+                self.file.image_size = image.size
+        except Image.DecompressionBombError:
+            error = get_dimension_error()
+        except OSError:
+            # Заголовок ещё не прочитан целиком.
+            if final or len(self.header) >= self.max_header_size:
+                self.reject()
+            return
+        if error:
+            self.reject(error)
+        else:
+            self.header = None
+
+    def file_complete(self, file_size):
+        if not self.rejected and self.header is not None:
+            self.inspect_header(final=True)
+        if self.rejected:
+            return RejectedUpload(self.file_name, self.error)
+        self.file.seek(0)
+        self.file.size = file_size
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, "file"):
+            self.file.close()
@@ -1,11 +1,24 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
-from .views import PostViewSet, FollowViewSet, GroupViewSet, CommentViewSet
+
+from . import async_views
+from .views import (
+    CommentViewSet,
+    ExportViewSet,
+    FeedViewSet,
+    FollowViewSet,
+    GroupViewSet,
+    PostViewSet,
+    UserGraphViewSet,
+)
 
 router = DefaultRouter()
 router.register("posts", PostViewSet)
 router.register("follow", FollowViewSet, basename='follow')
 router.register("groups", GroupViewSet)
+router.register("feed", FeedViewSet, basename="feed")
+router.register("users", UserGraphViewSet, basename="user")
+router.register("export", ExportViewSet, basename="export")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -14,6 +27,15 @@ urlpatterns = [
         CommentViewSet.as_view({"get": "list", "post": "create"}),
         name="post-comments",
     ),
+    path(
+        "posts/<int:post_pk>/comments/bulk/",
+        CommentViewSet.as_view({
+            "post": "bulk",
+            "patch": "bulk",
+            "delete": "bulk",
+        }),
+        name="comment-bulk",
+    ),
     path(
         "posts/<int:post_pk>/comments/<int:pk>/",
         CommentViewSet.as_view({
@@ -25,4 +47,16 @@ urlpatterns = [
         name="comment-detail",
     ),
     path("jwt/", include("api.v1.jwt_urls")),
+    path("async/posts/", async_views.post_list, name="async-post-list"),
+    path(
+        "async/posts/<int:pk>/",
+        async_views.post_detail,
+        name="async-post-detail",
+    ),
+    path(
+        "async/posts/<int:post_pk>/comments/",
+        async_views.comment_list,
+        name="async-post-comments",
+    ),
+    path("async/groups/", async_views.group_list, name="async-group-list"),
 ]
@@ -1,60 +1,372 @@
-from rest_framework import filters, permissions, viewsets, mixins
-from rest_framework.pagination import LimitOffsetPagination
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import _positive_int
+from rest_framework.response import Response
 
-from posts.models import Comment, Follow, Group, Post
+from posts.counters import change_comment_count
+from posts.feed import fan_out_posts
+from posts.follows import unfollow_user
+from posts.graph import follow_graph
+from posts.images import replace_renditions, schedule_renditions
+from posts.models import Comment, Follow, Group, Post, User
+from .authentication import StatelessJWTAuthentication, get_user_instance
+from .bulk import BulkModelMixin
+from .cache import (
+    group_posts_cache,
+    invalidate_comment,
+    invalidate_group_posts,
+    invalidate_post,
+)
+from .exports import (
+    COMMENT_COLUMNS,
+    POST_COLUMNS,
+    export_response,
+    get_output,
+    get_since,
+    iterate_columns,
+    iterate_in_batches,
+)
+from .filters import PostFilter, PostSearchFilter, PrefixSearchFilter
+from .mixins import (
+    CachedReadMixin,
+    ConditionalGetMixin,
+    OptimizedQuerysetMixin,
+    optimize_queryset,
+)
+from .pagination import (
+    CommentPagination,
+    FeedPagination,
+    GraphPagination,
+    GroupPostsPagination,
+    PostPagination,
+)
 from .permissions import IsAuthorOrReadOnly
 from .serializers import (
     CommentSerializer,
+    FollowManySerializer,
     FollowSerializer,
     GroupSerializer,
     PostSerializer,
 )
+from .uploads import StreamingImageUploadHandler
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(BulkModelMixin,
+                  ConditionalGetMixin,
+                  OptimizedQuerysetMixin,
+                  viewsets.ModelViewSet):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [IsAuthorOrReadOnly]
-    authentication_classes = [JWTAuthentication]
-    pagination_class = LimitOffsetPagination
+    authentication_classes = [StatelessJWTAuthentication]
+    pagination_class = PostPagination
+    filter_backends = (PostFilter, PostSearchFilter)
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [StreamingImageUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def get_version_namespace(self):
+        if self.action == "retrieve":
+            return f"post:{self.kwargs['pk']}"
+        return "posts"
+
+    def get_save_kwargs(self):
+        return {"author": get_user_instance(self.request.user)}
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        post = serializer.save(**self.get_save_kwargs())
+        schedule_renditions(post)
+        fan_out_posts([post])
+
+    def perform_update(self, serializer):
+        # Новую группу поста сбрасывает сигнал post_save, прежнюю - здесь.
+        invalidate_group_posts(serializer.instance.group_id)
+        post = serializer.save()
+        if "image" in serializer.validated_data:
+            replace_renditions(post)
+
+    def perform_bulk_create(self, posts):
+        fan_out_posts(posts)
+        for post in posts:
+            invalidate_post(post.pk)
+        invalidate_group_posts(*{post.group_id for post in posts})
 
+    def perform_bulk_update(self, posts):
+        for post in posts:
+            invalidate_post(post.pk)
+        # Прежние группы изменённых постов уже неизвестны.
+        invalidate_group_posts()
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(BulkModelMixin,
+                     ConditionalGetMixin,
+                     OptimizedQuerysetMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [IsAuthorOrReadOnly]
+    pagination_class = CommentPagination
 
     def get_post_id(self):
         return self.kwargs.get("post_pk")
 
+    def get_version_namespace(self):
+        if self.action == "retrieve":
+            return f"comment:{self.kwargs['pk']}"
+        return f"comments:{self.get_post_id()}"
+
     def get_queryset(self):
         post_id = self.get_post_id()
         comments = Comment.objects.filter(post_id=post_id).order_by("-created")
         return comments
 
+    def get_save_kwargs(self):
+        return {
+            "post_id": self.get_post_id(),
+            "author": get_user_instance(self.request.user),
+        }
+
     def perform_create(self, serializer):
-        post_id = self.get_post_id()
-        serializer.save(post_id=post_id, author=self.request.user)
+        serializer.save(**self.get_save_kwargs())
+
+    def bulk_create(self, items):
+        get_object_or_404(Post, pk=self.get_post_id())
+        return super().bulk_create(items)
+
+    def perform_bulk_create(self, comments):
+        if comments:
+            change_comment_count(self.get_post_id(), len(comments))
+        for comment in comments:
+            invalidate_comment(comment.pk, comment.post_id)
 
+    def perform_bulk_update(self, comments):
+        for comment in comments:
+            invalidate_comment(comment.pk, comment.post_id)
 
-class GroupViewSet(viewsets.ReadOnlyModelViewSet):
+
+class GroupViewSet(CachedReadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Group.objects.all().order_by("id")
     serializer_class = GroupSerializer
     permission_classes = [IsAuthorOrReadOnly]
     pagination_class = None
+    cache_namespace = "groups"
+
+    @action(
+        detail=False,
+        url_path=r"(?P<slug>[-\w]+)/posts",
+        serializer_class=PostSerializer,
+        pagination_class=GroupPostsPagination,
+    )
+    def posts(self, request, slug=None):
+        """
+        Посты группы от новых к старым по индексу (group, pub_date, id).
+        Первые API_GROUP_POSTS_CACHE_DEPTH постов группы кэшируются
+        в памяти процесса и отдаются без запросов постов к БД.
+        """
+        group_id = get_object_or_404(
+            Group.objects.values_list("id", flat=True), slug=slug
+        )
+        queryset = optimize_queryset(
+            Post.objects.filter(group_id=group_id), PostSerializer
+        )
+        head = group_posts_cache.get(group_id)
+        if head is None:
+            head = {
+                "count": queryset.count(),
+                "results": list(self.get_serializer(
+                    queryset[:settings.API_GROUP_POSTS_CACHE_DEPTH], many=True
+                ).data),
+            }
+            group_posts_cache.set(group_id, head)
+        page = self.paginator.paginate_head(head, request)
+        if page is None:
+            page = self.get_serializer(
+                self.paginate_queryset(queryset), many=True
+            ).data
+        return self.get_paginated_response(page)
 
 
-class FollowViewSet(mixins.ListModelMixin,
+class FollowViewSet(OptimizedQuerysetMixin,
+                    mixins.ListModelMixin,
                     mixins.CreateModelMixin,
                     viewsets.GenericViewSet):
     serializer_class = FollowSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ["following__username"]
+    authentication_classes = [StatelessJWTAuthentication]
+    filter_backends = (PrefixSearchFilter,)
+    search_fields = ["^following__username"]
+    lookup_field = "username"
+    lookup_value_regex = r"[\w.@+-]+"
 
     def get_queryset(self):
-        return Follow.objects.all().filter(user=self.request.user)
+        return Follow.objects.all().filter(user_id=self.request.user.id)
+
+    def destroy(self, request, username=None):
+        if not unfollow_user(request.user.id, username):
+            raise NotFound("Вы не подписаны на этого пользователя.")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False)
+    def export(self, request):
+        """Полный список подписок; `?after=<id>` продолжает выгрузку."""
+        output = get_output(request)
+        try:
+            after = int(request.query_params["after"])
+        except (KeyError, ValueError):
+            after = None
+        rows = iterate_in_batches(
+            self.get_queryset().values("id", "following__username"),
+            after=after,
+        )
+        return export_response(
+            (
+                {"id": row["id"], "following": row["following__username"]}
+                for row in rows
+            ),
+            ["id", "following"],
+            output,
+            "following",
+        )
+
+    @action(detail=False, methods=["post"],
+            serializer_class=FollowManySerializer)
+    def many(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+        return Response(
+            result,
+            status=(
+                status.HTTP_201_CREATED if result["created"]
+                else status.HTTP_200_OK
+            ),
+        )
+
+
+class FeedViewSet(OptimizedQuerysetMixin,
+                  mixins.ListModelMixin,
+                  viewsets.GenericViewSet):
+    serializer_class = PostSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [StatelessJWTAuthentication]
+    pagination_class = FeedPagination
+    queryset = Post.objects.all()
+
+
+class ExportViewSet(viewsets.ViewSet):
+    """
+    Потоковая выгрузка постов и комментариев в NDJSON или CSV
+    (`?output=ndjson|csv`). `?since=` оставляет записи не старше
+    указанного момента для инкрементальной выгрузки.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [StatelessJWTAuthentication]
+
+    def export(self, queryset, columns, date_field, name):
+        output = get_output(self.request)
+        since = get_since(self.request)
+        if since is not None:
+            queryset = queryset.filter(**{f"{date_field}__gte": since})
+        return export_response(
+            iterate_columns(queryset.order_by(date_field, "id"), columns),
+            list(columns),
+            output,
+            name,
+        )
+
+    @action(detail=False)
+    def posts(self, request):
+        return self.export(Post.objects.all(), POST_COLUMNS, "pub_date",
+                           "posts")
+
+    @action(detail=False)
+    def comments(self, request):
+        return self.export(Comment.objects.all(), COMMENT_COLUMNS, "created",
+                           "comments")
+
+    @action(detail=False, url_path=r"users/(?P<username>[\w.@+-]+)/posts")
+    def user_posts(self, request, username=None):
+        author_id = get_object_or_404(
+            User.objects.values_list("id", flat=True), username=username
+        )
+        return self.export(
+            Post.objects.filter(author_id=author_id), POST_COLUMNS,
+            "pub_date", f"posts_{username}",
+        )
+
+
+class UserGraphViewSet(viewsets.GenericViewSet):
+    """
+    Запросы к графу подписок в памяти: подписчики, подписки, взаимные
+    подписки, проверка подписки и рекомендации. К базе данных
+    обращаются только поиск пользователя по username и получение
+    username для страницы результата.
+    """
+
+    queryset = User.objects.all()
+    lookup_field = "username"
+    lookup_value_regex = r"[\w.@+-]+"
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [StatelessJWTAuthentication]
+    pagination_class = GraphPagination
+    suggestions_limit = 10
+    max_suggestions = 50
+
+    def get_user_id(self, username):
+        return get_object_or_404(
+            User.objects.values_list("id", flat=True), username=username
+        )
+
+    def get_usernames(self, user_ids):
+        """username пользователей в порядке user_ids одним запросом."""
+        usernames = dict(
+            User.objects.filter(id__in=user_ids).values_list("id", "username")
+        )
+        return [
+            usernames[user_id] for user_id in user_ids if user_id in usernames
+        ]
+
+    def get_usernames_response(self, user_ids):
+        page = self.paginate_queryset(user_ids)
+        return self.get_paginated_response(self.get_usernames(page))
+
+    @action(detail=True)
+    def followers(self, request, username=None):
+        return self.get_usernames_response(
+            follow_graph.followers(self.get_user_id(username))
+        )
+
+    @action(detail=True)
+    def following(self, request, username=None):
+        return self.get_usernames_response(
+            follow_graph.following(self.get_user_id(username))
+        )
+
+    @action(detail=True)
+    def mutual(self, request, username=None):
+        return self.get_usernames_response(
+            follow_graph.mutual(self.get_user_id(username))
+        )
+
+    @action(detail=True, url_path=r"follows/(?P<other>[\w.@+-]+)")
+    def follows(self, request, username=None, other=None):
+        return Response({
+            "follows": follow_graph.follows(
+                self.get_user_id(username), self.get_user_id(other)
+            ),
+        })
+
+    @action(detail=True)
+    def suggestions(self, request, username=None):
+        try:
+            limit = _positive_int(
+                request.query_params["limit"], cutoff=self.max_suggestions
+            )
+        except (KeyError, ValueError):
+            limit = self.suggestions_limit
+        user_ids = follow_graph.suggestions(self.get_user_id(username), limit)
+        return Response(self.get_usernames(user_ids))
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import Comment, Follow, Group, Post
+from .search import get_search_backend
 
 
 @admin.register(Group)
@@ -12,11 +13,18 @@ class GroupAdmin(admin.ModelAdmin):
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ("id", "text", "pub_date", "author")
+    list_display = ("id", "text", "pub_date", "author", "comment_count")
+    # Счётчик ведётся атомарными UPDATE и не сохраняется из формы.
+    readonly_fields = ("comment_count",)
     search_fields = ("text",)
     list_filter = ("pub_date", "author")
     empty_value_display = "-пусто-"
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return get_search_backend().search(queryset, search_term), False
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -0,0 +1,28 @@
+from django.db.models import F
+
+from .models import Post, Profile
+
+
+def change_comment_count(post_id, delta):
+    """Атомарно изменяет счётчик комментариев поста на delta."""
+    Post.objects.filter(pk=post_id).update(
+        comment_count=F("comment_count") + delta
+    )
+
+
+def change_follow_counts(user_id, following_id, delta):
+    """Атомарно изменяет счётчики подписок и подписчиков на delta."""
+    change_follow_counts_many(user_id, [following_id], delta)
+
+
+def change_follow_counts_many(user_id, following_ids, delta):
+    """
+    Счётчики для подписок пользователя на несколько авторов сразу:
+    два UPDATE независимо от числа авторов.
+    """
+    Profile.objects.filter(user_id=user_id).update(
+        following_count=F("following_count") + delta * len(following_ids)
+    )
+    Profile.objects.filter(user_id__in=following_ids).update(
+        follower_count=F("follower_count") + delta
+    )
@@ -0,0 +1,115 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import FeedItem, Follow, Post, Profile
+
+FEED_BATCH_SIZE = 1000
+
+
+def get_popular_author_ids(author_ids):
+    """
+    Авторы, чьи посты не рассылаются по лентам, а подмешиваются при
+    чтении. Решение и при рассылке, и при чтении принимается по
+    Profile.follower_count, поэтому пост всегда попадает в один из путей.
+    """
+    return Profile.objects.filter(
+        user_id__in=author_ids,
+        follower_count__gt=settings.FEED_FANOUT_MAX_FOLLOWERS,
+    ).values_list("user_id", flat=True)
+
+
+def get_pull_author_ids(user_id):
+    """Популярные авторы из подписок пользователя."""
+    following = Follow.objects.filter(user_id=user_id).values("following_id")
+    return list(get_popular_author_ids(following))
+
+
+def before_position(position, date_field, id_field):
+    """Условие «строго раньше позиции (pub_date, id)» по убыванию."""
+    pub_date, post_id = position
+    return Q(**{f"{date_field}__lte": pub_date}) & (
+        Q(**{f"{date_field}__lt": pub_date})
+        | Q(**{date_field: pub_date, f"{id_field}__lt": post_id})
+    )
+
+
+def get_feed_post_ids(user_id, limit, position=None):
+    """
+    id первых limit постов ленты от новых к старым, строго после позиции
+    (pub_date, id). Материализованная лента и посты каждого популярного
+    автора читаются по индексам (user, pub_date, post) и
+    (author, pub_date, id) не больше limit строк на источник, поэтому
+    чтение страницы не зависит от размера ленты.
+    """
+    items = FeedItem.objects.filter(user_id=user_id)
+    if position is not None:
+        items = items.filter(
+            before_position(position, "pub_date", "post_id")
+        )
+    rows = list(
+        items.order_by("-pub_date", "-post_id")
+        .values_list("pub_date", "post_id")[:limit]
+    )
+    for author_id in get_pull_author_ids(user_id):
+        posts = Post.objects.filter(author_id=author_id)
+        if position is not None:
+            posts = posts.filter(before_position(position, "pub_date", "id"))
+        rows.extend(
+            posts.order_by("-pub_date", "-id")
+            .values_list("pub_date", "id")[:limit]
+        )
+    # Пост автора, ставшего популярным, может быть и в ленте.
+    rows = sorted(set(rows), reverse=True)
+    return [post_id for _, post_id in rows[:limit]]
+
+
+def fan_out_posts(posts):
+    """
+    Добавляет новые посты в ленты подписчиков их авторов, кроме
+    популярных авторов.
+    """
+    posts_by_author = defaultdict(list)
+    for post in posts:
+        posts_by_author[post.author_id].append(post)
+    follows = Follow.objects.filter(following_id__in=list(posts_by_author))
+    follows = follows.exclude(
+        following_id__in=get_popular_author_ids(list(posts_by_author))
+    )
+    FeedItem.objects.bulk_create(
+        (
+            FeedItem(user_id=user_id, post=post, pub_date=post.pub_date)
+            for author_id, user_id in follows.values_list(
+                "following_id", "user_id"
+            ).iterator()
+            for post in posts_by_author[author_id]
+        ),
+        batch_size=FEED_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def add_author_to_feed(user_id, author_id):
+    """Заполняет ленту последними постами автора после подписки."""
+    posts = (
+        Post.objects.filter(author_id=author_id)
+        .order_by("-pub_date", "-id")
+        .values_list("id", "pub_date")[:settings.FEED_BACKFILL_SIZE]
+    )
+    FeedItem.objects.bulk_create(
+        (
+            FeedItem(user_id=user_id, post_id=post_id, pub_date=pub_date)
+            for post_id, pub_date in posts
+        ),
+        batch_size=FEED_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def remove_author_from_feed(user_id, author_id):
+    """Убирает посты автора из ленты после отписки."""
+    FeedItem.objects.filter(
+        user_id=user_id,
+        post_id__in=Post.objects.filter(author_id=author_id).values("id"),
+    ).delete()
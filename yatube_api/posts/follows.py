@@ -0,0 +1,127 @@
+import sqlite3
+
+from django.db import IntegrityError, connection, transaction
+
+from . import counters, feed
+from .graph import follow_graph
+from .models import Follow, User
+
+
+def supports_returning():
+    """Поддержка INSERT ... ON CONFLICT DO NOTHING RETURNING."""
+    if connection.vendor == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 35)
+    return connection.vendor == "postgresql"
+
+
+def insert_follows(user_id, following_ids):
+    """
+    Создаёт подписки одним INSERT, пропуская существующие по ограничению
+    unique_user_following. Возвращает созданные объекты Follow.
+    """
+    opts = Follow._meta
+    quote = connection.ops.quote_name
+    columns = ", ".join(
+        quote(opts.get_field(name).column) for name in ("user", "following")
+    )
+    sql = (
+        f"INSERT INTO {quote(opts.db_table)} ({columns}) VALUES "
+        + ", ".join(["(%s, %s)"] * len(following_ids))
+        + f" ON CONFLICT DO NOTHING RETURNING {quote(opts.pk.column)}, "
+        + quote(opts.get_field("following").column)
+    )
+    params = []
+    for following_id in following_ids:
+        params += [user_id, following_id]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        Follow(pk=pk, user_id=user_id, following_id=following_id)
+        for pk, following_id in rows
+    ]
+
+
+def insert_follows_one_by_one(user_id, following_ids):
+    """Запасной путь для СУБД без RETURNING: по строке в savepoint."""
+    created = []
+    for following_id in following_ids:
+        follow = Follow(user_id=user_id, following_id=following_id)
+        try:
+            with transaction.atomic():
+                Follow.objects.bulk_create([follow])
+        except IntegrityError:
+            continue
+        created.append(follow)
+    return created
+
+
+def follow_users(user_id, following_ids):
+    """
+    Подписывает пользователя на авторов following_ids без предварительной
+    проверки: дубликаты отсекает уникальное ограничение. Счётчики, ленту
+    и граф подписок обновляет сразу для всех созданных подписок.
+    Возвращает созданные объекты Follow.
+    """
+    following_ids = list(dict.fromkeys(following_ids))
+    if not following_ids:
+        return []
+    insert = (
+        insert_follows if supports_returning() else insert_follows_one_by_one
+    )
+    with transaction.atomic():
+        created = insert(user_id, following_ids)
+        if not created:
+            return []
+        author_ids = [follow.following_id for follow in created]
+        counters.change_follow_counts_many(user_id, author_ids, 1)
+        for author_id in author_ids:
+            feed.add_author_to_feed(user_id, author_id)
+        transaction.on_commit(lambda: follow_graph.add_many(
+            user_id, author_ids
+        ))
+    return created
+
+
+def delete_follow(user_id, username):
+    """
+    Удаляет подписку на автора по username одним DELETE ... RETURNING
+    по индексам unique_user_following и auth_user.username.
+    Возвращает id автора или None, если подписки не было.
+    """
+    quote = connection.ops.quote_name
+    opts, user_opts = Follow._meta, User._meta
+    following = quote(opts.get_field("following").column)
+    sql = (
+        f"DELETE FROM {quote(opts.db_table)} "
+        f"WHERE {quote(opts.get_field('user').column)} = %s "
+        f"AND {following} = (SELECT {quote(user_opts.pk.column)} "
+        f"FROM {quote(user_opts.db_table)} "
+        f"WHERE {quote(user_opts.get_field('username').column)} = %s) "
+        f"RETURNING {following}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [user_id, username])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def unfollow_user(user_id, username):
+    """
+    Отписывает пользователя от автора username. Возвращает True, если
+    подписка была удалена. Без RETURNING удаляет через ORM, и счётчики,
+    ленту и граф обновляют сигналы.
+    """
+    if not supports_returning():
+        deleted, _ = Follow.objects.filter(
+            user_id=user_id, following__username=username
+        ).delete()
+        return bool(deleted)
+    with transaction.atomic():
+        author_id = delete_follow(user_id, username)
+        if author_id is None:
+            return False
+        counters.change_follow_counts(user_id, author_id, -1)
+        feed.remove_author_from_feed(user_id, author_id)
+        transaction.on_commit(lambda: follow_graph.remove(user_id, author_id))
+    return True
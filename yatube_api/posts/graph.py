@@ -0,0 +1,159 @@
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from threading import RLock
+
+from django.core.cache import cache
+
+from .models import Follow
+
+VERSION_KEY = "follow_graph:version"
+
+
+def contains(ids, value):
+    index = bisect_left(ids, value)
+    return index < len(ids) and ids[index] == value
+
+
+def insort(ids, value):
+    """Вставляет value в отсортированный массив, если его там нет."""
+    index = bisect_left(ids, value)
+    if index == len(ids) or ids[index] != value:
+        ids.insert(index, value)
+
+
+def discard(ids, value):
+    index = bisect_left(ids, value)
+    if index < len(ids) and ids[index] == value:
+        del ids[index]
+
+
+class FollowGraph:
+    """
+    Граф подписок в памяти процесса: для каждого пользователя отсортированные
+    массивы array("q") id его подписок и подписчиков. Загружается из Follow
+    при первом обращении и обновляется при создании и удалении подписок.
+    Номер версии графа хранится в кэше: если его изменил другой процесс,
+    граф перезагружается при следующем чтении.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._following = {}
+            self._followers = {}
+            self._version = None
+
+    def get_shared_version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, time.time_ns(), None)
+            version = cache.get(VERSION_KEY)
+        return version
+
+    def bump_shared_version(self):
+        self.get_shared_version()
+        try:
+            return cache.incr(VERSION_KEY)
+        except ValueError:
+            return None
+
+    def load(self):
+        following, followers = defaultdict(list), defaultdict(list)
+        pairs = Follow.objects.order_by().values_list(
+            "user_id", "following_id"
+        )
+        for user_id, following_id in pairs.iterator(chunk_size=10_000):
+            following[user_id].append(following_id)
+            followers[following_id].append(user_id)
+        self._following = {
+            user_id: array("q", sorted(ids))
+            for user_id, ids in following.items()
+        }
+        self._followers = {
+            user_id: array("q", sorted(ids))
+            for user_id, ids in followers.items()
+        }
+
+    def sync(self):
+        version = self.get_shared_version()
+        if version != self._version:
+            self.load()
+            self._version = version
+
+    def apply(self, change, user_id, following_ids):
+        """Применяет изменение к графу и публикует новую версию."""
+        with self._lock:
+            self.sync()
+            following = self._following.setdefault(user_id, array("q"))
+            for following_id in following_ids:
+                change(following, following_id)
+                change(
+                    self._followers.setdefault(following_id, array("q")),
+                    user_id,
+                )
+            version = self.bump_shared_version()
+            if version is not None and version == self._version + 1:
+                self._version = version
+
+    def add(self, user_id, following_id):
+        self.apply(insort, user_id, [following_id])
+
+    def add_many(self, user_id, following_ids):
+        self.apply(insort, user_id, following_ids)
+
+    def remove(self, user_id, following_id):
+        self.apply(discard, user_id, [following_id])
+
+    def following(self, user_id):
+        """Отсортированные id пользователей, на которых подписан user_id."""
+        with self._lock:
+            self.sync()
+            return array("q", self._following.get(user_id, ()))
+
+    def followers(self, user_id):
+        """Отсортированные id подписчиков user_id."""
+        with self._lock:
+            self.sync()
+            return array("q", self._followers.get(user_id, ()))
+
+    def follows(self, user_id, following_id):
+        with self._lock:
+            self.sync()
+            return contains(self._following.get(user_id, ()), following_id)
+
+    def mutual(self, user_id):
+        """Пользователи, с которыми user_id подписан взаимно."""
+        with self._lock:
+            self.sync()
+            followers = self._followers.get(user_id, ())
+            return [
+                following_id
+                for following_id in self._following.get(user_id, ())
+                if contains(followers, following_id)
+            ]
+
+    def suggestions(self, user_id, limit=10):
+        """
+        Друзья друзей: пользователи, на которых подписаны подписки user_id,
+        по убыванию числа таких общих подписок.
+        """
+        with self._lock:
+            self.sync()
+            following = self._following.get(user_id, ())
+            scores = Counter()
+            for following_id in following:
+                for candidate in self._following.get(following_id, ()):
+                    if candidate != user_id and not contains(
+                        following, candidate
+                    ):
+                        scores[candidate] += 1
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [candidate for candidate, _ in ranked[:limit]]
+
+
+follow_graph = FollowGraph()
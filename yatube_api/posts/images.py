@@ -0,0 +1,187 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from threading import Lock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from .models import Post
+
+RENDITIONS_DIR = "posts/renditions"
+SAVE_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "jpeg": {"format": "JPEG", "quality": 85, "optimize": True},
+}
+# Форматы исходных изображений, которые перекодируются без метаданных.
+# GIF не содержит EXIF, а перекодирование потеряло бы анимацию.
+ORIGINAL_SAVE_OPTIONS = {
+    "JPEG": {"quality": 95},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 95},
+}
+METADATA_KEYS = ("exif", "xmp", "XML:com.adobe.xmp")
+
+executor = None
+executor_lock = Lock()
+
+
+def get_executor():
+    global executor
+    with executor_lock:
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=settings.POST_IMAGE_WORKERS,
+                thread_name_prefix="post-images",
+            )
+        return executor
+
+
+def shutdown_workers(wait=True):
+    """Дожидается обработки поставленных изображений и останавливает пул."""
+    global executor
+    with executor_lock:
+        if executor is not None:
+            executor.shutdown(wait=wait)
+            executor = None
+
+
+def schedule_renditions(post):
+    """
+    Ставит изображение поста в очередь обработки после коммита транзакции,
+    чтобы воркер увидел сохранённый пост и файл.
+    """
+    if not post.image:
+        return
+    post_id, name = post.pk, post.image.name
+    if settings.POST_IMAGE_WORKERS:
+        transaction.on_commit(
+            lambda: get_executor().submit(run_in_worker, post_id, name)
+        )
+    else:
+        transaction.on_commit(lambda: create_renditions(post_id, name))
+
+
+def run_in_worker(post_id, name):
+    close_old_connections()
+    try:
+        create_renditions(post_id, name)
+    finally:
+        close_old_connections()
+
+
+def open_image(name):
+    """Декодирует изображение и поворачивает его по ориентации из EXIF."""
+    with default_storage.open(name, "rb") as file:
+        image = Image.open(file)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    return image
+
+
+def has_metadata(image):
+    return bool(image.getexif()) or any(
+        key in image.info for key in METADATA_KEYS
+    )
+
+
+def strip_original(name):
+    """
+    Перезаписывает исходный файл без метаданных (EXIF с координатами GPS,
+    XMP), повернув пиксели по ориентации из EXIF. Возвращает имя файла
+    в хранилище; файлы без метаданных и GIF не меняются.
+    """
+    with default_storage.open(name, "rb") as file:
+        image = Image.open(file)
+        image_format = image.format
+        if image_format not in ORIGINAL_SAVE_OPTIONS or not has_metadata(
+            image
+        ):
+            return name
+        icc_profile = image.info.get("icc_profile")
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    buffer = BytesIO()
+    image.save(
+        buffer, format=image_format, icc_profile=icc_profile,
+        **ORIGINAL_SAVE_OPTIONS[image_format],
+    )
+    default_storage.delete(name)
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def render(image, size, image_format):
+    """Уменьшенная копия без метаданных (EXIF, GPS) в заданном формате."""
+    image = image.copy()
+    image.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if image_format == "jpeg" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, **SAVE_OPTIONS[image_format])
+    return buffer.getvalue()
+
+
+def create_renditions(post_id, name):
+    """
+    Удаляет метаданные из исходного изображения поста, создаёт уменьшенные
+    копии во всех форматах и записывает их пути в Post.image_renditions.
+    Если изображение поста успело смениться, копии не сохраняются.
+    """
+    try:
+        image = open_image(name)
+        stored_name = strip_original(name)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return {}
+    renditions = {}
+    for size_name, size in settings.POST_IMAGE_RENDITIONS.items():
+        renditions[size_name] = {}
+        for image_format in settings.POST_IMAGE_FORMATS:
+            path = default_storage.save(
+                f"{RENDITIONS_DIR}/{post_id}/{size_name}.{image_format}",
+                ContentFile(render(image, size, image_format)),
+            )
+            renditions[size_name][image_format] = path
+    updated = Post.objects.filter(pk=post_id, image=name).update(
+        image=stored_name, image_renditions=renditions
+    )
+    if not updated:
+        delete_renditions(renditions)
+    return renditions
+
+
+def delete_renditions(renditions):
+    for paths in renditions.values():
+        for path in paths.values():
+            default_storage.delete(path)
+
+
+def delete_post_renditions(post_id):
+    """
+    Удаляет все файлы копий поста, включая записанные воркером уже после
+    того, как пост был прочитан.
+    """
+    directory = f"{RENDITIONS_DIR}/{post_id}"
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for file_name in files:
+        default_storage.delete(f"{directory}/{file_name}")
+
+
+def replace_renditions(post):
+    """
+    Вызывается после сохранения нового изображения поста: очищает
+    image_renditions, после коммита удаляет файлы прежних копий и ставит
+    новое изображение в очередь. Воркер прежнего изображения свои копии
+    уже не запишет: изображение поста сменилось.
+    """
+    Post.objects.filter(pk=post.pk).update(image_renditions={})
+    post.image_renditions = {}
+    post_id = post.pk
+    transaction.on_commit(lambda: delete_post_renditions(post_id))
+    schedule_renditions(post)
@@ -0,0 +1,235 @@
+import csv
+import datetime
+import json
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Comment, Follow, Group, Post, Profile, User
+
+
+class RowError(ValueError):
+    """Запись входного файла, которую нельзя загрузить."""
+
+
+def read_ndjson(file):
+    for line in file:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def read_csv(file):
+    return csv.DictReader(file)
+
+
+# Чтение записей файла и разбор одной записи в словарь.
+READERS = {
+    "ndjson": (read_ndjson, json.loads),
+    "csv": (read_csv, dict),
+}
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Сохраняет даты из файла вместо текущего времени при bulk_create."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def optional_int(value):
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RowError(f"Ожидается целое число, получено {value!r}.")
+
+
+def parse_date(value):
+    if value in (None, ""):
+        return timezone.now()
+    date = parse_datetime(str(value))
+    if date is None:
+        raise RowError(f"Некорректная дата {value!r}.")
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date, datetime.timezone.utc)
+    return date
+
+
+class UserMap:
+    """
+    username -> id для всех пользователей в памяти. С create_missing
+    отсутствующие пользователи создаются пачкой без пароля.
+    """
+
+    def __init__(self, create_missing=False):
+        self.create_missing = create_missing
+        self.ids = dict(
+            User.objects.values_list("username", "id").iterator()
+        )
+
+    def prepare(self, usernames):
+        if not self.create_missing:
+            return
+        missing = {
+            username for username in usernames
+            if username and username not in self.ids
+        }
+        if not missing:
+            return
+        User.objects.bulk_create(
+            (
+                User(username=username, password=make_password(None))
+                for username in missing
+            ),
+            ignore_conflicts=True,
+        )
+        created = dict(
+            User.objects.filter(username__in=missing)
+            .values_list("username", "id")
+        )
+        Profile.objects.bulk_create(
+            (Profile(user_id=user_id) for user_id in created.values()),
+            ignore_conflicts=True,
+        )
+        self.ids.update(created)
+
+    def __getitem__(self, username):
+        try:
+            return self.ids[username]
+        except KeyError:
+            raise RowError(f"Пользователь {username!r} не найден.")
+
+
+class Loader:
+    """Превращает разобранные записи файла в объекты модели."""
+
+    model = None
+    user_fields = ()
+
+    def __init__(self, users):
+        self.users = users
+
+    def build_batch(self, records, parse):
+        """
+        Объекты для пачки записей [(номер, запись)] и ошибки
+        [(номер, сообщение)] для записей, которые пропущены.
+        """
+        rows, errors = [], []
+        for number, record in records:
+            try:
+                rows.append((number, parse(record)))
+            except ValueError as error:
+                errors.append((number, str(error)))
+        self.users.prepare(
+            row.get(field) for _, row in rows for field in self.user_fields
+        )
+        objs = []
+        for number, row in rows:
+            try:
+                objs.append(self.build(row))
+            except KeyError as error:
+                errors.append((number, f"Нет поля {error}."))
+            except ValueError as error:
+                errors.append((number, str(error)))
+        return objs, errors
+
+    def build(self, row):
+        raise NotImplementedError
+
+
+class GroupLoader(Loader):
+    model = Group
+
+    def build(self, row):
+        return Group(
+            id=optional_int(row.get("id")),
+            title=row["title"],
+            slug=row["slug"],
+            description=row.get("description") or "",
+        )
+
+
+class PostLoader(Loader):
+    model = Post
+    user_fields = ("author",)
+
+    def __init__(self, users):
+        super().__init__(users)
+        self.groups = dict(Group.objects.values_list("slug", "id"))
+        self.group_ids = set(self.groups.values())
+
+    def get_group_id(self, value):
+        if value in (None, ""):
+            return None
+        if value in self.groups:
+            return self.groups[value]
+        group_id = optional_int(value)
+        if group_id not in self.group_ids:
+            raise RowError(f"Группа {value!r} не найдена.")
+        return group_id
+
+    def build(self, row):
+        return Post(
+            id=optional_int(row.get("id")),
+            text=row["text"],
+            pub_date=parse_date(row.get("pub_date")),
+            author_id=self.users[row["author"]],
+            group_id=self.get_group_id(row.get("group")),
+            image=row.get("image") or None,
+        )
+
+
+class CommentLoader(Loader):
+    model = Comment
+    user_fields = ("author",)
+
+    def __init__(self, users):
+        super().__init__(users)
+        self.post_ids = set(
+            Post.objects.values_list("id", flat=True).iterator()
+        )
+
+    def build(self, row):
+        post_id = optional_int(row["post"])
+        if post_id not in self.post_ids:
+            raise RowError(f"Пост {row['post']!r} не найден.")
+        return Comment(
+            id=optional_int(row.get("id")),
+            post_id=post_id,
+            author_id=self.users[row["author"]],
+            text=row["text"],
+            created=parse_date(row.get("created")),
+        )
+
+
+class FollowLoader(Loader):
+    model = Follow
+    user_fields = ("user", "following")
+
+    def build(self, row):
+        user_id = self.users[row["user"]]
+        following_id = self.users[row["following"]]
+        if user_id == following_id:
+            raise RowError("Подписка на самого себя.")
+        return Follow(user_id=user_id, following_id=following_id)
+
+
+LOADERS = {
+    "group": GroupLoader,
+    "post": PostLoader,
+    "comment": CommentLoader,
+    "follow": FollowLoader,
+}
@@ -0,0 +1,23 @@
+from django.db.models import CharField, Lookup
+
+
+@CharField.register_lookup
+class Prefix(Lookup):
+    """
+    Поиск по префиксу диапазоном `col >= 'abc' AND col < 'abd'`.
+    В отличие от LIKE 'abc%', такое условие использует обычный индекс
+    по столбцу; сравнение чувствительно к регистру.
+    """
+
+    lookup_name = "prefix"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        prefix = self.rhs
+        if not prefix:
+            return f"{lhs} IS NOT NULL", lhs_params
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return (
+            f"{lhs} >= %s AND {lhs} < %s",
+            [*lhs_params, prefix, *lhs_params, upper],
+        )
@@ -0,0 +1,163 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+User = get_user_model()
+
+# Значения параметров URL; остальные параметры получают SAMPLE_VALUE.
+SAMPLE_KWARGS = {"pk": "1", "post_pk": "1"}
+SAMPLE_VALUE = "audit"
+# Наборы query-параметров, с которыми вызывается каждый маршрут,
+# помимо запроса без параметров.
+ROUTE_PARAMS = {
+    "post-list": [
+        {"limit": "10", "offset": "10"},
+        {"pagination": "cursor"},
+        {"cursor": "WyIyMDI0LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwgMV0="},
+        {"search": SAMPLE_VALUE},
+        {"group": SAMPLE_VALUE},
+        {"author": SAMPLE_VALUE, "since": "2024-01-01"},
+        {"since": "2024-01-01", "until": "2024-02-01"},
+        {"group": SAMPLE_VALUE, "pagination": "cursor"},
+    ],
+    "post-comments": [
+        {"legacy": "1"},
+        {"cursor": "WyIyMDI0LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwgMV0="},
+    ],
+    "group-posts": [{"limit": "10", "offset": "100"}],
+    "follow-list": [{"search": SAMPLE_VALUE}],
+    "follow-export": [{"after": "1"}],
+    "feed-list": [
+        {"cursor": "WyIyMDI0LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwgMV0="},
+    ],
+    "export-posts": [{"since": "2024-01-01T00:00:00Z"}],
+    "export-comments": [{"since": "2024-01-01T00:00:00Z"}],
+    "export-user-posts": [{"since": "2024-01-01T00:00:00Z"}],
+}
+# Полный просмотр таблицы: `SCAN posts_post` без индекса. Строки вида
+# `SCAN posts_post USING INDEX ...` и подзапросы в скобках не попадают.
+FULL_SCAN = re.compile(r"^SCAN (?!\()(?!CONSTANT ROW)(\S+)$")
+# Псевдонимы таблиц в подзапросах Django: `"posts_follow" U0`.
+TABLE_ALIAS = re.compile(r'"(\w+)" (U\d+)\b')
+
+
+def iterate_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iterate_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def get_routes():
+    """
+    (имя маршрута, view, параметры URL) для GET-действий вьюсетов DRF.
+    Маршруты с суффиксом формата дублируют основные и пропускаются.
+    """
+    routes = {}
+    for pattern in iterate_patterns(get_resolver().url_patterns):
+        actions = getattr(pattern.callback, "actions", None)
+        if not actions or "get" not in actions or not pattern.name:
+            continue
+        names = pattern.pattern.regex.groupindex
+        if "format" in names:
+            continue
+        routes[pattern.name] = (
+            pattern.callback,
+            {name: SAMPLE_KWARGS.get(name, SAMPLE_VALUE) for name in names},
+        )
+    return routes
+
+
+def explain(connection, sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class Command(BaseCommand):
+    help = (
+        "Выполняет GET-запросы ко всем вьюсетам API, строит EXPLAIN QUERY "
+        "PLAN для каждого SQL-запроса и завершается с ошибкой, если "
+        "найден полный просмотр таблицы не из QUERY_PLAN_ALLOWLIST."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--route", action="append",
+            help="Проверять только указанные маршруты (имя из urls).",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[DEFAULT_DB_ALIAS]
+        if connection.vendor != "sqlite":
+            raise CommandError("Команда работает только с SQLite.")
+        routes = get_routes()
+        if options["route"]:
+            unknown = set(options["route"]) - set(routes)
+            if unknown:
+                raise CommandError(
+                    f"Неизвестные маршруты: {', '.join(sorted(unknown))}."
+                )
+            routes = {name: routes[name] for name in options["route"]}
+        user = User(pk=1, username=SAMPLE_VALUE)
+        checked = 0
+        problems = []
+        # Кэш ответов выключен, чтобы каждый запрос доходил до БД; ссылки
+        # пагинации строятся для хоста тестового запроса.
+        with override_settings(API_CACHE_TIMEOUT=0, ALLOWED_HOSTS=["*"]):
+            for name, (view, kwargs) in sorted(routes.items()):
+                for params in [{}] + ROUTE_PARAMS.get(name, []):
+                    for sql in self.capture(connection, view, kwargs,
+                                            params, user):
+                        checked += 1
+                        problems.extend(
+                            (name, params, detail, sql)
+                            for detail in self.full_scans(
+                                connection, name, sql
+                            )
+                        )
+        for name, params, detail, sql in problems:
+            self.stderr.write(f"{name} {params}: {detail}")
+            if options["verbosity"] > 1:
+                self.stderr.write(f"    {sql}")
+        if problems:
+            raise CommandError(
+                f"Полных просмотров таблиц: {len(problems)}."
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Проверено маршрутов: {len(routes)}, запросов: {checked}. "
+            "Полных просмотров таблиц нет."
+        ))
+
+    def capture(self, connection, view, kwargs, params, user):
+        """SQL-запросы SELECT, выполненные view для одного GET-запроса."""
+        request = APIRequestFactory().get("/", params)
+        force_authenticate(request, user=user)
+        with CaptureQueriesContext(connection) as captured:
+            response = view(request, **kwargs)
+            if response.streaming:
+                # Для потоковой выгрузки достаточно первой пачки.
+                next(iter(response.streaming_content), None)
+                response.close()
+        return [
+            query["sql"] for query in captured.captured_queries
+            if query["sql"].lstrip().upper().startswith(("SELECT", "WITH"))
+        ]
+
+    def full_scans(self, connection, name, sql):
+        allowed = settings.QUERY_PLAN_ALLOWLIST.get(name, ())
+        tables = {alias: table for table, alias in TABLE_ALIAS.findall(sql)}
+        for detail in explain(connection, sql):
+            match = FULL_SCAN.match(detail)
+            if not match:
+                continue
+            table = tables.get(match.group(1), match.group(1))
+            if table not in allowed:
+                yield detail
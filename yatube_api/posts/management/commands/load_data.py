@@ -0,0 +1,140 @@
+import os
+import time
+from itertools import islice
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from posts.loading import LOADERS, READERS, UserMap, keep_auto_now_add
+from posts.signals import data_loaded
+
+MAX_WARNINGS = 20
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает группы, посты, комментарии или подписки из NDJSON или "
+        "CSV через bulk_create без сигналов. После сбоя загрузку можно "
+        "продолжить с последней завершённой транзакции флагом --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", choices=list(LOADERS))
+        parser.add_argument("path", help="Путь к файлу NDJSON или CSV.")
+        parser.add_argument(
+            "--format", choices=list(READERS), dest="input_format",
+            help="Формат файла; по умолчанию определяется по расширению.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Количество объектов в одном bulk_create.",
+        )
+        parser.add_argument(
+            "--transaction-size", type=int, default=100_000,
+            help="Количество записей в одной транзакции.",
+        )
+        parser.add_argument(
+            "--resume", action="store_true",
+            help="Продолжить с записи, сохранённой в контрольной точке.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Файл контрольной точки; по умолчанию <path>.checkpoint.",
+        )
+        parser.add_argument(
+            "--create-users", action="store_true",
+            help="Создавать отсутствующих пользователей без пароля.",
+        )
+        parser.add_argument(
+            "--no-reconcile", action="store_true",
+            help="Не пересчитывать счётчики после загрузки.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["input_format"] or self.guess_format(path)
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+        start = self.read_checkpoint(checkpoint) if options["resume"] else 0
+        loader = LOADERS[options["model"]](UserMap(options["create_users"]))
+        read, parse = READERS[input_format]
+
+        self.loaded = self.skipped = 0
+        started = time.perf_counter()
+        with open(path, newline="", encoding="utf-8") as file, \
+                keep_auto_now_add(loader.model):
+            records = islice(enumerate(read(file), start=1), start, None)
+            for chunk in chunked(records, options["transaction_size"]):
+                self.load_chunk(loader, chunk, parse, options["batch_size"])
+                self.write_checkpoint(checkpoint, chunk[-1][0])
+                self.report_progress(chunk[-1][0], started)
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        data_loaded.send(sender=loader.model)
+        if options["model"] != "group" and not options["no_reconcile"]:
+            call_command("reconcile_counters", stdout=self.stdout)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Загружено записей: {self.loaded}, пропущено: {self.skipped} "
+            f"за {elapsed:.1f} с."
+        ))
+
+    def guess_format(self, path):
+        extension = os.path.splitext(path)[1].lstrip(".").lower()
+        if extension == "jsonl":
+            extension = "ndjson"
+        if extension not in READERS:
+            raise CommandError(
+                f"Не удалось определить формат файла {path}: укажите --format."
+            )
+        return extension
+
+    def read_checkpoint(self, checkpoint):
+        try:
+            with open(checkpoint) as file:
+                return int(file.read())
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            raise CommandError(f"Повреждена контрольная точка {checkpoint}.")
+
+    def write_checkpoint(self, checkpoint, number):
+        """Номер последней записи, загруженной в завершённой транзакции."""
+        with open(f"{checkpoint}.tmp", "w") as file:
+            file.write(str(number))
+        os.replace(f"{checkpoint}.tmp", checkpoint)
+
+    def load_chunk(self, loader, chunk, parse, batch_size):
+        # ignore_conflicts: записи, загруженные до сбоя, но после
+        # последней контрольной точки, не вызывают ошибок при повторе.
+        with transaction.atomic():
+            for batch in chunked(chunk, batch_size):
+                objs, errors = loader.build_batch(batch, parse)
+                loader.model.objects.bulk_create(
+                    objs, batch_size=batch_size, ignore_conflicts=True
+                )
+                self.loaded += len(objs)
+                for number, message in errors:
+                    self.warn(number, message)
+
+    def warn(self, number, message):
+        self.skipped += 1
+        if self.skipped <= MAX_WARNINGS:
+            self.stderr.write(f"Запись {number} пропущена: {message}")
+
+    def report_progress(self, number, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Запись {number}: загружено {self.loaded}, "
+            f"{self.loaded / elapsed:.0f} записей/с."
+        )
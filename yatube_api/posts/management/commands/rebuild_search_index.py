@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from posts.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Перестраивает полнотекстовый индекс постов."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.install(connection)
+        backend.rebuild(connection)
+        self.stdout.write(self.style.SUCCESS(
+            f"Индекс {type(backend).__name__} перестроен."
+        ))
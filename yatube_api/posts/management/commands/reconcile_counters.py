@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.models import Comment, Follow, Post, Profile
+
+User = get_user_model()
+
+
+def count_rows(queryset, field, outer_field):
+    """Подзапрос с количеством строк queryset, где field = outer_field."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef(outer_field)})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает денормализованные счётчики комментариев, "
+        "подписчиков и подписок пачками."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Количество строк, проверяемых за один запрос.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        profiles = self.create_missing_profiles(batch_size)
+        posts = self.reconcile(
+            Post.objects.all(),
+            {"comment_count": count_rows(Comment.objects, "post_id", "pk")},
+            batch_size,
+        )
+        follows = self.reconcile(
+            Profile.objects.all(),
+            {
+                "follower_count": count_rows(
+                    Follow.objects, "following_id", "user_id"
+                ),
+                "following_count": count_rows(
+                    Follow.objects, "user_id", "user_id"
+                ),
+            },
+            batch_size,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Создано профилей: {profiles}. Исправлено постов: {posts}, "
+            f"профилей: {follows}."
+        ))
+
+    def create_missing_profiles(self, batch_size):
+        user_ids = User.objects.filter(profile__isnull=True).values_list(
+            "id", flat=True
+        )
+        created = Profile.objects.bulk_create(
+            (Profile(user_id=user_id) for user_id in user_ids.iterator()),
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        return len(created)
+
+    def reconcile(self, queryset, expressions, batch_size):
+        """
+        Проходит таблицу по диапазонам первичного ключа и одним UPDATE
+        пересчитывает счётчики в строках, где они разошлись с данными.
+        """
+        annotations = {
+            f"actual_{field}": expression
+            for field, expression in expressions.items()
+        }
+        drift = Q()
+        for field in expressions:
+            drift |= ~Q(**{field: F(f"actual_{field}")})
+        fixed = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                return fixed
+            last_pk = batch[-1]
+            drifted = list(
+                queryset.filter(pk__in=batch)
+                .annotate(**annotations)
+                .filter(drift)
+                .values_list("pk", flat=True)
+            )
+            if drifted:
+                fixed += queryset.filter(pk__in=drifted).update(**expressions)
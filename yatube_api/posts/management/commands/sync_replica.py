@@ -0,0 +1,56 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def replica_path(name):
+    """Путь к файлу реплики из NAME вида `file:path?mode=ro` или пути."""
+    name = str(name)
+    if name.startswith("file:"):
+        name = name[len("file:"):].split("?", 1)[0]
+    return name
+
+
+def sync_replica(primary, replica):
+    """Копирует основную БД в файл реплики через sqlite3 backup API."""
+    primary.ensure_connection()
+    target = sqlite3.connect(replica_path(replica.settings_dict["NAME"]))
+    try:
+        primary.connection.backup(target)
+    finally:
+        target.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Копирует основную БД SQLite в файлы реплик из DATABASE_REPLICAS "
+        "через backup API. Заменяет репликацию при локальной проверке "
+        "чтения с реплик."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--every", type=float,
+            help="Повторять копирование каждые N секунд.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("DATABASE_REPLICAS пуст.")
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != "sqlite":
+            raise CommandError("Команда работает только с SQLite.")
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                started = time.perf_counter()
+                sync_replica(primary, connections[alias])
+                self.stdout.write(
+                    f"{alias}: скопировано за "
+                    f"{time.perf_counter() - started:.2f} с"
+                )
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0007_alter_comment_options"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="follow",
+            options={"ordering": ["id"]},
+        ),
+        migrations.AlterUniqueTogether(
+            name="follow",
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["pub_date", "id"], name="post_pub_date_id_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="follow",
+            constraint=models.UniqueConstraint(
+                fields=("user", "following"), name="unique_user_following"
+            ),
+        ),
+    ]
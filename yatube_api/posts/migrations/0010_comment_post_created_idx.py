@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0009_feeditem"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "created"], name="comment_post_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    Post = apps.get_model("posts", "Post")
+    Profile = apps.get_model("posts", "Profile")
+    Post.objects.update(
+        comment_count=models.Subquery(
+            Post.objects.filter(pk=models.OuterRef("pk"))
+            .annotate(total=models.Count("comments"))
+            .values("total")
+        )
+    )
+    Profile.objects.bulk_create(
+        Profile(user_id=user_id)
+        for user_id in User.objects.values_list("id", flat=True)
+    )
+    Profile.objects.update(
+        follower_count=models.Subquery(
+            User.objects.filter(pk=models.OuterRef("user_id"))
+            .annotate(total=models.Count("following"))
+            .values("total")
+        ),
+        following_count=models.Subquery(
+            User.objects.filter(pk=models.OuterRef("user_id"))
+            .annotate(total=models.Count("follower"))
+            .values("total")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0010_comment_post_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Количество комментариев"
+            ),
+        ),
+        migrations.CreateModel(
+            name="Profile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "follower_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество подписчиков"
+                    ),
+                ),
+                (
+                    "following_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество подписок"
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="profile",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
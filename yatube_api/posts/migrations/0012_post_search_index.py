@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from posts.search import SQLiteFTS5Backend
+
+
+def create_search_index(apps, schema_editor):
+    SQLiteFTS5Backend().install(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    SQLiteFTS5Backend().uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0011_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
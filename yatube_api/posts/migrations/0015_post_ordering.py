@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0014_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="post",
+            options={"ordering": ["-pub_date", "-id"]},
+        ),
+    ]
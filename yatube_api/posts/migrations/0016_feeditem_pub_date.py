@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:10
+
+from django.db import migrations, models
+
+
+def fill_pub_date(apps, schema_editor):
+    FeedItem = apps.get_model("posts", "FeedItem")
+    Post = apps.get_model("posts", "Post")
+    FeedItem.objects.update(
+        pub_date=models.Subquery(
+            Post.objects.filter(pk=models.OuterRef("post_id")).values(
+                "pub_date"
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("posts", "0015_post_ordering"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="feeditem",
+            name="pub_date",
+            field=models.DateTimeField(
+                null=True, verbose_name="Дата публикации поста"
+            ),
+        ),
+        migrations.RunPython(fill_pub_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="feeditem",
+            name="pub_date",
+            field=models.DateTimeField(verbose_name="Дата публикации поста"),
+        ),
+        migrations.AddIndex(
+            model_name="feeditem",
+            index=models.Index(
+                fields=["user", "pub_date", "post"],
+                name="feeditem_user_pub_date_idx",
+            ),
+        ),
+    ]
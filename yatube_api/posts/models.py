@@ -16,19 +16,59 @@ class Group(models.Model):
 class Post(models.Model):
     text = models.TextField()
     pub_date = models.DateTimeField("Дата публикации", auto_now_add=True)
+    # Индексы по author и group - первые поля составных индексов в Meta.
     author = models.ForeignKey(
         User, on_delete=models.CASCADE,
-        related_name="posts"
+        related_name="posts", db_index=False
     )
     image = models.ImageField(upload_to="posts/", null=True, blank=True)
+    image_renditions = models.JSONField(
+        "Уменьшенные копии изображения", default=dict, blank=True,
+        editable=False,
+    )
     group = models.ForeignKey(
         Group, on_delete=models.SET_NULL,
-        null=True, blank=True
+        null=True, blank=True, db_index=False
+    )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев", default=0
     )
 
+    class Meta:
+        # Порядок совпадает с индексом post_pub_date_id_idx, id разделяет
+        # посты с одинаковой датой, и страницы не пересекаются.
+        ordering = ["-pub_date", "-id"]
+        indexes = [
+            models.Index(
+                fields=["pub_date", "id"], name="post_pub_date_id_idx"
+            ),
+            models.Index(
+                fields=["author", "pub_date", "id"],
+                name="post_author_pub_date_idx",
+            ),
+            models.Index(
+                fields=["group", "pub_date", "id"],
+                name="post_group_pub_date_idx",
+            ),
+        ]
+
+    # Меняются только атомарными UPDATE (posts.counters, воркер копий
+    # изображений), поэтому полный save() существующего поста не
+    # перезаписывает их прочитанными ранее значениями.
+    save_excluded_fields = ("comment_count", "image_renditions")
+
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.save_excluded_fields
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
 
@@ -47,20 +87,73 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-created"]
+        indexes = [
+            models.Index(
+                fields=["post", "created"], name="comment_post_created_idx"
+            ),
+        ]
+
+
+class Profile(models.Model):
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="profile"
+    )
+    follower_count = models.PositiveIntegerField(
+        "Количество подписчиков", default=0
+    )
+    following_count = models.PositiveIntegerField(
+        "Количество подписок", default=0
+    )
+
+    def __str__(self):
+        return f"Профиль {self.user}"
 
 
 class Follow(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE,
                              related_name="follower")
+    # Индекс по following - первое поле follow_following_user_idx.
     following = models.ForeignKey(User, related_name="following",
-                                  on_delete=models.CASCADE)
+                                  on_delete=models.CASCADE, db_index=False)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['user', 'following'],
                                     name='unique_user_following')
         ]
+        indexes = [
+            models.Index(
+                fields=["following", "user"], name="follow_following_user_idx"
+            ),
+        ]
         ordering = ["id"]
 
     def __str__(self):
         return f"{self.user} follows {self.following}"
+
+
+class FeedItem(models.Model):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="feed_items"
+    )
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="feed_items"
+    )
+    # Копия Post.pub_date: страница ленты читается по индексу
+    # (user, pub_date, post) без сортировки всех постов ленты.
+    pub_date = models.DateTimeField("Дата публикации поста")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "post"],
+                                    name="unique_user_feed_post")
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "pub_date", "post"],
+                name="feeditem_user_pub_date_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} in feed of {self.user_id}"
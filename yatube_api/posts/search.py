@@ -0,0 +1,165 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import Post
+
+WORD_RE = re.compile(r"\w+")
+
+
+def split_query(query):
+    """Слова поискового запроса без операторов и спецсимволов."""
+    return WORD_RE.findall(query)
+
+
+class SearchBackend:
+    """
+    Интерфейс бэкенда полнотекстового поиска по тексту постов.
+    Бэкенд выбирается настройкой POSTS_SEARCH_BACKEND.
+    """
+
+    def install(self, connection):
+        """Создаёт индекс в базе данных, если его ещё нет."""
+
+    def uninstall(self, connection):
+        """Удаляет индекс из базы данных."""
+
+    def rebuild(self, connection=default_connection):
+        """Перестраивает индекс по текущему содержимому таблицы постов."""
+
+    def search(self, queryset, query):
+        """
+        Оставляет в queryset посты, подходящие под запрос, и сортирует их
+        по релевантности.
+        """
+        raise NotImplementedError
+
+
+class ContainsSearchBackend(SearchBackend):
+    """Поиск без индекса: каждое слово запроса ищется через LIKE."""
+
+    def search(self, queryset, query):
+        words = split_query(query)
+        if not words:
+            return queryset.none()
+        condition = Q()
+        for word in words:
+            condition &= Q(text__icontains=word)
+        return queryset.filter(condition)
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """
+    Инвертированный индекс SQLite FTS5 над Post.text.
+    Индекс хранит только словарь (external content), сами тексты остаются
+    в таблице постов; триггеры поддерживают его при любых изменениях,
+    в том числе при bulk_create и QuerySet.update().
+    Слова запроса ищутся по префиксу, результаты сортируются по bm25.
+    """
+
+    table = "posts_post_fts"
+    triggers = {
+        "ai": "AFTER INSERT ON {content} BEGIN {insert}; END",
+        "ad": "AFTER DELETE ON {content} BEGIN {delete}; END",
+        "au": (
+            "AFTER UPDATE OF text ON {content} "
+            "BEGIN {delete}; {insert}; END"
+        ),
+    }
+
+    @property
+    def content(self):
+        return Post._meta.db_table
+
+    def is_supported(self, connection):
+        return connection.vendor == "sqlite"
+
+    def get_schema(self):
+        insert = (
+            f"INSERT INTO {self.table}(rowid, text) VALUES (new.id, new.text)"
+        )
+        delete = (
+            f"INSERT INTO {self.table}({self.table}, rowid, text) "
+            "VALUES ('delete', old.id, old.text)"
+        )
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            f"text, content='{self.content}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        ]
+        for suffix, body in self.triggers.items():
+            body = body.format(
+                content=self.content, insert=insert, delete=delete
+            )
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {self.table}_{suffix} {body}"
+            )
+        return statements
+
+    def get_trigger_names(self):
+        return [f"{self.table}_{suffix}" for suffix in self.triggers]
+
+    def count_triggers(self, cursor):
+        names = self.get_trigger_names()
+        placeholders = ", ".join(["%s"] * len(names))
+        cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' "
+            f"AND tbl_name = %s AND name IN ({placeholders})",
+            [self.content, *names],
+        )
+        return cursor.fetchone()[0]
+
+    def install(self, connection):
+        """
+        Пересоздание таблицы постов в миграциях SQLite удаляет её триггеры,
+        поэтому недостающие триггеры создаются заново, а индекс
+        перестраивается.
+        """
+        if not self.is_supported(connection):
+            return
+        with connection.cursor() as cursor:
+            if self.count_triggers(cursor) == len(self.triggers):
+                return
+            for statement in self.get_schema():
+                cursor.execute(statement)
+        self.rebuild(connection)
+
+    def uninstall(self, connection):
+        if not self.is_supported(connection):
+            return
+        with connection.cursor() as cursor:
+            for name in self.get_trigger_names():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def rebuild(self, connection=default_connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"
+            )
+
+    def get_match_expression(self, words):
+        return " ".join(f'"{word}"*' for word in words)
+
+    def search(self, queryset, query):
+        words = split_query(query)
+        if not words:
+            return queryset.none()
+        return queryset.extra(
+            select={"search_rank": f"bm25({self.table})"},
+            tables=[self.table],
+            where=[
+                f"{self.table}.rowid = {self.content}.id",
+                f"{self.table} MATCH %s",
+            ],
+            params=[self.get_match_expression(words)],
+        ).order_by("search_rank", "-id")
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    return import_string(settings.POSTS_SEARCH_BACKEND)()
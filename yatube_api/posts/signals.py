@@ -0,0 +1,90 @@
+from threading import local
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import Signal, receiver
+
+from . import counters, feed, images, search
+from .graph import follow_graph
+from .models import Comment, Follow, Post, Profile
+
+# Отправляется после массовой загрузки данных командой load_data, которая
+# создаёт объекты без сигналов post_save; sender - модель.
+data_loaded = Signal()
+
+# Посты, которые сейчас удаляются вместе с комментариями: их счётчик
+# комментариев обновлять не нужно.
+deleting_posts = local()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_created(sender, instance, created, **kwargs):
+    if created:
+        Profile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        counters.change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if instance.post_id not in getattr(deleting_posts, "ids", ()):
+        counters.change_comment_count(instance.post_id, -1)
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    if not hasattr(deleting_posts, "ids"):
+        deleting_posts.ids = set()
+    deleting_posts.ids.add(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    getattr(deleting_posts, "ids", set()).discard(instance.pk)
+    if instance.image:
+        post_id = instance.pk
+        transaction.on_commit(
+            lambda: images.delete_post_renditions(post_id)
+        )
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, **kwargs):
+    if created:
+        counters.change_follow_counts(
+            instance.user_id, instance.following_id, 1
+        )
+        feed.add_author_to_feed(instance.user_id, instance.following_id)
+        transaction.on_commit(lambda: follow_graph.add(
+            instance.user_id, instance.following_id
+        ))
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    counters.change_follow_counts(instance.user_id, instance.following_id, -1)
+    feed.remove_author_from_feed(instance.user_id, instance.following_id)
+    transaction.on_commit(lambda: follow_graph.remove(
+        instance.user_id, instance.following_id
+    ))
+
+
+@receiver(post_migrate)
+def search_index_migrated(sender, using, **kwargs):
+    if sender.name == "posts":
+        search.get_search_backend().install(connections[using])
+
+
+@receiver(data_loaded, sender=Follow)
+def follows_loaded(sender, **kwargs):
+    follow_graph.bump_shared_version()
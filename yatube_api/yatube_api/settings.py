@@ -19,7 +19,7 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework.authtoken",
     "djoser",
-    "api",
+    "api.v1.apps.ApiConfig",
     "posts",
 ]
 
@@ -31,6 +31,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.v1.replicas.ReplicaMiddleware",
 ]
 
 ROOT_URLCONF = "yatube_api.urls"
@@ -56,10 +57,49 @@ TEMPLATES = [
 WSGI_APPLICATION = "yatube_api.wsgi.application"
 
 
+# SQLite с WAL, очередью пишущих транзакций и постоянными соединениями,
+# см. yatube_api/sqlite/base.py. timeout - ожидание блокировки SQLite
+# в секундах.
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "yatube_api.sqlite",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": 60,
+        "OPTIONS": {"timeout": 20},
+    }
+}
+
+# Реплики только для чтения - алиасы из DATABASES, см. api/v1/replicas.py.
+# Локально реплику на SQLite обновляет команда sync_replica, например:
+#     DATABASES["replica"] = {
+#         "ENGINE": "yatube_api.sqlite",
+#         "NAME": f"file:{BASE_DIR / 'replica.sqlite3'}?mode=ro",
+#         "CONN_MAX_AGE": 60,
+#         # Файл открыт только для чтения: режим журнала не меняется.
+#         "OPTIONS": {"pragmas": {"journal_mode": None}},
+#     }
+#     DATABASE_REPLICAS = ["replica"]
+DATABASE_ROUTERS = ["api.v1.replicas.ReplicaRouter"]
+DATABASE_REPLICAS = []
+# Пути, GET и HEAD к которым читают с реплик.
+REPLICA_READ_PATHS = (
+    "/api/v1/posts/",
+    "/api/v1/groups/",
+    "/api/v1/follow/",
+    "/api/v1/async/posts/",
+    "/api/v1/async/groups/",
+)
+# Наибольшее ожидаемое отставание реплик в секундах: столько после своей
+# записи пользователь и после изменения данных ответы с ETag читают
+# с основной БД.
+REPLICA_LAG_SECONDS = 5
+# Как часто проверять реплику и сколько пропускать недоступную.
+REPLICA_CHECK_SECONDS = 5
+REPLICA_RETRY_SECONDS = 30
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
 
@@ -91,15 +131,70 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STATICFILES_DIRS = ((BASE_DIR / "static/"),)
 
+MEDIA_URL = "/media/"
+MEDIA_ROOT = BASE_DIR / "media"
+
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",  # Временно разрешить доступ всем
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.v1.authentication.StatelessJWTAuthentication",
     ),
 }
 
+# Алиас из CACHES для кэша ответов API и время жизни закэшированных ответов.
+API_CACHE_ALIAS = "default"
+API_CACHE_TIMEOUT = 60 * 60
+
+# Размер и время жизни (в секундах) кэша пользователей в памяти процесса.
+API_USER_CACHE_SIZE = 1024
+API_USER_CACHE_TTL = 60
+
+# Кэш первых страниц /groups/<slug>/posts/ в памяти процесса: количество
+# групп, время жизни записи в секундах и число постов от начала списка.
+# Записи удаляются при сохранении и удалении постов группы; время жизни
+# ограничивает устаревание счётчиков комментариев и данных, изменённых
+# другими процессами.
+API_GROUP_POSTS_CACHE_SIZE = 256
+API_GROUP_POSTS_CACHE_TTL = 60
+API_GROUP_POSTS_CACHE_DEPTH = 50
+
+# Максимальное количество объектов в одном запросе к bulk-эндпоинтам.
+API_BULK_MAX_ITEMS = 1000
+
+# Режим пагинации постов по умолчанию: "limit_offset" или "cursor".
+API_POSTS_PAGINATION = "limit_offset"
+
+# Посты авторов, у которых подписчиков больше этого числа, не рассылаются
+# в ленты при публикации, а подмешиваются в ленту при чтении.
+FEED_FANOUT_MAX_FOLLOWERS = 10_000
+# Сколько последних постов автора добавляется в ленту при подписке.
+FEED_BACKFILL_SIZE = 100
+
+# Уменьшенные копии изображений постов: размер по большей стороне
+# и форматы. Копии создаются POST_IMAGE_WORKERS фоновыми потоками;
+# при 0 - сразу после коммита в потоке запроса.
+POST_IMAGE_RENDITIONS = {"small": 320, "medium": 960}
+POST_IMAGE_FORMATS = ("webp", "jpeg")
+POST_IMAGE_WORKERS = 4
+# Ограничения загружаемых изображений: размер файла в байтах, длина
+# большей стороны в пикселях и форматы Pillow.
+POST_IMAGE_MAX_SIZE = 10 * 1024 * 1024
+POST_IMAGE_MAX_DIMENSION = 8000
+POST_IMAGE_ALLOWED_FORMATS = ("JPEG", "PNG", "GIF", "WEBP")
+
+# Бэкенд полнотекстового поиска по постам. Для СУБД без FTS5 —
+# "posts.search.ContainsSearchBackend".
+POSTS_SEARCH_BACKEND = "posts.search.SQLiteFTS5Backend"
+
+# Полные просмотры таблиц, допустимые для маршрута в audit_query_plans:
+# {имя маршрута: (таблица, ...)}.
+QUERY_PLAN_ALLOWLIST = {
+    # Групп немного, список отдаётся целиком.
+    "group-list": ("posts_group",),
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 SIMPLE_JWT = {
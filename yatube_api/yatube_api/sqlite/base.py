@@ -0,0 +1,123 @@
+"""
+SQLite-бэкенд для рабочей нагрузки.
+
+При подключении включает WAL, synchronous=NORMAL, mmap и увеличенный кэш
+страниц. Транзакции atomic() начинаются с BEGIN IMMEDIATE: блокировка
+записи берётся сразу, а не при первой записи, когда SQLite возвращает
+"database is locked" без ожидания. Пишущие транзакции потоков процесса
+выстраиваются в очередь на общей блокировке БД, а BEGIN IMMEDIATE при
+занятой другим процессом базе повторяется с экспоненциальной паузой.
+
+Параметры в OPTIONS, кроме параметров sqlite3.connect:
+    pragmas - PRAGMA поверх PRAGMAS, None отменяет PRAGMA;
+    write_lock_timeout - сколько секунд ждать очереди на запись;
+    write_retries, write_backoff - число повторов BEGIN IMMEDIATE и
+    начальная пауза между ними в секундах.
+"""
+import random
+import threading
+import time
+
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    # Отрицательное значение - размер в КиБ.
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+PROFILE_OPTIONS = {
+    "pragmas": {},
+    "write_lock_timeout": 30,
+    "write_retries": 5,
+    "write_backoff": 0.05,
+}
+
+write_locks = {}
+write_locks_lock = threading.Lock()
+
+
+def get_write_lock(name):
+    """Общая для всех соединений процесса блокировка записи в файл БД."""
+    with write_locks_lock:
+        return write_locks.setdefault(str(name), threading.Lock())
+
+
+def is_locked_error(error):
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = {
+            name: self.settings_dict["OPTIONS"].get(name, default)
+            for name, default in PROFILE_OPTIONS.items()
+        }
+        self.holds_write_lock = False
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for name in PROFILE_OPTIONS:
+            params.pop(name, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in {**PRAGMAS, **self.profile["pragmas"]}.items():
+            if value is not None:
+                connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        lock = get_write_lock(self.settings_dict["NAME"])
+        if not lock.acquire(timeout=self.profile["write_lock_timeout"]):
+            raise OperationalError(
+                "database is locked: очередь на запись не дошла за "
+                f"{self.profile['write_lock_timeout']} с"
+            )
+        self.holds_write_lock = True
+        try:
+            self.begin_immediate()
+        except Exception:
+            self.release_write_lock()
+            raise
+
+    def begin_immediate(self):
+        retries = self.profile["write_retries"]
+        for attempt in range(retries + 1):
+            try:
+                self.cursor().execute("BEGIN IMMEDIATE")
+                return
+            except OperationalError as error:
+                if attempt == retries or not is_locked_error(error):
+                    raise
+            pause = self.profile["write_backoff"] * 2 ** attempt
+            time.sleep(pause * (1 + random.random()))
+
+    def release_write_lock(self):
+        if self.holds_write_lock:
+            self.holds_write_lock = False
+            get_write_lock(self.settings_dict["NAME"]).release()
+
+    def _commit(self):
+        # При ошибке коммита блокировку освободит последующий rollback.
+        super()._commit()
+        self.release_write_lock()
+
+    def _rollback(self):
+        try:
+            super()._rollback()
+        finally:
+            self.release_write_lock()
+
+    def _close(self):
+        try:
+            super()._close()
+        finally:
+            self.release_write_lock()